@@ -0,0 +1,13 @@
+"""
+Cliente para os dados processados do projeto b3-scraping-project.
+
+Exemplo:
+    >>> from b3_dados import ClienteB3Dados
+    >>> cliente = ClienteB3Dados()
+    >>> tabelas = cliente.get_all_tabelas()
+"""
+from b3_dados.cliente import INDICES, RAIZ_GITHUB, ClienteB3Dados
+from b3_dados.http import CacheHTTP, criar_sessao
+from b3_dados.pacote import PacoteB3Dados, construir_pacote
+
+__all__ = ['ClienteB3Dados', 'CacheHTTP', 'criar_sessao', 'PacoteB3Dados', 'construir_pacote', 'INDICES', 'RAIZ_GITHUB']
@@ -0,0 +1,11 @@
+from os.path import dirname, join
+import sys
+
+from b3_dados.pacote import construir_pacote
+
+__python__ = 3.10
+
+if __name__ == '__main__':
+    # Uso: python -m b3_dados [processed_data] [destino]
+    raiz = sys.argv[1] if len(sys.argv) > 1 else join(dirname(dirname(__file__)), 'processed_data')
+    construir_pacote(raiz, sys.argv[2] if len(sys.argv) > 2 else None)
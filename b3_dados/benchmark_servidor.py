@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from threading import Thread
+from time import perf_counter
+import logging
+import sys
+
+import requests
+from werkzeug.serving import make_server
+
+from b3_dados.cliente import INDICES
+from b3_dados.servidor import criar_app
+
+__python__ = 3.10
+
+# Rotas usadas no teste de carga (repetidas em ciclo por cada cliente)
+ROTAS = [f'/indices/{indice}' for indice in INDICES] + [
+    '/tickers/PETR4', '/tickers/VALE3', '/tickers/ITUB4', '/tickers/HGLG11',
+    '/empresas?cnpj=33.592.510/0001-54', '/empresas?codigo=PETR', '/horarios', '/indices',
+]
+
+
+def verificar_rotas(url: str) -> None:
+    """
+    Confere que cada rota de ``ROTAS`` responde com dados, para que a carga não meça consultas vazias.
+
+    Args:
+        url (str): Endereço base do servidor.
+
+    Raises:
+        ValueError: Se uma rota não responder 200 ou responder uma lista ou objeto vazio.
+    """
+    for rota in ROTAS:
+        response = requests.get(url + rota)
+        if response.status_code != 200 or not response.json():
+            raise ValueError(f'Rota sem resultado: {rota} ({response.status_code} {response.text[:80]!r})')
+
+
+def carga(url: str, clientes: int, requisicoes: int, condicional: bool) -> None:
+    """
+    Dispara ``requisicoes`` requisições por cliente, com ``clientes`` clientes simultâneos,
+    e imprime a vazão e a latência.
+
+    Args:
+        url (str): Endereço base do servidor.
+        clientes (int): Número de clientes simultâneos (cada um com a sua sessão HTTP).
+        requisicoes (int): Requisições por cliente.
+        condicional (bool): Se True, envia ``If-None-Match`` com o ETag já recebido (respostas 304).
+    """
+    def cliente(numero: int):
+        sessao = requests.Session()
+        etags = {}
+        latencias = []
+        rotas = cycle(ROTAS[numero % len(ROTAS):] + ROTAS[:numero % len(ROTAS)])
+        for _ in range(requisicoes):
+            rota = next(rotas)
+            cabecalhos = {'If-None-Match': etags[rota]} if condicional and rota in etags else {}
+            inicio = perf_counter()
+            response = sessao.get(url + rota, headers=cabecalhos)
+            latencias.append(perf_counter() - inicio)
+            if response.status_code not in (200, 304):
+                raise ValueError(f'Resposta inesperada: {response.status_code} {rota}')
+            if 'ETag' in response.headers:
+                etags[rota] = response.headers['ETag']
+        return latencias
+
+    inicio = perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        latencias = sorted(latencia for resultado in executor.map(cliente, range(clientes)) for latencia in resultado)
+    duracao = perf_counter() - inicio
+    p50 = latencias[len(latencias) // 2] * 1000
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000
+    modo = 'com If-None-Match' if condicional else 'sem cache'
+    print(f'{clientes:>3} clientes, {modo:<18} {len(latencias) / duracao:>8.0f} req/s'
+          f'   p50 {p50:>6.2f} ms   p95 {p95:>6.2f} ms')
+
+
+if __name__ == '__main__':
+    # Uso: python -m b3_dados.benchmark_servidor [processed_data]
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = criar_app(sys.argv[1] if len(sys.argv) > 1 else None, intervalo=0)
+    servidor = make_server('127.0.0.1', 0, app, threaded=True)
+    Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{servidor.server_port}'
+    verificar_rotas(url)
+
+    print(f'\nServidor em {url} ({len(ROTAS)} rotas, 200 requisições por cliente):')
+    for clientes in [1, 8, 32]:
+        for condicional in [False, True]:
+            carga(url, clientes, 200, condicional)
+    servidor.shutdown()
@@ -0,0 +1,292 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from os import replace
+from os.path import exists, expanduser, isdir, join
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+import gzip
+import json
+
+import requests
+from pandas import DataFrame, read_csv
+
+from b3_dados.http import CacheHTTP, criar_sessao, get_com_cache
+
+__python__ = 3.10
+
+# Endereço dos dados processados no GitHub
+RAIZ_GITHUB = 'https://raw.githubusercontent.com/rianlucascs/b3-scraping-project/master/processed_data'
+
+# Diretório padrão do cache em disco
+CACHE_PADRAO = join(expanduser('~'), '.cache', 'b3_dados')
+
+# Índices de segmentos e setoriais disponíveis
+INDICES = [
+    'IDIV', 'MLCX', 'SMLL', 'IVBX', 'AGFS', 'IFNC', 'IBEP', 'IBEE', 'IBHB', 'IBLV',
+    'IMOB', 'UTIL', 'ICON', 'IEEX', 'IFIL', 'IMAT', 'INDX', 'IBSD', 'BDRX', 'IFIX',
+]
+
+# Caminhos dos arquivos, relativos à pasta `processed_data`
+PASTA_INDICES = '1. Índices de Segmentos e Setoriais'
+ARQUIVO_HORARIOS = '2. Horário de negociação/Tabela_horarios_de_negociacao_no_mercado_de_acoes.csv'
+ARQUIVO_EMPRESAS = '3. Empresas listadas/todas_empresas_listadas.csv'
+
+
+class ClienteB3Dados:
+    """
+    Cliente para os dados processados do projeto (GitHub ou cópia local de ``processed_data``).
+
+    Substitui as funções do notebook ``github_api_acess.ipynb``: usa uma única sessão HTTP
+    com pool de conexões, baixa vários arquivos em paralelo e guarda as respostas em um
+    cache em disco revalidado por ETag/Last-Modified (arquivos inalterados custam um 304).
+    Se ``raiz`` for um diretório local, os arquivos são lidos do disco, sem rede.
+
+    Attributes:
+        raiz (str): URL base ou diretório ``processed_data``.
+        local (bool): True se ``raiz`` for um diretório local.
+        sessao (requests.Session): Sessão HTTP compartilhada.
+        cache (CacheHTTP): Cache em disco (None se desativado).
+        max_simultaneas (int): Número máximo de downloads simultâneos.
+        timeout (float): Tempo limite, em segundos, de cada requisição.
+        estatisticas (dict): Total de requisições HTTP e de respostas 304 (não modificado).
+
+    Methods:
+        ``ler_bytes(caminho: str) -> bytes``:
+            Conteúdo de um arquivo, relativo a ``processed_data``.
+
+        ``get_codigos(indice: str) -> List[str]`` / ``get_apresentacao(indice: str) -> str`` /
+        ``get_tabela_setor(indice: str) -> DataFrame``:
+            Arquivos de um índice.
+
+        ``get_all_codigos(indices=None)`` / ``get_all_tabelas(indices=None)``:
+            Os mesmos arquivos para vários índices, baixados em paralelo.
+
+        ``get_participacoes() -> Dict[str, Dict[str, float]]``:
+            Participação de cada ativo em cada índice, em um único arquivo.
+
+        ``get_tabela_horario() -> DataFrame`` / ``get_tabela_empresas_listadas() -> DataFrame``:
+            Tabelas de horários de negociação e de empresas listadas.
+
+        ``get_pacote(destino: str = None) -> PacoteB3Dados``:
+            Todos os dados em um único arquivo SQLite, consultável sem novas requisições.
+    """
+
+    def __init__(self, raiz: str = RAIZ_GITHUB, cache: Optional[str] = CACHE_PADRAO,
+                 max_simultaneas: int = 8, timeout: float = 30, sessao: requests.Session = None):
+        """
+        Inicializa o cliente.
+
+        Args:
+            raiz (str): URL base dos dados (padrão: GitHub) ou caminho local de ``processed_data``.
+            cache (str, optional): Diretório do cache em disco. None desativa o cache.
+            max_simultaneas (int): Número máximo de downloads simultâneos.
+            timeout (float): Tempo limite, em segundos, de cada requisição.
+            sessao (requests.Session, optional): Sessão HTTP a ser usada.
+        """
+        self.local = isdir(raiz)
+        self.raiz = raiz if self.local else raiz.rstrip('/')
+        self.max_simultaneas = max_simultaneas
+        self.timeout = timeout
+        self.sessao = sessao or criar_sessao(max_simultaneas)
+        # Sem validade (ttl=0): todo acesso é revalidado, e arquivos inalterados custam um 304
+        self.cache = CacheHTTP(cache, ttl=0) if cache and not self.local else None
+        self._lock = Lock()
+        self.estatisticas = {'requisicoes': 0, 'nao_modificados': 0}
+
+    def url(self, caminho: str) -> str:
+        """
+        URL (ou caminho local) de um arquivo relativo a ``processed_data``.
+
+        Args:
+            caminho (str): Caminho relativo, com ``/`` como separador.
+
+        Returns:
+            str: URL com o caminho codificado, ou caminho no disco no modo local.
+        """
+        if self.local:
+            return join(self.raiz, *caminho.split('/'))
+        return f'{self.raiz}/{quote(caminho)}'
+
+    def ler_bytes(self, caminho: str) -> bytes:
+        """
+        Conteúdo de um arquivo, relativo a ``processed_data``.
+
+        Args:
+            caminho (str): Caminho relativo, com ``/`` como separador.
+
+        Returns:
+            bytes: Conteúdo do arquivo.
+
+        Raises:
+            ValueError: Se o arquivo não puder ser obtido.
+        """
+        url = self.url(caminho)
+        if self.local:
+            try:
+                with open(url, 'rb') as file:
+                    return file.read()
+            except OSError as e:
+                raise ValueError(f'Erro ao ler o arquivo: {e}')
+
+        try:
+            response = get_com_cache(self.sessao, self.cache, url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise ValueError(f'Erro ao acessar a página: {e}')
+        with self._lock:
+            self.estatisticas['requisicoes'] += 1
+            if getattr(response, 'origem', None) == '304':
+                self.estatisticas['nao_modificados'] += 1
+        if response.status_code != 200:
+            raise ValueError(f'Erro ao acessar a página: {response.status_code} {url}')
+        return response.content
+
+    def ler_varios(self, caminhos: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Conteúdo de vários arquivos, baixados em paralelo.
+
+        Args:
+            caminhos (iterable): Caminhos relativos a ``processed_data``.
+
+        Returns:
+            dict: Caminho -> conteúdo.
+        """
+        caminhos = list(caminhos)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_simultaneas, len(caminhos)))) as executor:
+            return dict(zip(caminhos, executor.map(self.ler_bytes, caminhos)))
+
+    def _caminho_setor(self, indice: str, arquivo: str) -> str:
+        return f'{PASTA_INDICES}/Setores/{indice}/{arquivo}_{indice}.{"csv" if arquivo == "Tabela" else "txt"}'
+
+    @staticmethod
+    def _codigos(conteudo: bytes) -> List[str]:
+        return [item.strip() for item in conteudo.decode('utf-8').splitlines()]
+
+    @staticmethod
+    def _tabela(conteudo: bytes, delimiter: str = ',') -> DataFrame:
+        return read_csv(BytesIO(conteudo), delimiter=delimiter)
+
+    def get_codigos(self, indice: str) -> List[str]:
+        """
+        Lista de códigos das ações de um índice.
+
+        Args:
+            indice (str): O índice (ex.: ``IFIX``).
+
+        Returns:
+            list: Códigos das ações.
+        """
+        return self._codigos(self.ler_bytes(self._caminho_setor(indice, 'Códigos')))
+
+    def get_apresentacao(self, indice: str) -> str:
+        """
+        Texto de apresentação de um índice.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            str: Texto de apresentação.
+        """
+        return self.ler_bytes(self._caminho_setor(indice, 'Apresentação')).decode('utf-8')
+
+    def get_tabela_setor(self, indice: str) -> DataFrame:
+        """
+        Tabela com a composição da carteira de um índice.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            DataFrame: Código, Ação, Tipo, Qtde. Teórica e Part. (%).
+        """
+        return self._tabela(self.ler_bytes(self._caminho_setor(indice, 'Tabela')))
+
+    def get_all_codigos(self, indices: Iterable[str] = None) -> Dict[str, List[str]]:
+        """
+        Códigos das ações de vários índices, baixados em paralelo.
+
+        Args:
+            indices (iterable, optional): Índices. Padrão é ``INDICES``.
+
+        Returns:
+            dict: Índice -> códigos.
+        """
+        indices = list(indices or INDICES)
+        conteudos = self.ler_varios(self._caminho_setor(indice, 'Códigos') for indice in indices)
+        return {indice: self._codigos(conteudo) for indice, conteudo in zip(indices, conteudos.values())}
+
+    def get_all_tabelas(self, indices: Iterable[str] = None) -> Dict[str, DataFrame]:
+        """
+        Tabelas de composição de vários índices, baixadas em paralelo.
+
+        Args:
+            indices (iterable, optional): Índices. Padrão é ``INDICES``.
+
+        Returns:
+            dict: Índice -> tabela.
+        """
+        indices = list(indices or INDICES)
+        conteudos = self.ler_varios(self._caminho_setor(indice, 'Tabela') for indice in indices)
+        return {indice: self._tabela(conteudo) for indice, conteudo in zip(indices, conteudos.values())}
+
+    def get_participacoes(self) -> Dict[str, Dict[str, float]]:
+        """
+        Participação de cada ativo em cada índice (``participacoes.json``), em uma única requisição.
+
+        Returns:
+            dict: Ativo -> {índice: participação (%)}.
+        """
+        return json.loads(self.ler_bytes(f'{PASTA_INDICES}/participacoes.json'))['ativos']
+
+    def get_pacote(self, destino: str = None):
+        """
+        Pacote SQLite com todos os dados processados, em um único arquivo.
+
+        O pacote é versionado compactado (``b3_dados.sqlite.gz``). No modo remoto, ele é baixado
+        uma vez (revalidado por ETag nas próximas chamadas); nos dois modos, é descompactado em
+        ``destino``, que só é regravado quando o conteúdo muda.
+
+        Args:
+            destino (str, optional): Caminho do SQLite descompactado. Padrão é o diretório do
+                cache no modo remoto (ou o diretório atual, se o cache estiver desativado) e
+                ``processed_data/b3_dados.sqlite`` no modo local.
+
+        Returns:
+            PacoteB3Dados: Pacote aberto somente para leitura e mapeado em memória.
+        """
+        from b3_dados.pacote import ARQUIVO_PACOTE, ARQUIVO_PACOTE_COMPACTADO, PacoteB3Dados
+
+        conteudo = gzip.decompress(self.ler_bytes(ARQUIVO_PACOTE_COMPACTADO))
+        if self.local:
+            destino = destino or self.url(ARQUIVO_PACOTE)
+        else:
+            destino = destino or join(self.cache.path if self.cache else '.', ARQUIVO_PACOTE)
+        atual = None
+        if exists(destino):
+            with open(destino, 'rb') as file:
+                atual = file.read()
+        if atual != conteudo:
+            tmp = f'{destino}.tmp'
+            with open(tmp, 'wb') as file:
+                file.write(conteudo)
+            replace(tmp, destino)
+        return PacoteB3Dados(destino)
+
+    def get_tabela_horario(self) -> DataFrame:
+        """
+        Tabela de horários de negociação no mercado de ações.
+
+        Returns:
+            DataFrame: Tabela de horários.
+        """
+        return self._tabela(self.ler_bytes(ARQUIVO_HORARIOS))
+
+    def get_tabela_empresas_listadas(self) -> DataFrame:
+        """
+        Tabela de empresas listadas.
+
+        Returns:
+            DataFrame: Código, nome do pregão, CNPJ, atividade, classificação setorial e escriturador.
+        """
+        return self._tabela(self.ler_bytes(ARQUIVO_EMPRESAS), delimiter=';')
@@ -0,0 +1,297 @@
+"""
+Horários de negociação da B3: normalização da tabela da página e consultas por mercado.
+
+Usado pelo pacote (tabela ``horarios`` do SQLite e ``/horarios`` do servidor) e pelo script
+``scripts/2. Horário de negociação``, que grava ``Fases_do_pregao_por_mercado.csv``.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import re
+
+from pandas import DataFrame, read_csv
+
+__python__ = 3.10
+
+# Colunas da tabela normalizada (uma linha por mercado e fase)
+COLUNAS = ['mercado', 'fase', 'inicio', 'fim']
+
+# Fase do leilão de abertura e do leilão de fechamento
+LEILAO_ABERTURA = 'Pré-Abertura'
+LEILAO_FECHAMENTO = 'Call de Fechamento'
+
+# Número de nota de rodapé colado ao fim de uma palavra (ex.: "Mercado1", "Ofertas4")
+_NOTA = re.compile(r'(?<=[^\W\d])\d+(?=\s|$)')
+
+
+class Fase(NamedTuple):
+    """
+    Fase do pregão de um mercado, no intervalo ``[inicio, fim)``.
+
+    Attributes:
+        mercado (str): Mercado (ex.: ``'Mercado a vista'``).
+        fase (str): Nome da fase (ex.: ``'Negociação'``).
+        inicio (time): Início da fase.
+        fim (time): Fim da fase (o instante ``fim`` já pertence à fase seguinte).
+    """
+    mercado: str
+    fase: str
+    inicio: time
+    fim: time
+
+    def contem(self, instante: time) -> bool:
+        """Indica se o instante está dentro da fase."""
+        return self.inicio <= instante < self.fim
+
+
+def limpar_nome(nome: str) -> str:
+    """
+    Remove as notas de rodapé e normaliza os espaços de um nome da tabela da B3.
+
+    Args:
+        nome (str): Nome como aparece na página (ex.: ``'After-Market3 - Cancelamento de Ofertas4'``).
+
+    Returns:
+        str: Nome limpo (ex.: ``'After-Market - Cancelamento de Ofertas'``).
+    """
+    return _NOTA.sub('', ' '.join(str(nome).split()))
+
+
+def ler_horario(valor: str) -> Optional[time]:
+    """
+    Converte um horário ``HH:MM`` da tabela.
+
+    Args:
+        valor (str): Célula da tabela.
+
+    Returns:
+        time: O horário, ou None para células sem horário (``'–'``, vazias ou o subcabeçalho).
+    """
+    try:
+        return time.fromisoformat(str(valor).strip())
+    except ValueError:
+        return None
+
+
+def normalizar(tabela: DataFrame) -> DataFrame:
+    """
+    Converte a tabela da página (uma coluna de início e outra de fim por fase) em uma
+    tabela longa, com uma linha por mercado e fase.
+
+    A primeira coluna é o mercado, e as demais formam pares (início, fim) nomeados pela
+    fase, como em ``ExtractAndTransform.transform``. Os nomes repetidos das colunas, a linha
+    de subcabeçalho (Início/Fim) e os marcadores ``'–'`` deixam de existir: fases sem horário
+    são omitidas.
+
+    Args:
+        tabela (DataFrame): Tabela no formato da página (ou do CSV gravado a partir dela).
+
+    Returns:
+        DataFrame: Colunas de ``COLUNAS``, com ``inicio`` e ``fim`` como ``datetime.time``,
+        ordenadas por mercado (na ordem da página) e início.
+    """
+    fases = [limpar_nome(nome) for nome in tabela.columns[1::2]]
+    linhas = []
+    for valores in tabela.itertuples(index=False):
+        mercado = limpar_nome(valores[0])
+        if not mercado:
+            continue
+        fases_mercado = []
+        for fase, inicio, fim in zip(fases, valores[1::2], valores[2::2]):
+            inicio, fim = ler_horario(inicio), ler_horario(fim)
+            if inicio is not None and fim is not None:
+                fases_mercado.append((mercado, fase, inicio, fim))
+        linhas.extend(sorted(fases_mercado, key=lambda linha: linha[2]))
+    return DataFrame(linhas, columns=COLUNAS)
+
+
+def ler_tabela(path: str) -> DataFrame:
+    """
+    Lê o CSV no formato da página (``Tabela_horarios_de_negociacao_no_mercado_de_acoes.csv``) e o normaliza.
+
+    Args:
+        path (str): Caminho do CSV.
+
+    Returns:
+        DataFrame: Tabela longa (ver ``normalizar``).
+    """
+    return normalizar(read_csv(path, dtype=str, keep_default_na=False))
+
+
+def para_csv(fases: DataFrame) -> str:
+    """
+    Tabela longa em CSV, com os horários no formato ``HH:MM``.
+
+    Args:
+        fases (DataFrame): Tabela longa (ver ``normalizar``).
+
+    Returns:
+        str: Conteúdo do CSV.
+    """
+    fases = fases.copy()
+    for coluna in ['inicio', 'fim']:
+        fases[coluna] = fases[coluna].map(lambda horario: horario.strftime('%H:%M'))
+    return fases.to_csv(index=False)
+
+
+class GradeHorarios:
+    """
+    Grade de horários do pregão, indexada por mercado para consultas em O(log n).
+
+    Para cada mercado, as fases ficam ordenadas pelo início, e a fase de um instante é
+    encontrada por busca binária (``bisect``) nos inícios. Para cada mercado e fase, os
+    inícios também ficam ordenados, o que responde "qual a próxima ocorrência da fase"
+    da mesma forma. A grade é montada uma vez (do CSV ou da tabela longa) e as consultas
+    não leem arquivos nem percorrem a tabela.
+
+    Attributes:
+        mercados (List[str]): Mercados, na ordem da página.
+
+    Methods:
+        ``de_tabela(fases: DataFrame) -> GradeHorarios``:
+            Monta a grade a partir da tabela longa.
+
+        ``de_csv(path: str) -> GradeHorarios``:
+            Monta a grade a partir de um CSV (longo ou no formato da página).
+
+        ``fases(mercado: str) -> List[Fase]``:
+            Fases do mercado, em ordem de início.
+
+        ``fase_em(mercado: str, instante: time) -> Optional[Fase]``:
+            Fase do mercado no instante (None fora do pregão ou entre fases).
+
+        ``proxima(mercado: str, fase: str, instante: time) -> Optional[Fase]``:
+            Próxima ocorrência da fase a partir do instante, no mesmo dia.
+    """
+
+    def __init__(self, fases: Iterable[Fase]):
+        """
+        Monta os índices da grade.
+
+        Args:
+            fases (Iterable[Fase]): Fases de todos os mercados.
+
+        Raises:
+            ValueError: Se duas fases de um mercado se sobrepuserem ou se uma fase terminar
+                antes de começar.
+        """
+        por_mercado: Dict[str, List[Fase]] = {}
+        for fase in fases:
+            if fase.fim <= fase.inicio:
+                raise ValueError(f'Fase sem duração ou com fim antes do início: {fase}')
+            por_mercado.setdefault(fase.mercado, []).append(fase)
+
+        self.mercados = list(por_mercado)
+        self._fases: Dict[str, List[Fase]] = {}
+        self._inicios: Dict[str, List[time]] = {}
+        self._ocorrencias: Dict[Tuple[str, str], List[Fase]] = {}
+        self._inicios_ocorrencias: Dict[Tuple[str, str], List[time]] = {}
+        for mercado, lista in por_mercado.items():
+            lista.sort(key=lambda fase: fase.inicio)
+            for anterior, seguinte in zip(lista, lista[1:]):
+                if seguinte.inicio < anterior.fim:
+                    raise ValueError(f'Fases sobrepostas em {mercado}: {anterior.fase} e {seguinte.fase}')
+            self._fases[mercado] = lista
+            self._inicios[mercado] = [fase.inicio for fase in lista]
+            for fase in lista:
+                self._ocorrencias.setdefault((mercado, fase.fase), []).append(fase)
+        for chave, lista in self._ocorrencias.items():
+            self._inicios_ocorrencias[chave] = [fase.inicio for fase in lista]
+
+    @classmethod
+    def de_tabela(cls, fases: DataFrame) -> 'GradeHorarios':
+        """
+        Monta a grade a partir da tabela longa (ver ``normalizar``).
+
+        Args:
+            fases (DataFrame): Colunas de ``COLUNAS``.
+
+        Returns:
+            GradeHorarios: A grade.
+        """
+        return cls(Fase(*linha) for linha in fases[COLUNAS].itertuples(index=False))
+
+    @classmethod
+    def de_csv(cls, path: str) -> 'GradeHorarios':
+        """
+        Monta a grade a partir de um CSV longo (``Fases_do_pregao_por_mercado.csv``) ou no
+        formato da página (``Tabela_horarios_de_negociacao_no_mercado_de_acoes.csv``).
+
+        Args:
+            path (str): Caminho do CSV.
+
+        Returns:
+            GradeHorarios: A grade.
+        """
+        tabela = read_csv(path, dtype=str, keep_default_na=False)
+        if list(tabela.columns) != COLUNAS:
+            return cls.de_tabela(normalizar(tabela))
+        for coluna in ['inicio', 'fim']:
+            tabela[coluna] = tabela[coluna].map(ler_horario)
+        return cls.de_tabela(tabela)
+
+    def _mercado(self, mercado: str) -> str:
+        if mercado in self._fases:
+            return mercado
+        nome = limpar_nome(mercado)
+        if nome in self._fases:
+            return nome
+        raise KeyError(f'Mercado desconhecido: {mercado}')
+
+    def fases(self, mercado: str) -> List[Fase]:
+        """
+        Fases do mercado, em ordem de início.
+
+        Args:
+            mercado (str): Mercado (o nome da página, com ou sem a nota de rodapé).
+
+        Returns:
+            list: As fases.
+
+        Raises:
+            KeyError: Se o mercado não existir na grade.
+        """
+        return list(self._fases[self._mercado(mercado)])
+
+    def fase_em(self, mercado: str, instante: time) -> Optional[Fase]:
+        """
+        Fase do mercado em um instante (ex.: ``fase_em('Mercado a vista', time(17, 57))``).
+
+        Args:
+            mercado (str): Mercado.
+            instante (time): Horário consultado.
+
+        Returns:
+            Fase: A fase que contém o instante, ou None fora do pregão ou entre duas fases.
+
+        Raises:
+            KeyError: Se o mercado não existir na grade.
+        """
+        mercado = self._mercado(mercado)
+        posicao = bisect_right(self._inicios[mercado], instante) - 1
+        if posicao >= 0 and self._fases[mercado][posicao].contem(instante):
+            return self._fases[mercado][posicao]
+        return None
+
+    def proxima(self, mercado: str, fase: str, instante: time) -> Optional[Fase]:
+        """
+        Próxima ocorrência de uma fase que começa no instante ou depois dele, no mesmo dia
+        (ex.: ``proxima('Fracionário', LEILAO_ABERTURA, agora)``).
+
+        Args:
+            mercado (str): Mercado.
+            fase (str): Nome da fase.
+            instante (time): Horário a partir do qual procurar.
+
+        Returns:
+            Fase: A próxima ocorrência, ou None se o mercado não tiver mais essa fase no dia.
+            A grade não conhece o calendário de pregões: para o pregão seguinte, consulte a
+            partir de ``time.min``.
+
+        Raises:
+            KeyError: Se o mercado não existir na grade.
+        """
+        chave = (self._mercado(mercado), fase)
+        inicios = self._inicios_ocorrencias.get(chave, [])
+        posicao = bisect_left(inicios, instante)
+        return self._ocorrencias[chave][posicao] if posicao < len(inicios) else None
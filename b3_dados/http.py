@@ -0,0 +1,305 @@
+"""
+Sessão HTTP e cache em disco compartilhados pelo cliente ``b3_dados`` e pelos scripts de extração.
+
+Os scripts (``scripts/*/config.py``) adicionam a raiz do repositório ao ``sys.path`` para
+importar este módulo; o pacote instalável não depende de nada em ``scripts``.
+"""
+from hashlib import sha1
+from os import listdir, makedirs, remove, replace
+from os.path import exists, join
+from threading import Lock
+from time import time
+from typing import Callable, Dict, Optional
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+__python__ = 3.10
+
+
+def criar_sessao(max_conexoes: int = 10, tentativas: int = 3) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões e novas tentativas automáticas.
+
+    Args:
+        max_conexoes (int): Tamanho do pool de conexões por host.
+        tentativas (int): Número de novas tentativas para erros de conexão e respostas 5xx/429.
+
+    Returns:
+        requests.Session: Sessão configurada para reutilizar conexões.
+    """
+    retry = Retry(
+        total=tentativas,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+    )
+    adapter = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes, max_retries=retry)
+    sessao = requests.Session()
+    sessao.mount('http://', adapter)
+    sessao.mount('https://', adapter)
+    sessao.headers.update({'Accept': 'application/json, text/plain, */*'})
+    return sessao
+
+
+class CacheHTTP:
+    """
+    Cache em disco de respostas HTTP com requisições condicionais, validade e limite de tamanho.
+
+    Cada URL ocupa dois arquivos: o corpo (``<sha1>.bin``) e os metadados (``<sha1>.json``,
+    com ``ETag``, ``Last-Modified``, ``Content-Type``, momento da gravação e do último acesso).
+    Enquanto a entrada estiver dentro da validade (``ttl``), ela é usada sem acessar a rede;
+    depois disso, a requisição é enviada com ``If-None-Match``/``If-Modified-Since`` e uma
+    resposta 304 renova a entrada sem baixar o corpo de novo. Quando o total em disco passa de
+    ``tamanho_maximo``, as entradas acessadas há mais tempo são removidas.
+
+    Attributes:
+        path (str): Diretório do cache.
+        ttl (float): Validade, em segundos, de uma entrada sem revalidação (0 sempre revalida).
+        tamanho_maximo (int): Tamanho máximo do cache em disco, em bytes.
+
+    Methods:
+        ``entrada(url: str) -> Optional[Dict]``:
+            Metadados da URL em cache.
+
+        ``valida(entrada: Dict) -> bool``:
+            Se a entrada ainda está dentro da validade.
+
+        ``cabecalhos(entrada: Dict) -> Dict[str, str]``:
+            Cabeçalhos condicionais para revalidar a entrada.
+
+        ``resposta(url: str, entrada: Dict) -> requests.Response``:
+            Monta uma resposta 200 a partir do corpo em cache.
+
+        ``salvar(url: str, response: requests.Response) -> None`` / ``renovar(url: str, entrada: Dict) -> None``:
+            Grava uma nova resposta ou renova a validade de uma entrada após um 304.
+
+        ``despejar() -> int``:
+            Remove as entradas menos usadas até respeitar ``tamanho_maximo``.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600, tamanho_maximo: int = 100 * 1024 * 1024):
+        """
+        Inicializa o cache.
+
+        Args:
+            path (str): Diretório do cache (criado se não existir).
+            ttl (float): Validade, em segundos, de uma entrada sem revalidação.
+            tamanho_maximo (int): Tamanho máximo do cache em disco, em bytes.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.tamanho_maximo = tamanho_maximo
+        self._lock = Lock()
+        makedirs(self.path, exist_ok=True)
+
+    def _arquivos(self, url: str):
+        chave = sha1(url.encode('utf-8')).hexdigest()
+        return join(self.path, f'{chave}.bin'), join(self.path, f'{chave}.json')
+
+    @staticmethod
+    def _gravar(path: str, dados: bytes) -> None:
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as file:
+            file.write(dados)
+        replace(tmp, path)
+
+    def entrada(self, url: str) -> Optional[Dict]:
+        """
+        Metadados da URL em cache.
+
+        Args:
+            url (str): URL da requisição.
+
+        Returns:
+            dict: Metadados, ou None se a URL não estiver no cache.
+        """
+        path_corpo, path_meta = self._arquivos(url)
+        if not (exists(path_corpo) and exists(path_meta)):
+            return None
+        try:
+            with open(path_meta, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def valida(self, entrada: Dict) -> bool:
+        """
+        Se a entrada ainda está dentro da validade (pode ser usada sem acessar a rede).
+
+        Args:
+            entrada (dict): Metadados retornados por ``entrada``.
+
+        Returns:
+            bool: True se ``salvo_em + ttl`` ainda não passou.
+        """
+        return self.ttl > 0 and time() - entrada['salvo_em'] < self.ttl
+
+    @staticmethod
+    def cabecalhos(entrada: Optional[Dict]) -> Dict[str, str]:
+        """
+        Cabeçalhos condicionais para revalidar a entrada.
+
+        Args:
+            entrada (dict, optional): Metadados retornados por ``entrada``.
+
+        Returns:
+            dict: ``If-None-Match`` e/ou ``If-Modified-Since`` (vazio se não houver entrada).
+        """
+        cabecalhos = {}
+        if entrada and entrada.get('etag'):
+            cabecalhos['If-None-Match'] = entrada['etag']
+        if entrada and entrada.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = entrada['last_modified']
+        return cabecalhos
+
+    def resposta(self, url: str, entrada: Dict) -> requests.Response:
+        """
+        Monta uma resposta 200 a partir do corpo em cache e registra o acesso.
+
+        A resposta tem o atributo extra ``modificado = False``.
+
+        Args:
+            url (str): URL da requisição.
+            entrada (dict): Metadados retornados por ``entrada``.
+
+        Returns:
+            requests.Response: Resposta com o corpo em cache.
+        """
+        path_corpo, path_meta = self._arquivos(url)
+        with open(path_corpo, 'rb') as file:
+            conteudo = file.read()
+        entrada['acessado_em'] = time()
+        self._gravar(path_meta, json.dumps(entrada).encode('utf-8'))
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = conteudo
+        response.headers = CaseInsensitiveDict({
+            chave: valor for chave, valor in [('Content-Type', entrada.get('content_type')),
+                                              ('ETag', entrada.get('etag')),
+                                              ('Last-Modified', entrada.get('last_modified'))] if valor
+        })
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.modificado = False
+        return response
+
+    def salvar(self, url: str, response: requests.Response) -> None:
+        """
+        Grava o corpo e os validadores de uma resposta 200 e aplica o limite de tamanho.
+
+        Args:
+            url (str): URL da requisição.
+            response (requests.Response): Resposta recebida do servidor.
+        """
+        path_corpo, path_meta = self._arquivos(url)
+        agora = time()
+        self._gravar(path_corpo, response.content)
+        self._gravar(path_meta, json.dumps({
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'tamanho': len(response.content),
+            'hash': sha1(response.content).hexdigest(),
+            'salvo_em': agora,
+            'acessado_em': agora,
+        }).encode('utf-8'))
+        self.despejar()
+
+    def renovar(self, url: str, entrada: Dict) -> None:
+        """
+        Renova a validade de uma entrada após uma resposta 304.
+
+        Args:
+            url (str): URL da requisição.
+            entrada (dict): Metadados retornados por ``entrada``.
+        """
+        entrada['salvo_em'] = time()
+        self._gravar(self._arquivos(url)[1], json.dumps(entrada).encode('utf-8'))
+
+    def despejar(self) -> int:
+        """
+        Remove as entradas acessadas há mais tempo até o cache respeitar ``tamanho_maximo``.
+
+        Returns:
+            int: Quantidade de entradas removidas.
+        """
+        with self._lock:
+            entradas = []
+            for file in listdir(self.path):
+                if not file.endswith('.json'):
+                    continue
+                try:
+                    with open(join(self.path, file), 'r', encoding='utf-8') as arquivo:
+                        meta = json.load(arquivo)
+                    entradas.append((meta.get('acessado_em', 0), meta.get('tamanho', 0), file[:-5]))
+                except (OSError, ValueError):
+                    continue
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            removidas = 0
+            for _, tamanho, chave in sorted(entradas):
+                if total <= self.tamanho_maximo:
+                    break
+                for extensao in ('.bin', '.json'):
+                    if exists(join(self.path, chave + extensao)):
+                        remove(join(self.path, chave + extensao))
+                total -= tamanho
+                removidas += 1
+            return removidas
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            for file in listdir(self.path):
+                if file.endswith(('.bin', '.json', '.tmp')):
+                    remove(join(self.path, file))
+
+
+def get_com_cache(sessao: requests.Session, cache: Optional[CacheHTTP], url: str, forcar: bool = False,
+                  antes: Optional[Callable[[], None]] = None, **kwargs) -> requests.Response:
+    """
+    Faz uma requisição GET usando o cache: dentro da validade, não acessa a rede; depois dela,
+    envia uma requisição condicional e reaproveita o corpo em cache se o servidor responder 304.
+
+    A resposta tem os atributos extras ``origem`` (``'rede'``, ``'304'`` ou ``'cache'``) e
+    ``modificado`` (o corpo é diferente do que estava em cache).
+
+    Args:
+        sessao (requests.Session): Sessão HTTP.
+        cache (CacheHTTP, optional): Cache a ser usado. None faz uma requisição comum.
+        url (str): URL da requisição.
+        forcar (bool): Ignora o cache e baixa o corpo completo (a resposta atualiza o cache).
+        antes (Callable, optional): Chamada antes de acessar a rede (ex.: limitador de taxa).
+        **kwargs: Argumentos repassados para ``requests.Session.get``.
+
+    Returns:
+        requests.Response: Resposta do servidor ou montada a partir do cache.
+    """
+    entrada = cache.entrada(url) if cache is not None else None
+    if entrada and not forcar and cache.valida(entrada):
+        response = cache.resposta(url, entrada)
+        response.origem = 'cache'
+        return response
+
+    cabecalhos = dict(kwargs.pop('headers', None) or {})
+    if not forcar:
+        cabecalhos.update(CacheHTTP.cabecalhos(entrada))
+    if antes is not None:
+        antes()
+    response = sessao.get(url, headers=cabecalhos, **kwargs)
+    if response.status_code == 304 and entrada:
+        cache.renovar(url, entrada)
+        response = cache.resposta(url, entrada)
+        response.origem = '304'
+        return response
+
+    response.origem = 'rede'
+    response.modificado = entrada is None or entrada.get('hash') != sha1(response.content).hexdigest()
+    if cache is not None and response.status_code == 200:
+        cache.salvar(url, response)
+    return response
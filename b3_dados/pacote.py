@@ -0,0 +1,379 @@
+from hashlib import sha256
+from io import BytesIO
+from os import makedirs, replace, remove
+from os.path import exists, getsize, join
+from typing import Dict, List
+import gzip
+import json
+import sqlite3
+
+from pandas import DataFrame, concat, read_csv, read_sql_query
+
+from b3_dados.cliente import (ARQUIVO_EMPRESAS, ARQUIVO_HORARIOS, INDICES, PASTA_INDICES,
+                              ClienteB3Dados)
+from b3_dados.horarios import normalizar
+
+__python__ = 3.10
+
+# Nome do pacote, da sua cópia compactada (a que é versionada e baixada) e do manifesto,
+# relativos à pasta `processed_data`
+ARQUIVO_PACOTE = 'b3_dados.sqlite'
+ARQUIVO_PACOTE_COMPACTADO = 'b3_dados.sqlite.gz'
+ARQUIVO_MANIFESTO = 'b3_dados.json'
+
+# Versão do esquema do pacote (altere quando as tabelas ou a conversão das origens mudarem)
+VERSAO_ESQUEMA = 3
+
+# Formato do CNPJ em empresas listadas
+PADRAO_CNPJ = r'^\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}$'
+
+# Tamanho máximo do mapeamento em memória ao abrir o pacote
+MMAP_TAMANHO = 256 * 1024 * 1024
+
+ESQUEMA = """
+CREATE TABLE indices (
+    indice TEXT PRIMARY KEY,
+    apresentacao TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE carteiras (
+    indice TEXT NOT NULL REFERENCES indices (indice),
+    posicao INTEGER NOT NULL,
+    codigo TEXT NOT NULL,
+    acao TEXT,
+    tipo TEXT,
+    qtde_teorica INTEGER,
+    participacao REAL,
+    PRIMARY KEY (indice, codigo)
+) WITHOUT ROWID;
+CREATE INDEX carteiras_codigo ON carteiras (codigo);
+
+CREATE TABLE horarios (
+    mercado TEXT NOT NULL,
+    fase TEXT NOT NULL,
+    inicio TEXT NOT NULL,
+    fim TEXT NOT NULL,
+    PRIMARY KEY (mercado, inicio)
+) WITHOUT ROWID;
+
+CREATE TABLE empresas (
+    codigo TEXT PRIMARY KEY,
+    nome_do_pregao TEXT,
+    codigo_de_negociacao TEXT,
+    cnpj TEXT,
+    atividade_principal TEXT,
+    classificacao_setorial TEXT,
+    escriturador TEXT
+) WITHOUT ROWID;
+CREATE INDEX empresas_cnpj ON empresas (cnpj);
+
+CREATE TABLE manifesto (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def converter_carteira(conteudo: bytes, indice: str) -> DataFrame:
+    """
+    Converte ``Tabela_{indice}.csv`` (números no formato da B3) para as colunas da tabela ``carteiras``.
+    """
+    tabela = read_csv(BytesIO(conteudo), thousands='.', decimal=',', dtype={'Código': str, 'Ação': str, 'Tipo': str})
+    return DataFrame({
+        'indice': indice,
+        'posicao': range(len(tabela)),
+        'codigo': tabela['Código'],
+        'acao': tabela['Ação'],
+        'tipo': tabela['Tipo'],
+        'qtde_teorica': tabela['Qtde. Teórica'].astype('Int64'),
+        'participacao': tabela['Part. (%)'].astype('float64'),
+    })
+
+
+def converter_horarios(conteudo: bytes) -> DataFrame:
+    """
+    Converte a tabela de horários da página para o formato longo de ``horarios.normalizar``
+    (o mesmo de ``Fases_do_pregao_por_mercado.csv``): uma linha por mercado e fase, sem as
+    notas de rodapé dos nomes e sem as fases marcadas com ``–``. Horários no formato ``HH:MM``.
+    """
+    fases = normalizar(read_csv(BytesIO(conteudo), dtype=str, keep_default_na=False))
+    for coluna in ['inicio', 'fim']:
+        fases[coluna] = fases[coluna].map(lambda horario: horario.strftime('%H:%M'))
+    return fases
+
+
+def converter_empresas(conteudo: bytes) -> DataFrame:
+    """
+    Lê ``todas_empresas_listadas.csv`` e realinha os registros com os campos deslocados.
+
+    Nas páginas das empresas com código de negociação lidas pelos XPaths posicionais, ``cnpj``
+    tem uma data (ou está vazio), o CNPJ está em ``atividade_principal`` e a atividade em
+    ``classificacao_setorial``. Nesses registros (``cnpj`` fora de ``PADRAO_CNPJ`` e um CNPJ em
+    ``atividade_principal``), os três campos voltam uma coluna e a classificação setorial, que
+    não foi lida, fica vazia.
+    """
+    tabela = read_csv(BytesIO(conteudo), delimiter=';', dtype=str)
+    deslocados = (~tabela['cnpj'].fillna('').str.match(PADRAO_CNPJ)
+                  & tabela['atividade_principal'].fillna('').str.match(PADRAO_CNPJ))
+    colunas = ['cnpj', 'atividade_principal', 'classificacao_setorial']
+    tabela.loc[deslocados, colunas] = tabela.loc[deslocados, colunas].shift(-1, axis=1)
+    return tabela
+
+
+def construir_pacote(raiz: str, destino: str = None, indices: List[str] = None) -> Dict:
+    """
+    Gera o pacote SQLite com todos os dados processados e o seu manifesto.
+
+    O pacote só é regravado quando o conteúdo dos arquivos de origem muda: a versão é o hash
+    das origens, então duas execuções com os mesmos dados produzem o mesmo arquivo. Além do
+    SQLite, é gravada a cópia compactada (gzip, sem data no cabeçalho), que é a versionada
+    e baixada pelo cliente; o ``sha256`` do manifesto é o do SQLite descompactado.
+
+    Args:
+        raiz (str): Diretório ``processed_data``.
+        destino (str, optional): Diretório do pacote. Padrão é ``raiz``.
+        indices (list, optional): Índices a incluir. Padrão é ``INDICES``.
+
+    Returns:
+        dict: O manifesto (versão, hash e tamanhos do pacote, hash das origens e linhas por tabela).
+    """
+    destino = destino or raiz
+    indices = list(indices or INDICES)
+    cliente = ClienteB3Dados(raiz)
+
+    caminhos = [f'{PASTA_INDICES}/Setores/{indice}/{arquivo}'
+                for indice in indices for arquivo in [f'Apresentação_{indice}.txt', f'Tabela_{indice}.csv']]
+    caminhos += [ARQUIVO_HORARIOS, ARQUIVO_EMPRESAS]
+    conteudos = cliente.ler_varios(caminhos)
+
+    origens = {caminho: sha256(conteudo).hexdigest() for caminho, conteudo in sorted(conteudos.items())}
+    versao = sha256(json.dumps([VERSAO_ESQUEMA, origens], sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    path_pacote = join(destino, ARQUIVO_PACOTE)
+    path_compactado = join(destino, ARQUIVO_PACOTE_COMPACTADO)
+    path_manifesto = join(destino, ARQUIVO_MANIFESTO)
+    if exists(path_compactado) and exists(path_manifesto):
+        with open(path_manifesto, 'r', encoding='utf-8') as file:
+            manifesto = json.load(file)
+        with open(path_compactado, 'rb') as file:
+            atual = sha256(gzip.decompress(file.read())).hexdigest()
+        if manifesto.get('versao') == versao and manifesto.get('sha256') == atual:
+            print(f'Pacote inalterado (versão {versao}): {path_compactado}')
+            return manifesto
+
+    apresentacoes = DataFrame({
+        'indice': indices,
+        'apresentacao': [conteudos[f'{PASTA_INDICES}/Setores/{i}/Apresentação_{i}.txt'].decode('utf-8') for i in indices],
+    })
+    carteiras = [converter_carteira(conteudos[f'{PASTA_INDICES}/Setores/{i}/Tabela_{i}.csv'], i) for i in indices]
+    tabelas = {
+        'indices': apresentacoes,
+        'carteiras': concat(carteiras, ignore_index=True),
+        'horarios': converter_horarios(conteudos[ARQUIVO_HORARIOS]),
+        'empresas': converter_empresas(conteudos[ARQUIVO_EMPRESAS]),
+    }
+
+    makedirs(destino, exist_ok=True)
+    tmp = f'{path_pacote}.tmp'
+    if exists(tmp):
+        remove(tmp)
+    conexao = sqlite3.connect(tmp)
+    try:
+        conexao.executescript(ESQUEMA)
+        for nome, tabela in tabelas.items():
+            tabela.to_sql(nome, conexao, if_exists='append', index=False)
+        linhas = {nome: len(tabela) for nome, tabela in tabelas.items()}
+        conexao.executemany('INSERT INTO manifesto VALUES (?, ?)', [
+            ('versao', versao),
+            ('versao_esquema', str(VERSAO_ESQUEMA)),
+            ('origens', json.dumps(origens, ensure_ascii=False, sort_keys=True)),
+            ('linhas', json.dumps(linhas, sort_keys=True)),
+        ])
+        conexao.commit()
+        conexao.execute('VACUUM')
+    finally:
+        conexao.close()
+    replace(tmp, path_pacote)
+
+    with open(path_pacote, 'rb') as file:
+        dados = file.read()
+    with open(tmp, 'wb') as file:
+        file.write(gzip.compress(dados, compresslevel=9, mtime=0))
+    replace(tmp, path_compactado)
+
+    manifesto = {
+        'versao': versao,
+        'versao_esquema': VERSAO_ESQUEMA,
+        'arquivo': ARQUIVO_PACOTE,
+        'sha256': sha256(dados).hexdigest(),
+        'tamanho': len(dados),
+        'arquivo_compactado': ARQUIVO_PACOTE_COMPACTADO,
+        'tamanho_compactado': getsize(path_compactado),
+        'linhas': linhas,
+        'origens': origens,
+    }
+    with open(path_manifesto, 'w', encoding='utf-8') as file:
+        json.dump(manifesto, file, ensure_ascii=False, indent=2, sort_keys=True)
+        file.write('\n')
+    print(f'Pacote gerado (versão {versao}): {path_compactado}')
+    return manifesto
+
+
+class PacoteB3Dados:
+    """
+    Acesso somente leitura ao pacote SQLite gerado por ``construir_pacote``.
+
+    O arquivo é aberto com ``mode=ro`` e mapeado em memória (``PRAGMA mmap_size``), então as
+    consultas leem as páginas diretamente do cache do sistema operacional, sem carregar tabelas
+    inteiras nem interpretar CSVs.
+
+    Attributes:
+        path (str): Caminho do arquivo ``b3_dados.sqlite``.
+        conexao (sqlite3.Connection): Conexão somente leitura.
+
+    Methods:
+        ``consultar(sql: str, parametros=()) -> DataFrame``:
+            Executa uma consulta SQL.
+
+        ``manifesto() -> Dict``:
+            Versão, hash das origens e linhas por tabela.
+
+        ``carteira(indice: str) -> DataFrame`` / ``codigos(indice: str) -> List[str]`` /
+        ``apresentacao(indice: str) -> str``:
+            Dados de um índice.
+
+        ``indices_com(codigo: str) -> Dict[str, float]``:
+            Índices que contêm o ativo, com a participação em cada um.
+
+        ``empresa(codigo: str = None, cnpj: str = None) -> DataFrame`` / ``horarios() -> DataFrame``:
+            Empresas listadas e horários de negociação.
+    """
+
+    def __init__(self, path: str, mmap_tamanho: int = MMAP_TAMANHO):
+        """
+        Abre o pacote.
+
+        Args:
+            path (str): Caminho do arquivo ``b3_dados.sqlite``.
+            mmap_tamanho (int): Tamanho máximo do mapeamento em memória, em bytes.
+        """
+        self.path = path
+        self.conexao = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self.conexao.execute(f'PRAGMA mmap_size = {int(mmap_tamanho)}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def fechar(self) -> None:
+        """Fecha a conexão."""
+        self.conexao.close()
+
+    def consultar(self, sql: str, parametros=()) -> DataFrame:
+        """
+        Executa uma consulta SQL.
+
+        Args:
+            sql (str): Consulta (ex.: ``SELECT * FROM carteiras WHERE indice = ?``).
+            parametros (tuple, optional): Parâmetros da consulta.
+
+        Returns:
+            DataFrame: Resultado.
+        """
+        return read_sql_query(sql, self.conexao, params=parametros)
+
+    def manifesto(self) -> Dict:
+        """
+        Versão, hash das origens e linhas por tabela.
+
+        Returns:
+            dict: Conteúdo da tabela ``manifesto``.
+        """
+        valores = dict(self.conexao.execute('SELECT chave, valor FROM manifesto'))
+        return {
+            'versao': valores['versao'],
+            'versao_esquema': int(valores['versao_esquema']),
+            'origens': json.loads(valores['origens']),
+            'linhas': json.loads(valores['linhas']),
+        }
+
+    def carteira(self, indice: str) -> DataFrame:
+        """
+        Composição da carteira de um índice, na ordem da B3.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            DataFrame: codigo, acao, tipo, qtde_teorica e participacao.
+        """
+        return self.consultar('SELECT codigo, acao, tipo, qtde_teorica, participacao FROM carteiras '
+                              'WHERE indice = ? ORDER BY posicao', (indice,))
+
+    def codigos(self, indice: str) -> List[str]:
+        """
+        Códigos das ações de um índice.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            list: Códigos, na ordem da B3.
+        """
+        cursor = self.conexao.execute('SELECT codigo FROM carteiras WHERE indice = ? ORDER BY posicao', (indice,))
+        return [linha[0] for linha in cursor]
+
+    def apresentacao(self, indice: str) -> str:
+        """
+        Texto de apresentação de um índice.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            str: Texto de apresentação (vazio se o índice não existir).
+        """
+        linha = self.conexao.execute('SELECT apresentacao FROM indices WHERE indice = ?', (indice,)).fetchone()
+        return linha[0] if linha else ''
+
+    def indices_com(self, codigo: str) -> Dict[str, float]:
+        """
+        Índices que contêm o ativo, com a participação em cada um.
+
+        Args:
+            codigo (str): Código do ativo (ex.: ``PETR4``).
+
+        Returns:
+            dict: Índice -> participação (%).
+        """
+        cursor = self.conexao.execute('SELECT indice, participacao FROM carteiras WHERE codigo = ? ORDER BY indice', (codigo,))
+        return dict(cursor)
+
+    def empresa(self, codigo: str = None, cnpj: str = None) -> DataFrame:
+        """
+        Empresas listadas, filtradas por código ou CNPJ.
+
+        Args:
+            codigo (str, optional): Código da empresa (ex.: ``PETR``).
+            cnpj (str, optional): CNPJ no formato ``00.000.000/0000-00``.
+
+        Returns:
+            DataFrame: Empresas encontradas (todas, se nenhum filtro for informado).
+        """
+        if codigo:
+            return self.consultar('SELECT * FROM empresas WHERE codigo = ?', (codigo,))
+        if cnpj:
+            return self.consultar('SELECT * FROM empresas WHERE cnpj = ?', (cnpj,))
+        return self.consultar('SELECT * FROM empresas')
+
+    def horarios(self) -> DataFrame:
+        """
+        Horários de negociação, uma linha por mercado e fase.
+
+        Returns:
+            DataFrame: mercado, fase, inicio e fim (só as fases que existem no mercado; uma fase
+            pode aparecer mais de uma vez no mesmo mercado).
+        """
+        return self.consultar('SELECT * FROM horarios')
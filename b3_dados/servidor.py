@@ -0,0 +1,300 @@
+from collections import defaultdict
+from hashlib import sha1
+from os import stat
+from os.path import dirname, join
+from threading import Event, Lock, Thread
+from time import time
+from typing import Dict, List, Optional, Tuple
+import json
+import re
+import sys
+
+from flask import Flask, Response, request
+from pandas import DataFrame, isna
+
+from b3_dados.cliente import (ARQUIVO_EMPRESAS, ARQUIVO_HORARIOS, INDICES, PASTA_INDICES,
+                              ClienteB3Dados)
+from b3_dados.pacote import PADRAO_CNPJ, converter_carteira, converter_empresas, converter_horarios
+
+__python__ = 3.10
+
+# Número máximo de respostas mantidas em cache por versão dos dados
+MAX_RESPOSTAS = 10000
+
+
+def _registros(tabela: DataFrame) -> List[Dict]:
+    """
+    Linhas da tabela como dicionários, com ``None`` no lugar de NaN (JSON válido).
+    """
+    return [{chave: (None if isna(valor) else valor) for chave, valor in linha.items()}
+            for linha in tabela.to_dict(orient='records')]
+
+
+class DadosEmMemoria:
+    """
+    Tabelas processadas carregadas uma única vez, com índices de hash para as consultas.
+
+    Uma instância é imutável depois de carregada: a recarga cria uma nova instância e troca a
+    referência usada pelo servidor, então as requisições em andamento nunca veem dados pela metade.
+
+    Attributes:
+        caminhos (List[str]): Arquivos de origem, relativos a ``processed_data``.
+        indices (Dict[str, Dict]): Índice -> apresentação e carteira.
+        tickers (Dict[str, Dict[str, Dict]]): Código do ativo -> {índice: linha da carteira}.
+        empresas_por_codigo (Dict[str, Dict]): Código da empresa -> linha de empresas listadas.
+        empresas_por_cnpj (Dict[str, List[Dict]]): CNPJ -> empresas com esse CNPJ (apenas os
+            valores no formato ``PADRAO_CNPJ``, depois de realinhados por ``converter_empresas``).
+        horarios (List[Dict]): Horários de negociação, uma linha por mercado e fase.
+        versao (str): Hash do conteúdo das origens.
+        carregado_em (float): Momento da carga (``time.time()``).
+    """
+
+    def __init__(self, cliente: ClienteB3Dados, indices: List[str] = None):
+        """
+        Lê as origens e monta os índices.
+
+        Args:
+            cliente (ClienteB3Dados): Cliente usado para ler ``processed_data`` (local ou remoto).
+            indices (list, optional): Índices a carregar. Padrão é ``INDICES``.
+        """
+        indices = list(indices or INDICES)
+        self.caminhos = [f'{PASTA_INDICES}/Setores/{indice}/{arquivo}'
+                         for indice in indices for arquivo in [f'Apresentação_{indice}.txt', f'Tabela_{indice}.csv']]
+        self.caminhos += [ARQUIVO_HORARIOS, ARQUIVO_EMPRESAS]
+        conteudos = cliente.ler_varios(self.caminhos)
+        versao = sha1()
+        for caminho in self.caminhos:
+            versao.update(conteudos[caminho])
+        self.versao = versao.hexdigest()[:16]
+        self.carregado_em = time()
+
+        self.indices = {}
+        self.tickers = defaultdict(dict)
+        for indice in indices:
+            carteira = _registros(converter_carteira(conteudos[f'{PASTA_INDICES}/Setores/{indice}/Tabela_{indice}.csv'], indice)
+                                  .drop(columns=['indice', 'posicao']))
+            self.indices[indice] = {
+                'indice': indice,
+                'apresentacao': conteudos[f'{PASTA_INDICES}/Setores/{indice}/Apresentação_{indice}.txt'].decode('utf-8'),
+                'carteira': carteira,
+            }
+            for linha in carteira:
+                self.tickers[linha['codigo']][indice] = linha
+        self.tickers = dict(self.tickers)
+
+        empresas = _registros(converter_empresas(conteudos[ARQUIVO_EMPRESAS]))
+        self.empresas_por_codigo = {empresa['codigo']: empresa for empresa in empresas}
+        self.empresas_por_cnpj = defaultdict(list)
+        for empresa in empresas:
+            if empresa['cnpj'] and re.match(PADRAO_CNPJ, empresa['cnpj']):
+                self.empresas_por_cnpj[empresa['cnpj']].append(empresa)
+        self.empresas_por_cnpj = dict(self.empresas_por_cnpj)
+        self.horarios = _registros(converter_horarios(conteudos[ARQUIVO_HORARIOS]))
+
+    def ticker(self, codigo: str) -> Optional[Dict]:
+        """
+        Índices que contêm o ativo e a empresa emissora (pelos quatro primeiros caracteres do código).
+
+        Args:
+            codigo (str): Código do ativo (ex.: ``PETR4``).
+
+        Returns:
+            dict: ``codigo``, ``indices`` (índice -> linha da carteira) e ``empresa``;
+            None se o ativo não estiver em nenhum índice nem em empresas listadas.
+        """
+        indices = self.tickers.get(codigo, {})
+        empresa = self.empresas_por_codigo.get(codigo[:4])
+        if not indices and empresa is None:
+            return None
+        return {'codigo': codigo, 'indices': indices, 'empresa': empresa}
+
+
+class ServicoDados:
+    """
+    Mantém os dados em memória e os recarrega quando os arquivos de origem mudam.
+
+    No modo local, uma thread verifica a cada ``intervalo`` segundos a data de modificação e o
+    tamanho dos arquivos de origem; se algum mudar, os dados são recarregados e a referência é
+    trocada. As respostas JSON (e os seus ETags) ficam em cache até a próxima recarga.
+
+    Attributes:
+        cliente (ClienteB3Dados): Cliente usado para ler ``processed_data``.
+        dados (DadosEmMemoria): Dados atuais.
+        intervalo (float): Intervalo, em segundos, entre as verificações (0 desativa a recarga).
+
+    Methods:
+        ``assinatura() -> Tuple``:
+            Data de modificação e tamanho dos arquivos de origem (modo local).
+
+        ``recarregar_se_alterado() -> bool``:
+            Recarrega os dados se as origens mudaram.
+
+        ``resposta(chave: str, gerar) -> Tuple[bytes, str]``:
+            Corpo JSON e ETag de um recurso, gerados uma vez por versão dos dados.
+    """
+
+    def __init__(self, cliente: ClienteB3Dados, intervalo: float = 5.0):
+        """
+        Carrega os dados e, no modo local, inicia a verificação de alterações.
+
+        Args:
+            cliente (ClienteB3Dados): Cliente usado para ler ``processed_data``.
+            intervalo (float): Intervalo, em segundos, entre as verificações (0 desativa a recarga).
+        """
+        self.cliente = cliente
+        self.intervalo = intervalo
+        self.dados = DadosEmMemoria(cliente)
+        self._assinatura = self.assinatura()
+        self._respostas = {}
+        self._lock = Lock()
+        self._parar = Event()
+        if cliente.local and intervalo > 0:
+            Thread(target=self._vigiar, daemon=True).start()
+
+    def assinatura(self) -> Optional[Tuple]:
+        """
+        Data de modificação e tamanho dos arquivos de origem.
+
+        Returns:
+            tuple: (caminho, mtime, tamanho) de cada origem; None no modo remoto.
+        """
+        if not self.cliente.local:
+            return None
+        assinatura = []
+        for caminho in self.dados.caminhos:
+            try:
+                info = stat(self.cliente.url(caminho))
+                assinatura.append((caminho, info.st_mtime_ns, info.st_size))
+            except OSError:
+                assinatura.append((caminho, None, None))
+        return tuple(assinatura)
+
+    def recarregar_se_alterado(self) -> bool:
+        """
+        Recarrega os dados se as origens mudaram desde a última carga.
+
+        Returns:
+            bool: True se os dados foram recarregados.
+        """
+        assinatura = self.assinatura()
+        if assinatura == self._assinatura:
+            return False
+        try:
+            dados = DadosEmMemoria(self.cliente)
+        except Exception as e:
+            print(f'Erro ao recarregar os dados: {e}')
+            return False
+        with self._lock:
+            self.dados = dados
+            self._assinatura = assinatura
+            self._respostas = {}
+        print(f'Dados recarregados (versão {dados.versao})')
+        return True
+
+    def _vigiar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            self.recarregar_se_alterado()
+
+    def parar(self) -> None:
+        """Interrompe a verificação de alterações."""
+        self._parar.set()
+
+    def resposta(self, chave: str, gerar) -> Tuple[bytes, str]:
+        """
+        Corpo JSON e ETag de um recurso, gerados uma vez por versão dos dados.
+
+        Args:
+            chave (str): Identificador do recurso (ex.: ``/indices/IMOB``).
+            gerar (callable): Recebe ``DadosEmMemoria`` e retorna o objeto a serializar.
+
+        Returns:
+            tuple: (corpo, etag).
+        """
+        respostas = self._respostas
+        if chave in respostas:
+            return respostas[chave]
+        corpo = json.dumps(gerar(self.dados), ensure_ascii=False).encode('utf-8')
+        resultado = (corpo, sha1(corpo).hexdigest()[:20])
+        if len(respostas) < MAX_RESPOSTAS:
+            respostas[chave] = resultado
+        return resultado
+
+
+def criar_app(raiz: str = None, intervalo: float = 5.0) -> Flask:
+    """
+    Cria o serviço HTTP somente leitura sobre os dados processados.
+
+    Endpoints: ``/indices``, ``/indices/<indice>``, ``/tickers/<codigo>``,
+    ``/empresas?cnpj=...&codigo=...``, ``/horarios`` e ``/saude``. Todas as respostas
+    têm ETag; com ``If-None-Match`` igual, o servidor responde 304 sem corpo.
+
+    Args:
+        raiz (str, optional): Diretório ``processed_data`` ou URL base. Padrão é a pasta
+            ``processed_data`` do repositório.
+        intervalo (float): Intervalo, em segundos, da verificação de alterações (0 desativa).
+
+    Returns:
+        Flask: A aplicação (o serviço fica em ``app.config['SERVICO']``).
+    """
+    raiz = raiz or join(dirname(dirname(__file__)), 'processed_data')
+    servico = ServicoDados(ClienteB3Dados(raiz, cache=None), intervalo)
+    app = Flask(__name__)
+    app.config['SERVICO'] = servico
+
+    def responder(gerar, status_ausente: str = None) -> Response:
+        chave = request.full_path
+        corpo, etag = servico.resposta(chave, gerar)
+        if corpo == b'null':
+            return Response(json.dumps({'erro': status_ausente}, ensure_ascii=False), status=404,
+                            mimetype='application/json')
+        resposta = Response(corpo, mimetype='application/json')
+        resposta.set_etag(etag)
+        resposta.headers['Cache-Control'] = 'no-cache'
+        return resposta.make_conditional(request)
+
+    @app.get('/indices')
+    def listar_indices():
+        return responder(lambda dados: {indice: len(valor['carteira']) for indice, valor in dados.indices.items()})
+
+    @app.get('/indices/<indice>')
+    def obter_indice(indice: str):
+        indice = indice.upper()
+        return responder(lambda dados: dados.indices.get(indice), f'Índice não encontrado: {indice}')
+
+    @app.get('/tickers/<codigo>')
+    def obter_ticker(codigo: str):
+        codigo = codigo.upper()
+        return responder(lambda dados: dados.ticker(codigo), f'Ativo não encontrado: {codigo}')
+
+    @app.get('/empresas')
+    def buscar_empresas():
+        cnpj = request.args.get('cnpj')
+        codigo = request.args.get('codigo', '').upper()
+
+        def gerar(dados):
+            if cnpj:
+                return dados.empresas_por_cnpj.get(cnpj, [])
+            if codigo:
+                empresa = dados.empresas_por_codigo.get(codigo)
+                return [empresa] if empresa else []
+            return list(dados.empresas_por_codigo.values())
+        return responder(gerar)
+
+    @app.get('/horarios')
+    def listar_horarios():
+        return responder(lambda dados: dados.horarios)
+
+    @app.get('/saude')
+    def saude():
+        dados = servico.dados
+        return {'versao': dados.versao, 'carregado_em': dados.carregado_em,
+                'indices': len(dados.indices), 'tickers': len(dados.tickers),
+                'empresas': len(dados.empresas_por_codigo)}
+
+    return app
+
+
+if __name__ == '__main__':
+    # Uso: python -m b3_dados.servidor [processed_data] [porta]
+    app = criar_app(sys.argv[1] if len(sys.argv) > 1 else None)
+    app.run(host='127.0.0.1', port=int(sys.argv[2]) if len(sys.argv) > 2 else 5000, threaded=True)
@@ -0,0 +1,51 @@
+from os.path import join
+from time import perf_counter
+from pandas import read_csv
+import config
+from carteira import ler_carteira_do_dia, ler_carteiras
+from transform_data_composicao_da_carteira_indices_setoriais import Transform
+
+__python__ = 3.10
+
+
+def ler_carteira_engine_python(path: str):
+    """
+    Leitura anterior: engine Python (por causa do ``skipfooter``) + ``reset_index``.
+
+    Mantida aqui apenas como referência de comparação.
+    """
+    file_csv = read_csv(path, encoding='ISO-8859-1', delimiter=';', skiprows=1, skipfooter=2,
+                        na_values=['NaN', ''], on_bad_lines='warn', engine='python').reset_index()
+    file_csv.columns = ['Código', 'Ação', 'Tipo', 'Qtde. Teórica', 'Part. (%)', '']
+    return file_csv.iloc[:, :-1]
+
+
+def medir(nome: str, funcao, repeticoes: int = 5) -> float:
+    """
+    Executa a função ``repeticoes`` vezes e imprime o melhor tempo.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        resultado = funcao()
+        tempos.append(perf_counter() - inicio)
+    melhor = min(tempos)
+    linhas = sum(len(tabela) for tabela in resultado) if isinstance(resultado, list) else len(resultado)
+    print(f'{nome:<45} {melhor * 1000:>9.1f} ms  ({linhas} linhas)')
+    return melhor
+
+
+if __name__ == '__main__':
+    transform = Transform(config.path_extracted_data, config.path_processed_data, config.INDICES.keys(),
+                          config.INDICES, config.path_manifesto, config.SLUGS_INDICES)
+    arquivos = {indice: transform.loc_data_csv(indice) for indice in config.INDICES}
+    caminhos = [join(config.path_extracted_data, file) for file in arquivos.values() if file]
+
+    print(f'\nLeitura das {len(caminhos)} carteiras (melhor de 5):')
+    base = medir('Engine Python + skipfooter (anterior)',
+                 lambda: [ler_carteira_engine_python(path) for path in caminhos])
+    por_arquivo = medir('Sem read_csv, arquivo a arquivo',
+                        lambda: [ler_carteira_do_dia(path) for path in caminhos])
+    lote = medir('Engine C, em lote (ler_carteiras)', lambda: ler_carteiras(config.path_extracted_data, arquivos))
+
+    print(f'\nGanho arquivo a arquivo: {base / por_arquivo:.1f}x, em lote: {base / lote:.1f}x')
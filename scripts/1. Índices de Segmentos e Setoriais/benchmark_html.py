@@ -0,0 +1,67 @@
+from os import listdir
+from os.path import join
+from time import perf_counter
+from bs4 import BeautifulSoup
+import config
+from comum.analise_html import fragmentos_por_id, texto_documento
+
+__python__ = 3.10
+
+
+def texto_bs4(htm: str) -> str:
+    """
+    Leitura anterior de ``Transform.read_data_htm``: árvore completa do BeautifulSoup.
+
+    Mantida aqui apenas como referência de comparação.
+    """
+    return BeautifulSoup(htm, 'html.parser').get_text(strip=True)
+
+
+def paineis_bs4(htm: str) -> str:
+    """
+    Extração anterior de ``Extract.save_informacoes_indice``: árvore completa + ``find_all``.
+
+    Mantida aqui apenas como referência de comparação.
+    """
+    soup = BeautifulSoup(htm, 'html.parser')
+    return ''.join(str(tag) for tag in soup.find_all(id='panel3a') or soup.find_all(id='panel1a'))
+
+
+def medir(nome: str, funcao, documentos: list, repeticoes: int = 5) -> float:
+    """
+    Aplica a função a todos os documentos ``repeticoes`` vezes e imprime o melhor tempo.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        for htm in documentos:
+            funcao(htm)
+        tempos.append(perf_counter() - inicio)
+    melhor = min(tempos)
+    print(f'{nome:<45} {melhor * 1000:>9.1f} ms  ({melhor / len(documentos) * 1e6:.0f} µs/arquivo)')
+    return melhor
+
+
+if __name__ == '__main__':
+    arquivos = sorted(file for file in listdir(config.path_extracted_data)
+                      if file.startswith('info_') and file.endswith('.htm'))
+    documentos = []
+    for file in arquivos:
+        with open(join(config.path_extracted_data, file), 'r', encoding='utf-8') as htm:
+            documentos.append(htm.read())
+
+    divergentes = [file for file, htm in zip(arquivos, documentos)
+                   if texto_documento(htm) != texto_bs4(htm) or fragmentos_por_id(htm, 'panel3a', 'panel1a') != paineis_bs4(htm)]
+    print(f'\n{len(documentos)} arquivos info_*.htm, {sum(map(len, documentos)) / 1024:.0f} KiB, '
+          f'resultados divergentes: {len(divergentes)} {divergentes or ""}')
+
+    print('\nTexto do arquivo (read_data_htm), melhor de 5:')
+    base = medir('BeautifulSoup html.parser (anterior)', texto_bs4, documentos)
+    lxml = medir('lxml (texto_documento)', texto_documento, documentos)
+    print(f'Ganho: {base / lxml:.1f}x')
+
+    print('\nPainéis #panel3a/#panel1a (save_informacoes_indice), melhor de 5:')
+    base = medir('BeautifulSoup html.parser + find_all (anterior)', paineis_bs4, documentos)
+    lxml = medir('lxml incremental (fragmentos_por_id)',
+                 lambda htm: fragmentos_por_id(htm, 'panel3a', 'panel1a'), documentos)
+    print(f'Ganho: {base / lxml:.1f}x')
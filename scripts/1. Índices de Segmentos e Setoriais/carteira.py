@@ -0,0 +1,214 @@
+import re
+from datetime import date, datetime
+from io import StringIO
+from os.path import join
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pandas import Categorical, DataFrame, isna, read_csv
+from pandas.arrays import IntegerArray
+
+__python__ = 3.10
+
+# Nome dos arquivos de composição baixados: `XXXXDia_dd-mm-yy.csv`
+PADRAO_CSV = re.compile(r'^(?P<indice>[A-Za-z0-9]+)Dia_(?P<data>\d{2}-\d{2}-\d{2})\.csv$')
+
+# Colunas do arquivo "Carteira do Dia" da B3, na ordem do arquivo
+COLUNAS = ['Código', 'Ação', 'Tipo', 'Qtde. Teórica', 'Part. (%)']
+
+# Tipos das colunas após a leitura (a quantidade é inteira com suporte a células vazias)
+TIPOS = {
+    'Índice': 'category',
+    'Código': 'object',
+    'Ação': 'object',
+    'Tipo': 'category',
+    'Qtde. Teórica': 'Int64',
+    'Part. (%)': 'float64',
+}
+
+
+def identificar_arquivo(file: str) -> Optional[Tuple[str, date]]:
+    """
+    Extrai o índice e a data de um arquivo ``XXXXDia_dd-mm-yy.csv``.
+
+    Args:
+        file (str): Nome do arquivo.
+
+    Returns:
+        tuple: (índice em maiúsculas, data da carteira), ou None se o nome não seguir o padrão.
+    """
+    encontrado = PADRAO_CSV.match(file)
+    if not encontrado:
+        return None
+    return encontrado.group('indice').upper(), datetime.strptime(encontrado.group('data'), '%d-%m-%y').date()
+
+
+def ler_linhas_carteira(path: str, linhas_cabecalho: int = 1, linhas_rodape: int = 2,
+                        encoding: str = 'ISO-8859-1') -> List[str]:
+    """
+    Lê as linhas de dados de um arquivo "Carteira do Dia", sem título, cabeçalho e rodapé.
+
+    Args:
+        path (str): Caminho do arquivo CSV.
+        linhas_cabecalho (int, optional): Linhas antes do cabeçalho das colunas. Padrão é 1.
+        linhas_rodape (int, optional): Linhas de rodapé a descartar. Padrão é 2.
+        encoding (str, optional): Codificação do arquivo. Padrão é 'ISO-8859-1'.
+
+    Returns:
+        list: Linhas da carteira, ainda no formato ``ABCB4;ABC BRASIL;PN      N2;128.429.717;0,520;``.
+    """
+    with open(path, 'r', encoding=encoding) as file:
+        linhas = file.read().splitlines()
+    if linhas_rodape:
+        linhas = linhas[:-linhas_rodape]
+    return linhas[linhas_cabecalho + 1:]
+
+
+def converter_linhas(texto: str, colunas: List[str], na_values: List[str] = None) -> DataFrame:
+    """
+    Converte linhas no formato da B3 (``;``, milhar com ponto, decimal com vírgula) em colunas tipadas.
+
+    Args:
+        texto (str): Linhas separadas por quebra de linha.
+        colunas (list): Nomes das colunas presentes em cada linha, entre as de ``TIPOS`` (colunas
+            extras no fim da linha são ignoradas).
+        na_values (list, optional): Valores a serem considerados como NaN. Padrão é ['NaN', ''].
+
+    Returns:
+        DataFrame: Colunas tipadas segundo ``TIPOS``.
+    """
+    if na_values is None:
+        na_values = ['NaN', '']
+    # Os tipos categóricos e inteiros anuláveis são aplicados depois: pedir 'category' ao
+    # read_csv é mais lento, e com 'Int64' o separador de milhar não é considerado
+    tipos = {coluna: TIPOS[coluna] for coluna in colunas}
+    tipos_leitura = {coluna: tipo for coluna, tipo in tipos.items() if tipo not in ('category', 'Int64')}
+    tabela = read_csv(
+        StringIO(texto),
+        sep=';',
+        header=None,
+        names=colunas,
+        usecols=range(len(colunas)),
+        thousands='.',
+        decimal=',',
+        na_values=na_values,
+        keep_default_na=False,
+        dtype=tipos_leitura,
+        engine='c',
+    )
+    for coluna, tipo in tipos.items():
+        if tipo in ('category', 'Int64'):
+            tabela[coluna] = tabela[coluna].astype(tipo)
+    return tabela
+
+
+def converter_valores(linhas: List[str], colunas: List[str], na_values: List[str] = None) -> DataFrame:
+    """
+    Converte poucas linhas no formato da B3 em colunas tipadas, sem passar pelo ``read_csv``.
+
+    Para um único arquivo (algumas dezenas de linhas), o custo fixo do ``read_csv`` e das
+    conversões de tipo é maior que a própria leitura; aqui as linhas são separadas e
+    convertidas em Python, com o mesmo resultado de ``converter_linhas``.
+
+    Args:
+        linhas (list): Linhas da carteira (ver ``ler_linhas_carteira``).
+        colunas (list): Nomes das colunas presentes em cada linha, entre as de ``TIPOS``.
+        na_values (list, optional): Valores a serem considerados como NaN. Padrão é ['NaN', ''].
+
+    Returns:
+        DataFrame: Colunas tipadas segundo ``TIPOS``.
+    """
+    nulos = set(['NaN', ''] if na_values is None else na_values)
+    valores = [[] for _ in colunas]
+    for linha in linhas:
+        campos = linha.split(';')
+        campos.extend([''] * (len(colunas) - len(campos)))
+        for lista, campo in zip(valores, campos):
+            lista.append(campo)
+
+    tabela = {}
+    for coluna, lista in zip(colunas, valores):
+        tipo = TIPOS[coluna]
+        vazios = np.array([campo in nulos for campo in lista], dtype=bool)
+        if tipo == 'Int64':
+            inteiros = [0 if vazio else int(campo.replace('.', '')) for campo, vazio in zip(lista, vazios)]
+            tabela[coluna] = IntegerArray(np.array(inteiros, dtype=np.int64), vazios)
+        elif tipo == 'float64':
+            tabela[coluna] = np.array([np.nan if vazio else float(campo.replace('.', '').replace(',', '.'))
+                                       for campo, vazio in zip(lista, vazios)], dtype=np.float64)
+        else:
+            lista = np.array(lista, dtype=object)
+            lista[vazios] = np.nan
+            tabela[coluna] = Categorical(lista) if tipo == 'category' else lista
+    return DataFrame(tabela, copy=False)
+
+
+def ler_carteira_do_dia(path: str, linhas_cabecalho: int = 1, linhas_rodape: int = 2,
+                        encoding: str = 'ISO-8859-1', na_values: List[str] = None) -> DataFrame:
+    """
+    Lê um arquivo "Carteira do Dia" (``XXXXDia_dd-mm-yy.csv``) com colunas tipadas.
+
+    O arquivo tem uma linha de título (``IDIV - Carteira do Dia 22/10/24``), o cabeçalho,
+    as linhas da carteira terminadas em ``;`` e um rodapé com o total e o redutor. O título
+    e o rodapé são removidos antes da leitura, e as poucas linhas restantes são convertidas
+    por ``converter_valores``, sem o custo fixo do ``read_csv`` (para vários arquivos, use
+    ``ler_carteiras``). A quantidade teórica usa ponto como separador de milhar e a
+    participação usa vírgula decimal.
+
+    Args:
+        path (str): Caminho do arquivo CSV.
+        linhas_cabecalho (int, optional): Linhas antes do cabeçalho das colunas. Padrão é 1.
+        linhas_rodape (int, optional): Linhas de rodapé a descartar. Padrão é 2.
+        encoding (str, optional): Codificação do arquivo. Padrão é 'ISO-8859-1'.
+        na_values (list, optional): Valores a serem considerados como NaN. Padrão é ['NaN', ''].
+
+    Returns:
+        DataFrame: Colunas ``COLUNAS`` com os tipos de ``TIPOS``.
+    """
+    linhas = ler_linhas_carteira(path, linhas_cabecalho, linhas_rodape, encoding)
+    return converter_valores(linhas, COLUNAS, na_values)
+
+
+def ler_carteiras(path: str, arquivos: Dict[str, str], na_values: List[str] = None, **kwargs) -> DataFrame:
+    """
+    Lê as carteiras de vários índices de uma só vez.
+
+    As linhas de todos os arquivos são prefixadas com o índice e convertidas numa única
+    chamada ao ``read_csv``, o que evita o custo fixo de uma leitura por arquivo.
+
+    Args:
+        path (str): Diretório dos arquivos.
+        arquivos (dict): Índice -> nome do arquivo CSV (índices sem arquivo são ignorados).
+        na_values (list, optional): Valores a serem considerados como NaN. Padrão é ['NaN', ''].
+        **kwargs: Repassados para ``ler_linhas_carteira``.
+
+    Returns:
+        DataFrame: Todas as carteiras empilhadas, com a coluna categórica ``Índice`` à frente.
+    """
+    partes = []
+    for indice, file in arquivos.items():
+        if file:
+            partes.extend(f'{indice};{linha}' for linha in ler_linhas_carteira(join(path, file), **kwargs))
+    return converter_linhas('\n'.join(partes), ['Índice'] + COLUNAS, na_values)
+
+
+def formatar_carteira(carteira: DataFrame, colunas: Iterable[str] = COLUNAS) -> DataFrame:
+    """
+    Converte uma carteira tipada de volta para o formato publicado pela B3.
+
+    A quantidade volta a ter ponto como separador de milhar e a participação volta a ter
+    vírgula decimal com três casas, como no arquivo original. Células vazias continuam vazias.
+
+    Args:
+        carteira (DataFrame): Carteira lida por ``ler_carteira_do_dia``.
+        colunas (iterable, optional): Colunas a manter. Padrão é ``COLUNAS``.
+
+    Returns:
+        DataFrame: Cópia com todas as colunas como texto.
+    """
+    formatada = carteira.loc[:, list(colunas)].astype(object)
+    formatada['Qtde. Teórica'] = ['' if isna(valor) else f'{valor:,}'.replace(',', '.')
+                                  for valor in carteira['Qtde. Teórica']]
+    formatada['Part. (%)'] = ['' if isna(valor) else f'{valor:.3f}'.replace('.', ',')
+                              for valor in carteira['Part. (%)']]
+    return formatada
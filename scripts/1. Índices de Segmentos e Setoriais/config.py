@@ -1,14 +1,28 @@
 from os.path import join, dirname, abspath
+import sys
 
 # Define o caminho base para os diretórios de dados
 caminho_base = dirname(dirname(dirname(abspath(__file__))))
 
+# Permite importar o pacote compartilhado `scripts/comum` e o pacote `b3_dados` (raiz do repositório)
+sys.path.append(dirname(dirname(abspath(__file__))))
+sys.path.append(dirname(dirname(dirname(abspath(__file__)))))
+
 # Caminho para o diretório onde os dados brutos serão salvos
 path_extracted_data = join(caminho_base, 'extracted_data', '1. Índices de Segmentos e Setoriais')
 
 # Caminho para o diretório onde os dados processados serão salvos
 path_processed_data = join(caminho_base, 'processed_data', '1. Índices de Segmentos e Setoriais')
 
+# Manifesto com os hashes das entradas e saídas de cada índice (transformação incremental)
+path_manifesto = join(path_processed_data, 'manifesto.json')
+
+# Matriz ativo x índice (índice invertido: ativo -> {índice: participação})
+path_participacoes = join(path_processed_data, 'participacoes.json')
+
+# Histórico colunar (Parquet, particionado por índice) das carteiras diárias
+path_historico = join(path_processed_data, 'historico')
+
 # Dicionário contendo os índices a serem processados
 INDICES = {
     'IDIV': 'Índice Dividendos BM&FBOVESPA (IDIV B3)',
@@ -32,3 +46,55 @@ INDICES = {
     'BDRX': 'Índice de BDRs Não Patrocinados-GLOBAL (BDRX B3)',
     'IFIX': 'Índice de Fundos de Investimentos Imobiliários (IFIX B3)'
 }
+
+# Slug da página "saiba mais" de cada índice no site da B3 (último trecho da URL).
+# As páginas são salvas como `info_<slug>.htm` e associadas ao índice por este mapeamento.
+SLUGS_INDICES = {
+    'IDIV': 'indice-dividendos-idiv',
+    'MLCX': 'indice-midlarge-cap-mlcx',
+    'SMLL': 'indice-small-cap-smll',
+    'IVBX': 'indice-valor-ivbx-2',
+    'AGFS': 'indice-agronegocio-b3-iagro-b3',
+    'IFNC': 'indice-financeiro-ifnc-b3',
+    'IBEP': 'indice-bovespa-b3-empresas-privadas-ibov-b3-empresas-privadas',
+    'IBEE': 'indice-bovespa-b3-estatais-ibov-b3-estatais',
+    'IBHB': 'indice-bovespa-smart-high-beta-b3-ibov-smart-high-beta-b3',
+    'IBLV': 'indice-bovespa-smart-low-volatility-b3-ibov-smart-low-vol-b3',
+    'IMOB': 'indice-imobiliario-imob-b3',
+    'UTIL': 'indice-utilidade-publica-util-b3',
+    'ICON': 'indice-de-consumo-icon-b3',
+    'IEEX': 'indice-de-energia-eletrica-iee-b3',
+    'IFIL': 'indice-de-fundos-de-investimentos-imobiliarios-de-alta-liquidez-ifix-l-b3',
+    'IMAT': 'indice-de-materiais-basicos-imat-b3',
+    'INDX': 'indice-do-setor-industrial-indx-b3',
+    'IBSD': 'indice-bovespa-smart-dividendos-b3-ibov-smart-dividendos-b3',
+    'BDRX': 'indice-de-bdrs-nao-patrocinados-global-bdrx',
+    'IFIX': 'indice-de-fundos-de-investimentos-imobiliarios-ifix'
+}
+
+# Modo de extração da composição das carteiras: 'http' (API da B3, sem navegador) ou 'selenium'
+MODO_EXTRACAO = 'http'
+
+# Endereço base dos sistemas de listados da B3 (pode apontar para um servidor local de testes)
+url_listados = 'https://sistemaswebb3-listados.b3.com.br'
+
+# Respostas gravadas de `GetDownloadPortfolioDay` (`<indice>.txt`), usadas por `verificar_extract_http.py`
+path_fixtures_carteira = join(caminho_base, 'extracted_data', 'fixtures_carteira_do_dia')
+
+# Número máximo de requisições simultâneas nas extrações via HTTP
+MAX_REQUISICOES_SIMULTANEAS = 8
+
+# Intervalo mínimo, em segundos, entre o início de requisições ao mesmo host
+INTERVALO_MINIMO_POR_HOST = 0.05
+
+# Cache em disco das páginas da B3 (requisições condicionais com ETag/Last-Modified)
+path_cache_http = join(caminho_base, 'extracted_data', 'cache_http')
+
+# Validade, em segundos, de uma página em cache antes de revalidá-la no servidor
+CACHE_TTL = 6 * 3600
+
+# Tamanho máximo do cache em disco, em bytes (as páginas menos usadas são removidas)
+CACHE_TAMANHO_MAXIMO = 200 * 1024 * 1024
+
+# Ignora o cache e baixa todas as páginas de novo
+FORCAR_ATUALIZACAO = False
@@ -1,10 +1,14 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from os import listdir
-from time import sleep
+from os.path import join, exists
+import re
 import config
+from comum.esperas import HistogramaLatencias, TempoEsgotado, aguardar_download, arquivos_concluidos, arquivos_parciais
+from comum.listados import codificar_parametros, decodificar_conteudo_base64
+from comum.navegador import PoolNavegadores, obter_pool, opcoes_chrome
+from comum.requisicoes import BuscadorConcorrente
 
 __python__ = 3.10
 
@@ -15,13 +19,22 @@ class Extract:
     Esta classe é responsável por solicitar a página de cada índice definido e iniciar o download
     do arquivo CSV correspondente, verificando se o arquivo já existe no diretório especificado.
 
+    Depois do clique em "Download", o navegador só é fechado quando o arquivo termina de ser
+    gravado (o ``.crdownload`` é renomeado), em vez de após uma espera fixa. Um único navegador
+    headless, emprestado do pool do processo, baixa todos os índices: o Chrome é iniciado uma
+    vez, e não uma vez por índice.
+
     Attributes:
         path (str): Caminho do diretório onde os arquivos baixados serão salvos.
         indices (list): Lista de índices a serem baixados.
+        latencias (HistogramaLatencias): Duração de cada etapa (carregar página, clique, download).
 
     Methods:
+        ``navegadores() -> PoolNavegadores``:
+            Pool de navegadores configurados para baixar em ``path``.
+
         ``request_page(indice: str) -> None``:
-            Solicita a página do índice e inicia o download do arquivo CSV.
+            Solicita a página do índice e aguarda o download do arquivo CSV.
 
         ``check_se_arquivo_existe(indice: str) -> bool``:
             Verifica se o arquivo do índice já existe no diretório de download.
@@ -40,32 +53,45 @@ class Extract:
         """
         self.path = path
         self.indices = indices
+        self.latencias = HistogramaLatencias()
         print(f"\nDownload: {path}\n")
+
+    def navegadores(self) -> PoolNavegadores:
+        """
+        Pool de navegadores configurados para baixar em ``path`` (criado na primeira chamada).
+
+        Returns:
+            PoolNavegadores: Pool com um navegador headless.
+        """
+        return obter_pool(f'download:{self.path}', 1, opcoes_chrome(diretorio_download=self.path))
     
     def request_page(self, indice: str) -> None:
         """
-        Solicita a página do índice e inicia o download do arquivo CSV.
+        Solicita a página do índice e aguarda o download do arquivo CSV.
 
         Args:
             indice (str): O índice a ser baixado.
         """
-        options = webdriver.ChromeOptions()
-        options.add_experimental_option('prefs', {'download.default_directory': self.path})
-
-        with webdriver.Chrome(options=options) as driver:
+        with self.navegadores().emprestar() as driver:
             url = f'https://sistemaswebb3-listados.b3.com.br/indexPage/day/{indice}?language=pt-br'
-            driver.get(url)
+            with self.latencias.medir('carregar página'):
+                driver.get(url)
 
             try:
-                download_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.LINK_TEXT, 'Download'))
-                )
+                with self.latencias.medir('botão download'):
+                    download_button = WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable((By.LINK_TEXT, 'Download'))
+                    )
+                anteriores = arquivos_concluidos(self.path)
+                parciais = arquivos_parciais(self.path)
                 download_button.click()
+                with self.latencias.medir('download'):
+                    file = aguardar_download(self.path, anteriores, timeout=60, parciais_anteriores=parciais)
+                print(f'Status: OK\nÍndice: {indice}\nArquivo: {file}\nURL: {url}\n')
+            except TempoEsgotado as e:
+                print(f"Download do índice {indice} não concluído: {e}")
             except Exception as e:
                 print(f"Erro ao clicar no botão de download para o índice {indice}: {e}")
-            finally:
-                sleep(5)  
-                print(f'Status: OK\nÍndice: {indice}\nExtensão: CSV\nURL: {url}\n')
     
     def check_se_arquivo_existe(self, indice: str) -> bool:
         """
@@ -93,9 +119,138 @@ class Extract:
                     self.request_page(indice)
         except Exception as e:
             print(f"Ocorreu um erro durante a execução: {e}")
+        finally:
+            self.latencias.imprimir()
+
+
+class ExtractHTTP(Extract):
+    """
+    Extrai a composição das carteiras diretamente da API da B3, sem navegador.
+
+    O botão "Download" da página ``indexPage/day/{indice}`` chama o endpoint
+    ``indexProxy/indexCall/GetDownloadPortfolioDay``, que retorna o CSV da carteira do dia
+    codificado em base64. Esta classe chama o mesmo endpoint por uma sessão HTTP com pool
+    de conexões e grava arquivos idênticos aos baixados pelo Chrome (``XXXXDia_dd-mm-yy.csv``).
+    Os índices são baixados em paralelo, com concorrência limitada.
+
+    Como o nome do arquivo traz a data da carteira, cada execução diária acrescenta um novo
+    snapshot ao diretório, sem sobrescrever os anteriores (ver ``historico.py``).
+
+    Attributes:
+        url_base (str): Endereço base dos sistemas de listados da B3.
+        buscador (BuscadorConcorrente): Camada de requisições concorrentes compartilhada.
+
+    Methods:
+        ``url_download(indice: str) -> str``:
+            Monta a URL do endpoint de download da carteira do dia.
+
+        ``nome_arquivo(indice: str, conteudo: bytes) -> str``:
+            Monta o nome do arquivo a partir da data presente no cabeçalho do CSV.
+
+        ``request_page(indice: str) -> None``:
+            Baixa o CSV do índice e o salva no diretório de download.
+
+        ``execute(diario: bool = True) -> None``:
+            Baixa em paralelo a carteira do dia de cada índice.
+    """
+
+    def __init__(self, path: str, indices: str = 'IMOB', url_base: str = config.url_listados,
+                 buscador: BuscadorConcorrente = None):
+        """
+        Inicializa a classe ExtractHTTP.
+
+        Args:
+            path (str): Caminho do diretório onde os arquivos serão salvos.
+            indices (list): Lista de índices a serem baixados.
+            url_base (str): Endereço base da API (permite apontar para um servidor local de testes).
+            buscador (BuscadorConcorrente, optional): Camada de requisições a ser usada. Se omitida,
+                é criada com os limites definidos em ``config``.
+        """
+        super().__init__(path, indices)
+        self.url_base = url_base.rstrip('/')
+        self.buscador = buscador or BuscadorConcorrente(
+            config.MAX_REQUISICOES_SIMULTANEAS, config.INTERVALO_MINIMO_POR_HOST)
+
+    def url_download(self, indice: str) -> str:
+        """
+        Monta a URL do endpoint de download da carteira do dia.
+
+        Args:
+            indice (str): O índice a ser baixado.
+
+        Returns:
+            str: URL com os parâmetros codificados em base64.
+        """
+        parametros = codificar_parametros({'index': indice, 'language': 'pt-br'})
+        return f'{self.url_base}/indexProxy/indexCall/GetDownloadPortfolioDay/{parametros}'
+
+    def nome_arquivo(self, indice: str, conteudo: bytes) -> str:
+        """
+        Monta o nome do arquivo a partir da data presente no cabeçalho do CSV.
+
+        A primeira linha do arquivo tem o formato ``IMOB - Carteira do Dia 22/10/24``,
+        de onde sai o nome ``IMOBDia_22-10-24.csv``, o mesmo gerado pelo download do site.
+
+        Args:
+            indice (str): O índice baixado.
+            conteudo (bytes): Conteúdo do arquivo CSV.
+
+        Returns:
+            str: Nome do arquivo.
+
+        Raises:
+            ValueError: Se a data não for encontrada no cabeçalho.
+        """
+        cabecalho = conteudo.split(b'\n', 1)[0].decode('ISO-8859-1')
+        data = re.search(r'(\d{2})/(\d{2})/(\d{2,4})', cabecalho)
+        if data is None:
+            raise ValueError(f'Data não encontrada no cabeçalho do arquivo: {cabecalho!r}')
+        dia, mes, ano = data.groups()
+        return f'{indice}Dia_{dia}-{mes}-{ano[-2:]}.csv'
+
+    def request_page(self, indice: str) -> None:
+        """
+        Baixa o CSV do índice pela API e o salva no diretório de download.
+
+        Args:
+            indice (str): O índice a ser baixado.
+        """
+        url = self.url_download(indice)
+        try:
+            response = self.buscador.get(url)
+            response.raise_for_status()
+            conteudo = decodificar_conteudo_base64(response.text)
+            file_path = join(self.path, self.nome_arquivo(indice, conteudo))
+            if exists(file_path):
+                print(f'Carteira do dia já existente: {indice} (arquivo: {file_path})')
+                return
+            with open(file_path, 'wb') as file:
+                file.write(conteudo)
+            print(f'Status: {response.status_code}\nÍndice: {indice}\nExtensão: CSV\nArquivo: {file_path}\n')
+        except Exception as e:
+            print(f"Erro ao baixar o arquivo do índice {indice}: {e}")
+
+    def execute(self, diario: bool = True) -> None:
+        """
+        Baixa em paralelo a carteira do dia de cada índice.
+
+        Args:
+            diario (bool): Se True, baixa todos os índices e guarda a carteira de cada nova
+                data ao lado das anteriores. Se False, baixa apenas os índices que ainda
+                não têm nenhum arquivo (comportamento do download pelo navegador).
+        """
+        if diario:
+            pendentes = list(self.indices)
+        else:
+            pendentes = [indice for indice in self.indices if not self.check_se_arquivo_existe(indice)]
+        self.buscador.executar(self.request_page, pendentes)
+
 
 if __name__ == '__main__':
-    carteira_extractor = Extract(config.path_extracted_data, config.INDICES.keys())
+    if config.MODO_EXTRACAO == 'http':
+        carteira_extractor = ExtractHTTP(config.path_extracted_data, config.INDICES.keys())
+    else:
+        carteira_extractor = Extract(config.path_extracted_data, config.INDICES.keys())
     carteira_extractor.execute()
 
 
@@ -1,7 +1,9 @@
 import requests
-from bs4 import BeautifulSoup
 from os.path import join, exists
 import config
+from b3_dados.http import CacheHTTP
+from comum.analise_html import fragmentos_por_id, links
+from comum.requisicoes import BuscadorConcorrente
 from typing import List
 
 __python__ = 3.10
@@ -12,29 +14,44 @@ class Extract:
 
     Esta classe é responsável por obter links para as páginas de detalhes dos índices
     e extrair as informações relevantes, salvando-as em arquivos no diretório especificado.
+    As páginas "saiba mais" são baixadas em paralelo, com concorrência limitada, e guardadas
+    em um cache revalidado por ETag/Last-Modified: numa nova execução, páginas inalteradas
+    custam uma resposta 304 e os arquivos só são regravados quando o conteúdo muda.
+    As páginas são analisadas com o lxml em modo incremental (``comum.analise_html``): só os
+    links e os painéis procurados são montados, não a árvore inteira da página.
 
     Attributes:
         path (str): Caminho do diretório onde os arquivos serão salvos.
         indices (list): Lista de índices a serem extraídos.
+        buscador (BuscadorConcorrente): Camada de requisições concorrentes compartilhada.
 
     Methods:
         ``get_link() -> List[str]``:
             Obtém links para páginas de detalhes dos índices na B3.
 
+        ``save_informacoes_indice(url: str) -> None``:
+            Extrai as informações de um índice e as salva em um arquivo HTML.
+
         ``get_and_save_informacoes_indice() -> None``:
             Extrai informações de cada índice e as salva em arquivos HTML.
     """
 
-    def __init__(self, path: str, indices: str):
+    def __init__(self, path: str, indices: str, buscador: BuscadorConcorrente = None):
         """
         Inicializa a classe Extract com o caminho do diretório e a lista de índices.
 
         Args:
             path (str): Caminho do diretório para salvar os arquivos.
             indices (list): Lista de índices a serem extraídos.
+            buscador (BuscadorConcorrente, optional): Camada de requisições a ser usada. Se omitida,
+                é criada com os limites e o cache definidos em ``config``.
         """
         self.path = path
         self.indices = indices
+        self.buscador = buscador or BuscadorConcorrente(
+            config.MAX_REQUISICOES_SIMULTANEAS, config.INTERVALO_MINIMO_POR_HOST,
+            cache=CacheHTTP(config.path_cache_http, config.CACHE_TTL, config.CACHE_TAMANHO_MAXIMO),
+            forcar=config.FORCAR_ATUALIZACAO)
 
     def get_link(self) -> List[str]:
         """
@@ -44,51 +61,62 @@ class Extract:
             list: Lista de URLs dos índices.
         """
         url = "https://www.b3.com.br/pt_br/market-data-e-indices/indices/indices-de-segmentos-e-setoriais/"
-        response = requests.get(url)
+        response = self.buscador.get(url)
         print(f"\n# Conexão à página dos índices de segmentos setoriais\n")
         print(f"Status: {response.status_code} URL: {url}")
 
-        soup = BeautifulSoup(response.text, 'html.parser')
         list_link = []
 
-        for row in soup.find_all('a', href=True):
-            if 'saiba mais sobre' in str(row).lower():
-                link = row['href'].replace('../../../../', 'https://www.b3.com.br/')
-                list_link.append(link)
+        for href in links(response.text, 'saiba mais sobre'):
+            link = href.replace('../../../../', 'https://www.b3.com.br/')
+            list_link.append(link)
 
-                print(f"Link encontrado: {link}")
+            print(f"Link encontrado: {link}")
 
         return list_link
     
+    def save_informacoes_indice(self, url: str) -> None:
+        """
+        Extrai as informações de um índice e as salva em um arquivo HTML.
+
+        O arquivo é nomeado com base na URL do índice correspondente e só é gravado
+        quando o conteúdo é diferente do arquivo existente.
+
+        Args:
+            url (str): URL da página "saiba mais" do índice.
+        """
+        try:
+            response = self.buscador.get(url)
+            html_string = fragmentos_por_id(response.text, 'panel3a', 'panel1a')
+
+            # Extrai o nome do arquivo a partir da URL
+            name = url.split('/')[-1]
+            file_path = join(self.path, f'info_{name}')
+
+            if exists(file_path):
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    if file.read() == html_string:
+                        print(f'Arquivo inalterado ({response.origem}): {file_path}')
+                        return
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(html_string)
+                print(f"Informações salvas em: {file_path}")
+        
+        except requests.exceptions.RequestException as e:
+            print(f'Erro de requisição ao acessar {url}: {e}')
+        except Exception as e:
+            print(f'Erro ao processar {url}: {e}')
+
     def get_and_save_informacoes_indice(self) -> None:
         """
         Extrai informações de cada índice e as salva em arquivos HTML.
 
-        Cada arquivo é nomeado com base na URL do índice correspondente.
+        As páginas são baixadas em paralelo pelo buscador compartilhado.
         """
-        for url in self.get_link():
-            try:
-                response = requests.get(url)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                informacoes_indice_html = soup.find_all(id='panel3a') or soup.find_all(id='panel1a')
-                html_string = ''.join(str(tag) for tag in informacoes_indice_html)
-
-                # Extrai o nome do arquivo a partir da URL
-                name = url.split('/')[-1]
-                file_path = join(self.path, f'info_{name}')
-
-                if exists(file_path):
-                    print(f'Arquivo já existe: {file_path}. Ignorando a gravação.')
-                else:
-                    with open(file_path, 'w', encoding='utf-8') as file:
-                        file.write(html_string)
-                        print(f"Informações salvas em: {file_path}")
-            
-            except requests.exceptions.RequestException as e:
-                print(f'Erro de requisição ao acessar {url}: {e}')
-            except Exception as e:
-                print(f'Erro ao processar {url}: {e}')
+        self.buscador.executar(self.save_informacoes_indice, self.get_link())
+        estatisticas = self.buscador.estatisticas
+        print(f"\nRequisições: {estatisticas['requisicoes']} ({estatisticas['nao_modificados']} não modificadas), "
+              f"do cache: {estatisticas['do_cache']}, bytes recebidos: {estatisticas['bytes']}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,284 @@
+import config
+from collections import defaultdict
+from datetime import date
+from os import listdir, makedirs, remove, replace
+from os.path import exists, join
+from typing import Dict, List, Optional, Set
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pandas import DataFrame
+
+from carteira import identificar_arquivo, ler_carteira_do_dia
+
+__python__ = 3.10
+
+# Esquema das linhas do histórico (o índice é a partição `indice=XXXX` do diretório)
+ESQUEMA = pa.schema([
+    ('data', pa.date32()),
+    ('codigo', pa.string()),
+    ('acao', pa.string()),
+    ('tipo', pa.string()),
+    ('qtde_teorica', pa.int64()),
+    ('participacao', pa.float64()),
+])
+
+# Particionamento do diretório: um subdiretório `indice=XXXX` por índice
+PARTICIONAMENTO = ds.partitioning(pa.schema([('indice', pa.string())]), flavor='hive')
+
+
+class HistoricoCarteiras:
+    """
+    Histórico colunar (Parquet) das composições diárias das carteiras dos índices.
+
+    Cada arquivo ``XXXXDia_dd-mm-yy.csv`` baixado vira um arquivo Parquet em
+    ``indice=XXXX/XXXX_aaaa-mm-dd.parquet``, com as colunas de ``ESQUEMA``; a compactação
+    junta esses arquivos em ``indice=XXXX/XXXX_aaaa.parquet`` (um por ano). As consultas
+    usam ``pyarrow.dataset`` com filtros sobre índice, data e código, lendo apenas as
+    partições e colunas necessárias, sem reler os CSVs.
+
+    Attributes:
+        path (str): Diretório raiz do histórico.
+
+    Methods:
+        ``datas(indice: str = None) -> Dict[str, Set[date]]``:
+            Retorna as datas já armazenadas por índice.
+
+        ``adicionar_arquivo(path_csv: str, datas_existentes: Set[date] = None) -> bool``:
+            Adiciona ao histórico a carteira de um arquivo CSV.
+
+        ``atualizar(path_extracted_data: str, compactar: bool = True) -> int``:
+            Adiciona ao histórico todos os CSVs ainda não armazenados.
+
+        ``compactar(indice: str = None) -> None``:
+            Junta os arquivos diários de cada índice em um arquivo por ano.
+
+        ``consultar(indices=None, inicio=None, fim=None, codigos=None, colunas=None) -> DataFrame``:
+            Consulta o histórico com filtros.
+
+        ``pesos(indice: str, sessoes: int = 250) -> DataFrame``:
+            Participação de cada ativo nas últimas sessões de um índice (data x código).
+
+        ``indices_com(codigo: str, data: Optional[date] = None) -> List[str]``:
+            Índices que continham o ativo na data.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa o histórico.
+
+        Args:
+            path (str): Diretório raiz do histórico (criado se não existir).
+        """
+        self.path = path
+        makedirs(self.path, exist_ok=True)
+
+    def dataset(self) -> ds.Dataset:
+        """
+        Abre o histórico como um dataset particionado por índice.
+
+        Returns:
+            pyarrow.dataset.Dataset: Dataset com as colunas de ``ESQUEMA`` e ``indice``.
+        """
+        return ds.dataset(self.path, format='parquet', partitioning=PARTICIONAMENTO,
+                          schema=ESQUEMA.append(pa.field('indice', pa.string())))
+
+    def datas(self, indice: str = None) -> Dict[str, Set[date]]:
+        """
+        Retorna as datas já armazenadas por índice.
+
+        Args:
+            indice (str, optional): Restringe a um índice.
+
+        Returns:
+            dict: Índice -> conjunto de datas.
+        """
+        filtro = (pc.field('indice') == indice) if indice else None
+        tabela = self.dataset().to_table(columns=['indice', 'data'], filter=filtro)
+        resultado = defaultdict(set)
+        for nome, data in zip(tabela['indice'].to_pylist(), tabela['data'].to_pylist()):
+            resultado[nome].add(data)
+        return dict(resultado)
+
+    def adicionar_arquivo(self, path_csv: str, datas_existentes: Set[date] = None) -> bool:
+        """
+        Adiciona ao histórico a carteira de um arquivo CSV.
+
+        Args:
+            path_csv (str): Caminho do arquivo ``XXXXDia_dd-mm-yy.csv``.
+            datas_existentes (set, optional): Datas já armazenadas para o índice do arquivo.
+                Se não informado, é consultado no histórico.
+
+        Returns:
+            bool: True se a carteira foi adicionada, False se a data já estava no histórico.
+
+        Raises:
+            ValueError: Se o nome do arquivo não seguir o padrão ``XXXXDia_dd-mm-yy.csv``.
+        """
+        identificado = identificar_arquivo(path_csv.replace('\\', '/').split('/')[-1])
+        if identificado is None:
+            raise ValueError(f'Nome de arquivo fora do padrão XXXXDia_dd-mm-yy.csv: {path_csv}')
+        indice, data = identificado
+        if datas_existentes is None:
+            datas_existentes = self.datas(indice).get(indice, set())
+        if data in datas_existentes:
+            return False
+
+        carteira = ler_carteira_do_dia(path_csv)
+        tabela = pa.table({
+            'data': pa.array([data] * len(carteira), pa.date32()),
+            'codigo': pa.array(carteira['Código'].tolist(), pa.string()),
+            'acao': pa.array(carteira['Ação'].tolist(), pa.string()),
+            'tipo': pa.array(carteira['Tipo'].astype(str).tolist(), pa.string()),
+            'qtde_teorica': pa.array(carteira['Qtde. Teórica'], pa.int64(), from_pandas=True),
+            'participacao': pa.array(carteira['Part. (%)'].to_numpy(), pa.float64()),
+        }, schema=ESQUEMA)
+
+        path_particao = join(self.path, f'indice={indice}')
+        makedirs(path_particao, exist_ok=True)
+        pq.write_table(tabela, join(path_particao, f'{indice}_{data.isoformat()}.parquet'))
+        datas_existentes.add(data)
+        return True
+
+    def atualizar(self, path_extracted_data: str, compactar: bool = True) -> int:
+        """
+        Adiciona ao histórico todos os CSVs do diretório ainda não armazenados.
+
+        Args:
+            path_extracted_data (str): Diretório com os arquivos ``XXXXDia_dd-mm-yy.csv``.
+            compactar (bool): Se True, compacta os índices que receberam novas carteiras.
+
+        Returns:
+            int: Quantidade de carteiras adicionadas.
+        """
+        existentes = self.datas()
+        alterados = set()
+        adicionados = 0
+        for file in sorted(listdir(path_extracted_data)):
+            identificado = identificar_arquivo(file)
+            if identificado is None:
+                continue
+            indice = identificado[0]
+            try:
+                if self.adicionar_arquivo(join(path_extracted_data, file), existentes.setdefault(indice, set())):
+                    adicionados += 1
+                    alterados.add(indice)
+                    print(f'Carteira adicionada ao histórico: {file}')
+            except Exception as e:
+                print(f'Erro ao adicionar {file} ao histórico: {e}')
+        if compactar:
+            for indice in sorted(alterados):
+                self.compactar(indice)
+        return adicionados
+
+    def compactar(self, indice: str = None) -> None:
+        """
+        Junta os arquivos diários de cada índice em um arquivo por ano (``XXXX_aaaa.parquet``).
+
+        Um arquivo por pregão é prático para acrescentar carteiras, mas muitos arquivos
+        pequenos deixam as consultas mais lentas (a busca de um ativo em todos os índices
+        passa de dezenas de milissegundos para mais de um segundo com um ano de pregões).
+
+        Args:
+            indice (str, optional): Restringe a um índice.
+        """
+        particoes = [f'indice={indice}'] if indice else [p for p in listdir(self.path) if p.startswith('indice=')]
+        for particao in particoes:
+            path_particao = join(self.path, particao)
+            if not exists(path_particao):
+                continue
+            nome = particao.split('=', 1)[1]
+            arquivos = sorted(file for file in listdir(path_particao) if file.endswith('.parquet'))
+            tabela = pa.concat_tables([pq.read_table(join(path_particao, file), schema=ESQUEMA) for file in arquivos])
+            tabela = tabela.sort_by([('data', 'ascending'), ('codigo', 'ascending')])
+            anos = pc.year(tabela['data'])
+            novos = set()
+            for ano in sorted(set(anos.to_pylist())):
+                file = f'{nome}_{ano}.parquet'
+                tmp = join(path_particao, f'{file}.tmp')
+                pq.write_table(tabela.filter(pc.equal(anos, ano)), tmp)
+                replace(tmp, join(path_particao, file))
+                novos.add(file)
+            for file in arquivos:
+                if file not in novos:
+                    remove(join(path_particao, file))
+
+    def consultar(self, indices: List[str] = None, inicio: date = None, fim: date = None,
+                  codigos: List[str] = None, colunas: List[str] = None) -> DataFrame:
+        """
+        Consulta o histórico com filtros.
+
+        Args:
+            indices (list, optional): Índices a incluir.
+            inicio (date, optional): Data inicial (inclusive).
+            fim (date, optional): Data final (inclusive).
+            codigos (list, optional): Códigos dos ativos a incluir.
+            colunas (list, optional): Colunas a retornar. Padrão é todas.
+
+        Returns:
+            DataFrame: Linhas do histórico, ordenadas por índice, data e código.
+        """
+        filtros = []
+        if indices:
+            filtros.append(pc.field('indice').isin(list(indices)))
+        if inicio:
+            filtros.append(pc.field('data') >= pa.scalar(inicio, pa.date32()))
+        if fim:
+            filtros.append(pc.field('data') <= pa.scalar(fim, pa.date32()))
+        if codigos:
+            filtros.append(pc.field('codigo').isin(list(codigos)))
+        filtro = None
+        for condicao in filtros:
+            filtro = condicao if filtro is None else filtro & condicao
+
+        tabela = self.dataset().to_table(filter=filtro)
+        ordem = [(coluna, 'ascending') for coluna in ['indice', 'data', 'codigo']]
+        resultado = tabela.sort_by(ordem).to_pandas()
+        if colunas:
+            resultado = resultado[list(colunas)]
+        return resultado
+
+    def pesos(self, indice: str, sessoes: int = 250) -> DataFrame:
+        """
+        Participação de cada ativo nas últimas sessões de um índice.
+
+        Args:
+            indice (str): O índice.
+            sessoes (int, optional): Quantidade de pregões mais recentes. Padrão é 250.
+
+        Returns:
+            DataFrame: Datas nas linhas, códigos nas colunas e participação (%) nos valores
+            (NaN quando o ativo não estava na carteira).
+        """
+        datas = sorted(self.datas(indice).get(indice, set()))[-sessoes:]
+        if not datas:
+            return DataFrame()
+        historico = self.consultar([indice], inicio=datas[0], colunas=['data', 'codigo', 'participacao'])
+        return historico.pivot(index='data', columns='codigo', values='participacao')
+
+    def indices_com(self, codigo: str, data: Optional[date] = None) -> List[str]:
+        """
+        Índices que continham o ativo na data.
+
+        Args:
+            codigo (str): Código do ativo (ex.: ``PETR4``).
+            data (date, optional): Data da carteira. Padrão é a data mais recente do histórico.
+
+        Returns:
+            list: Índices em ordem alfabética.
+        """
+        if data is None:
+            datas = [d for conjunto in self.datas().values() for d in conjunto]
+            if not datas:
+                return []
+            data = max(datas)
+        historico = self.consultar(inicio=data, fim=data, codigos=[codigo], colunas=['indice'])
+        return sorted(historico['indice'].unique().tolist())
+
+
+if __name__ == '__main__':
+    historico = HistoricoCarteiras(config.path_historico)
+    adicionados = historico.atualizar(config.path_extracted_data)
+    print(f'{adicionados} carteiras adicionadas ao histórico em {config.path_historico}')
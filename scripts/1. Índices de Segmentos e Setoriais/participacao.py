@@ -0,0 +1,195 @@
+import json
+from typing import Dict, List
+
+import numpy as np
+from pandas import DataFrame, factorize
+from scipy import sparse
+
+__python__ = 3.10
+
+
+class MatrizParticipacao:
+    """
+    Matriz esparsa ativo x índice com a participação (%) de cada ativo em cada carteira.
+
+    A matriz é mantida em memória no formato CSR do ``scipy`` e persistida em um único
+    arquivo JSON, no formato de índice invertido (ativo -> {índice: participação}), que
+    substitui a leitura dos 20 arquivos ``Códigos_{indice}.txt`` para saber em quais
+    índices um ativo está.
+
+    Attributes:
+        codigos (List[str]): Códigos dos ativos (linhas da matriz), em ordem alfabética.
+        indices (List[str]): Índices (colunas da matriz), em ordem alfabética.
+        datas (Dict[str, str]): Data da carteira usada para cada índice (``aaaa-mm-dd``).
+        matriz (scipy.sparse.csr_matrix): Participações, com zero onde o ativo não está no índice.
+        invertido (Dict[str, Dict[str, float]]): Ativo -> {índice: participação}.
+
+    Methods:
+        ``de_carteiras(carteiras: DataFrame, datas: Dict[str, str] = None) -> MatrizParticipacao``:
+            Monta a matriz a partir das carteiras empilhadas (ver ``carteira.ler_carteiras``).
+
+        ``indices_de(codigo: str) -> Dict[str, float]``:
+            Índices que contêm o ativo, com a participação em cada um.
+
+        ``ativos_de(indice: str) -> Dict[str, float]``:
+            Ativos de um índice, com a participação de cada um.
+
+        ``sobreposicao() -> DataFrame``:
+            Quantidade de ativos em comum entre cada par de índices.
+
+        ``similaridade() -> DataFrame``:
+            Similaridade de cosseno entre os vetores de participação dos índices.
+
+        ``para_json() -> str`` / ``salvar(path: str) -> None``:
+            Serializa a matriz no formato de índice invertido.
+
+        ``carregar(path: str) -> MatrizParticipacao``:
+            Lê a matriz salva por ``salvar``.
+    """
+
+    def __init__(self, codigos: List[str], indices: List[str], matriz: sparse.csr_matrix,
+                 datas: Dict[str, str] = None):
+        """
+        Inicializa a matriz.
+
+        Args:
+            codigos (list): Códigos dos ativos (linhas).
+            indices (list): Índices (colunas).
+            matriz (scipy.sparse.csr_matrix): Participações (ativos x índices).
+            datas (dict, optional): Data da carteira de cada índice.
+        """
+        self.codigos = list(codigos)
+        self.indices = list(indices)
+        self.matriz = sparse.csr_matrix(matriz)
+        self.datas = dict(datas or {})
+        self._coluna = {indice: coluna for coluna, indice in enumerate(self.indices)}
+        self.invertido = {
+            codigo: {self.indices[coluna]: float(valor) for coluna, valor in zip(
+                self.matriz.indices[self.matriz.indptr[linha]:self.matriz.indptr[linha + 1]],
+                self.matriz.data[self.matriz.indptr[linha]:self.matriz.indptr[linha + 1]])}
+            for linha, codigo in enumerate(self.codigos)
+        }
+
+    @classmethod
+    def de_carteiras(cls, carteiras: DataFrame, datas: Dict[str, str] = None) -> 'MatrizParticipacao':
+        """
+        Monta a matriz a partir das carteiras empilhadas.
+
+        Args:
+            carteiras (DataFrame): Colunas ``Índice``, ``Código`` e ``Part. (%)`` (ver ``carteira.ler_carteiras``).
+            datas (dict, optional): Data da carteira de cada índice.
+
+        Returns:
+            MatrizParticipacao: A matriz montada.
+        """
+        linha, codigos = factorize(carteiras['Código'].astype(str), sort=True)
+        coluna, indices = factorize(carteiras['Índice'].astype(str), sort=True)
+        matriz = sparse.csr_matrix(
+            (carteiras['Part. (%)'].to_numpy(dtype=np.float64), (linha, coluna)),
+            shape=(len(codigos), len(indices)),
+        )
+        matriz.sort_indices()
+        return cls(codigos, indices, matriz, datas)
+
+    def indices_de(self, codigo: str) -> Dict[str, float]:
+        """
+        Índices que contêm o ativo, com a participação em cada um.
+
+        Args:
+            codigo (str): Código do ativo (ex.: ``PETR4``).
+
+        Returns:
+            dict: Índice -> participação (%). Vazio se o ativo não estiver em nenhum índice.
+        """
+        return self.invertido.get(codigo, {})
+
+    def ativos_de(self, indice: str) -> Dict[str, float]:
+        """
+        Ativos de um índice, com a participação de cada um.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            dict: Código -> participação (%). Vazio se o índice não existir.
+        """
+        if indice not in self._coluna:
+            return {}
+        coluna = self.matriz[:, self._coluna[indice]].tocoo()
+        return {self.codigos[linha]: float(valor) for linha, valor in zip(coluna.row, coluna.data)}
+
+    def sobreposicao(self) -> DataFrame:
+        """
+        Quantidade de ativos em comum entre cada par de índices (``B.T @ B``, com B binária).
+
+        Returns:
+            DataFrame: Índices nas linhas e colunas; a diagonal é o total de ativos de cada índice.
+        """
+        binaria = (self.matriz != 0).astype(np.int64)
+        return DataFrame((binaria.T @ binaria).toarray(), index=self.indices, columns=self.indices)
+
+    def similaridade(self) -> DataFrame:
+        """
+        Similaridade de cosseno entre os vetores de participação dos índices (``W.T @ W`` normalizada).
+
+        Returns:
+            DataFrame: Valores entre 0 (sem ativos em comum) e 1 (mesmas participações).
+        """
+        produto = (self.matriz.T @ self.matriz).toarray()
+        normas = np.sqrt(np.diag(produto))
+        normas[normas == 0] = 1.0
+        return DataFrame(produto / np.outer(normas, normas), index=self.indices, columns=self.indices)
+
+    def para_json(self) -> str:
+        """
+        Serializa a matriz no formato de índice invertido.
+
+        Cada ativo ocupa uma linha, o que mantém o arquivo pequeno e os diffs legíveis.
+
+        Returns:
+            str: JSON com ``datas`` (índice -> data da carteira) e ``ativos``
+            (ativo -> {índice: participação}), com chaves ordenadas.
+        """
+        ativos = ',\n'.join(
+            f'    {json.dumps(codigo, ensure_ascii=False)}: {json.dumps(self.invertido[codigo], sort_keys=True)}'
+            for codigo in sorted(self.invertido)
+        )
+        datas = json.dumps(self.datas, sort_keys=True)
+        return f'{{\n  "ativos": {{\n{ativos}\n  }},\n  "datas": {datas}\n}}\n'
+
+    def salvar(self, path: str) -> None:
+        """
+        Salva a matriz no formato de índice invertido.
+
+        Args:
+            path (str): Caminho do arquivo JSON.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.para_json())
+
+    @classmethod
+    def carregar(cls, path: str) -> 'MatrizParticipacao':
+        """
+        Lê a matriz salva por ``salvar``.
+
+        Args:
+            path (str): Caminho do arquivo JSON.
+
+        Returns:
+            MatrizParticipacao: A matriz, com o índice invertido já em memória.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            dados = json.load(file)
+        ativos = dados['ativos']
+        codigos = sorted(ativos)
+        indices = sorted({indice for participacoes in ativos.values() for indice in participacoes} | set(dados['datas']))
+        coluna = {indice: posicao for posicao, indice in enumerate(indices)}
+        linhas, colunas, valores = [], [], []
+        for linha, codigo in enumerate(codigos):
+            for indice, valor in ativos[codigo].items():
+                linhas.append(linha)
+                colunas.append(coluna[indice])
+                valores.append(valor)
+        matriz = sparse.csr_matrix((valores, (linhas, colunas)), shape=(len(codigos), len(indices)))
+        matriz.sort_indices()
+        return cls(codigos, indices, matriz, dados['datas'])
@@ -0,0 +1,238 @@
+import config
+from os import makedirs
+from os.path import join
+from typing import Dict, List
+
+import numpy as np
+from pandas import DataFrame, Series, concat, factorize, to_datetime
+from pandas.arrays import IntegerArray
+
+from historico import HistoricoCarteiras
+
+__python__ = 3.10
+
+# Colunas que identificam uma linha de carteira em uma data
+CHAVE = ['indice', 'data', 'codigo']
+
+# Colunas do relatório de rebalanceamento
+COLUNAS_RELATORIO = [
+    'indice', 'data_anterior', 'data', 'codigo', 'acao', 'situacao',
+    'qtde_teorica_anterior', 'qtde_teorica', 'delta_qtde_teorica',
+    'participacao_anterior', 'participacao', 'delta_participacao',
+]
+
+
+def preparar(carteiras: DataFrame) -> DataFrame:
+    """
+    Normaliza carteiras no esquema do histórico para a comparação.
+
+    Args:
+        carteiras (DataFrame): Linhas com ``indice``, ``data``, ``codigo``, ``acao``,
+            ``qtde_teorica`` e ``participacao`` (ver ``HistoricoCarteiras.consultar``).
+
+    Returns:
+        DataFrame: Cópia com ``data`` como datetime64 e ordenada por ``CHAVE``.
+    """
+    carteiras = carteiras.loc[:, ['indice', 'data', 'codigo', 'acao', 'qtde_teorica', 'participacao']].copy()
+    carteiras['data'] = to_datetime(carteiras['data'])
+    return carteiras.sort_values(CHAVE, ignore_index=True)
+
+
+def comparar(anterior: DataFrame, atual: DataFrame) -> DataFrame:
+    """
+    Compara duas carteiras de todos os índices de uma só vez.
+
+    Args:
+        anterior (DataFrame): Carteiras na data anterior (uma data por índice).
+        atual (DataFrame): Carteiras na data atual (uma data por índice, posterior à anterior).
+
+    Returns:
+        DataFrame: Uma linha por índice e ativo, com as colunas de ``COLUNAS_RELATORIO``.
+        Índices presentes em apenas uma das carteiras não são comparados.
+    """
+    return comparar_historico(concat([anterior, atual], ignore_index=True))
+
+
+def comparar_historico(historico: DataFrame) -> DataFrame:
+    """
+    Compara cada carteira com a carteira anterior do mesmo índice, para todo o histórico.
+
+    Cada carteira (índice e data) recebe um número sequencial ``g``, em ordem de índice e
+    data, e cada código um número ``c``. A linha de um ativo na carteira ``g`` tem a chave
+    ``g * C + c``; a mesma linha, vista como "anterior", tem a chave ``(g + 1) * C + c``.
+    As duas listas de chaves são alinhadas com ``numpy`` (união e busca binária), sem
+    ``merge`` de texto nem laços por índice ou por data.
+
+    Args:
+        historico (DataFrame): Linhas do histórico (ver ``HistoricoCarteiras.consultar``).
+
+    Returns:
+        DataFrame: Uma linha por índice, par de datas consecutivas e ativo, com as colunas
+        de ``COLUNAS_RELATORIO``. A primeira data de cada índice não tem comparação.
+    """
+    historico = preparar(historico)
+    if historico.empty:
+        return DataFrame(columns=COLUNAS_RELATORIO)
+
+    indice = historico['indice'].to_numpy()
+    data = historico['data'].to_numpy()
+    codigo_id, codigos = factorize(historico['codigo'], sort=True)
+    total_codigos = len(codigos)
+
+    # Número sequencial de cada carteira (índice, data), na ordem do histórico
+    nova_carteira = np.ones(len(historico), dtype=bool)
+    nova_carteira[1:] = (indice[1:] != indice[:-1]) | (data[1:] != data[:-1])
+    carteira = np.cumsum(nova_carteira) - 1
+    inicio = np.flatnonzero(nova_carteira)
+    carteira_indice = indice[inicio]
+    carteira_data = data[inicio]
+    primeira_do_indice = np.ones(len(inicio), dtype=bool)
+    primeira_do_indice[1:] = carteira_indice[1:] != carteira_indice[:-1]
+    ultima_do_indice = np.roll(primeira_do_indice, -1)
+
+    # Chaves das linhas atuais (carteiras com anterior) e anteriores (carteiras com seguinte)
+    eh_atual = ~primeira_do_indice[carteira]
+    eh_anterior = ~ultima_do_indice[carteira]
+    chave_atual = carteira[eh_atual].astype(np.int64) * total_codigos + codigo_id[eh_atual]
+    chave_anterior = (carteira[eh_anterior].astype(np.int64) + 1) * total_codigos + codigo_id[eh_anterior]
+
+    chaves = np.union1d(chave_atual, chave_anterior)
+    linhas_atual, no_atual = _localizar(chave_atual, chaves, np.flatnonzero(eh_atual))
+    linhas_anterior, no_anterior = _localizar(chave_anterior, chaves, np.flatnonzero(eh_anterior))
+
+    par = chaves // total_codigos
+    acao = historico['acao'].to_numpy()
+    resultado = DataFrame({
+        'indice': carteira_indice[par],
+        'data_anterior': carteira_data[par - 1],
+        'data': carteira_data[par],
+        'codigo': codigos[chaves % total_codigos],
+        'acao': np.where(no_atual, acao[linhas_atual], acao[linhas_anterior]),
+        'situacao': np.select([~no_anterior, ~no_atual], ['incluído', 'excluído'], default='mantido'),
+    })
+    for coluna in ['qtde_teorica', 'participacao']:
+        valores = historico[coluna].to_numpy()
+        atual = np.where(no_atual, valores[linhas_atual], 0)
+        anterior = np.where(no_anterior, valores[linhas_anterior], 0)
+        resultado[f'{coluna}_anterior'] = _com_ausentes(anterior, no_anterior)
+        resultado[coluna] = _com_ausentes(atual, no_atual)
+        resultado[f'delta_{coluna}'] = atual - anterior
+    resultado['delta_qtde_teorica'] = resultado['delta_qtde_teorica'].astype('Int64')
+    resultado['delta_participacao'] = resultado['delta_participacao'].round(3)
+    return resultado[COLUNAS_RELATORIO]
+
+
+def _localizar(chaves_parte: np.ndarray, chaves: np.ndarray, linhas: np.ndarray):
+    """
+    Para cada chave da união, retorna a linha do histórico em ``chaves_parte`` e se ela está presente.
+
+    ``chaves_parte`` já está em ordem crescente (o histórico é ordenado por índice, data e código).
+    """
+    if not len(chaves_parte):
+        return np.zeros(len(chaves), dtype=np.int64), np.zeros(len(chaves), dtype=bool)
+    posicao = np.searchsorted(chaves_parte, chaves).clip(max=len(chaves_parte) - 1)
+    return linhas[posicao], chaves_parte[posicao] == chaves
+
+
+def _com_ausentes(valores: np.ndarray, presente: np.ndarray) -> Series:
+    """
+    Converte os valores em uma série com ausentes onde ``presente`` é falso.
+    """
+    if valores.dtype.kind in 'iu':
+        return Series(IntegerArray(valores.astype(np.int64), ~presente))
+    return Series(np.where(presente, valores, np.nan))
+
+
+def alteracoes(comparacao: DataFrame) -> DataFrame:
+    """
+    Filtra as linhas que indicam rebalanceamento.
+
+    A participação muda todos os dias com os preços; o rebalanceamento aparece como
+    inclusão, exclusão ou mudança da quantidade teórica.
+
+    Args:
+        comparacao (DataFrame): Resultado de ``comparar`` ou ``comparar_historico``.
+
+    Returns:
+        DataFrame: Apenas as inclusões, exclusões e mudanças de quantidade teórica.
+    """
+    return comparacao[(comparacao['situacao'] != 'mantido') | (comparacao['delta_qtde_teorica'] != 0)]
+
+
+class Rebalanceamento:
+    """
+    Gera os relatórios de rebalanceamento dos índices a partir do histórico das carteiras.
+
+    Attributes:
+        historico (HistoricoCarteiras): Histórico das carteiras diárias.
+        path_processed_data (str): Diretório dos dados processados (``Setores/{indice}``).
+
+    Methods:
+        ``relatorios(indices: List[str] = None) -> Dict[str, DataFrame]``:
+            Compara todas as datas consecutivas do histórico e separa as alterações por índice.
+
+        ``salvar_relatorios(relatorios: Dict[str, DataFrame]) -> None``:
+            Salva ``Rebalanceamento_{indice}.csv`` no diretório de cada índice.
+
+        ``execution(indices: List[str] = None) -> None``:
+            Executa o fluxo completo.
+    """
+
+    def __init__(self, historico: HistoricoCarteiras, path_processed_data: str):
+        """
+        Inicializa a classe Rebalanceamento.
+
+        Args:
+            historico (HistoricoCarteiras): Histórico das carteiras diárias.
+            path_processed_data (str): Diretório dos dados processados.
+        """
+        self.historico = historico
+        self.path_processed_data = path_processed_data
+
+    def relatorios(self, indices: List[str] = None) -> Dict[str, DataFrame]:
+        """
+        Compara todas as datas consecutivas do histórico e separa as alterações por índice.
+
+        Args:
+            indices (list, optional): Índices a considerar. Padrão é todos.
+
+        Returns:
+            dict: Índice -> alterações (inclusões, exclusões e mudanças de quantidade).
+        """
+        comparacao = alteracoes(comparar_historico(self.historico.consultar(indices)))
+        return {indice: relatorio.drop(columns='indice').reset_index(drop=True)
+                for indice, relatorio in comparacao.groupby('indice', sort=True)}
+
+    def salvar_relatorios(self, relatorios: Dict[str, DataFrame]) -> None:
+        """
+        Salva ``Rebalanceamento_{indice}.csv`` no diretório de cada índice.
+
+        Args:
+            relatorios (dict): Índice -> relatório.
+        """
+        for indice, relatorio in relatorios.items():
+            try:
+                new_dir = join(self.path_processed_data, 'Setores', indice)
+                makedirs(new_dir, exist_ok=True)
+                file_path = join(new_dir, f'Rebalanceamento_{indice}.csv')
+                relatorio.to_csv(file_path, index=False, encoding='utf-8', date_format='%Y-%m-%d')
+                print(f'Relatório de rebalanceamento salvo em: {file_path}')
+            except Exception as e:
+                print(f'Erro ao salvar o relatório de rebalanceamento de {indice}: {e}')
+
+    def execution(self, indices: List[str] = None) -> None:
+        """
+        Executa o fluxo completo: compara o histórico e salva os relatórios.
+
+        Args:
+            indices (list, optional): Índices a considerar. Padrão é todos.
+        """
+        relatorios = self.relatorios(indices)
+        if not relatorios:
+            print('Nenhum rebalanceamento encontrado (o histórico precisa de ao menos duas datas por índice).')
+        self.salvar_relatorios(relatorios)
+
+
+if __name__ == '__main__':
+    rebalanceamento = Rebalanceamento(HistoricoCarteiras(config.path_historico), config.path_processed_data)
+    rebalanceamento.execution(list(config.INDICES.keys()))
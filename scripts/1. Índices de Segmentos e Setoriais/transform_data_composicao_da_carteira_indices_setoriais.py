@@ -1,16 +1,23 @@
 
 import config
 from os.path import join, exists
-from os import listdir, makedirs
-from pandas import read_csv, DataFrame
+from os import listdir, makedirs, replace
+from pandas import DataFrame
 
 import difflib
-from bs4 import BeautifulSoup
+import hashlib
+import json
 import textwrap
-from typing import List
+from typing import Dict, List, Optional
+from comum.analise_html import texto_documento
+from carteira import formatar_carteira, identificar_arquivo, ler_carteira_do_dia, ler_carteiras
+from participacao import MatrizParticipacao
 
 __python__ = 3.10
 
+# Versão das regras de transformação; alterá-la invalida o manifesto e força o reprocessamento
+VERSAO_TRANSFORM = 2
+
 class Transform:
     """
     Classe para transformação e processamento de dados extraídos.
@@ -21,6 +28,11 @@ class Transform:
     permitindo uma organização eficiente dos dados de acordo com índices 
     fornecidos.
 
+    A transformação é incremental: um manifesto registra o hash dos arquivos de
+    entrada e das saídas de cada índice, e apenas os índices cujas entradas (ou
+    saídas) mudaram são reprocessados. Arquivos cujo conteúdo não muda não são
+    regravados, preservando a data de modificação.
+
     Attributes:
         path_extracted_data (str): Caminho para o diretório onde os dados 
             extraídos estão armazenados.
@@ -28,10 +40,20 @@ class Transform:
             processados serão salvos.
         indices (list): Lista de índices a serem processados.
         dict_indices (dict): Dicionário que mapeia os índices a suas descrições.
+        path_manifesto (str): Caminho do manifesto da transformação incremental.
+        slugs (dict): Mapeamento índice -> slug da página "saiba mais" na B3.
+        arquivos (dict): Índice -> {'csv': arquivo mais recente, 'htm': página}, montado por ``indexar_arquivos``.
+        path_participacoes (str): Caminho da matriz ativo x índice (``participacao.MatrizParticipacao``).
 
     Methods:
+        ``indexar_arquivos() -> Dict[str, Dict[str, str]]``:
+            Varre o diretório de dados uma única vez e associa cada índice aos seus arquivos.
+
+        ``htm_mais_similar(indice: str, files) -> Optional[str]``:
+            Localiza, por similaridade de nome, a página de um índice sem slug mapeado.
+
         ``loc_data_csv(indice: str) -> str``:
-            Encontra o arquivo CSV correspondente a um índice.
+            Encontra o arquivo CSV mais recente correspondente a um índice.
         
         ``loc_data_htm(indice: str) -> str``:
             Localiza um arquivo HTML correspondente a um índice.
@@ -40,6 +62,12 @@ class Transform:
                          skipfooter: int = 2, na_values: List[str] = ['NaN', '']) -> DataFrame``:
             Lê um arquivo CSV e processa seus dados.
 
+        ``read_data_csvs(indices: List[str] = None) -> DataFrame``:
+            Lê de uma só vez as carteiras de vários índices.
+
+        ``carteiras_por_indice(indices: List[str]) -> Dict[str, DataFrame]``:
+            Lê em lote as carteiras dos índices e separa o resultado por índice.
+
         ``read_data_htm(file: str, encoding: str = 'utf-8') -> str``:
             Lê um arquivo HTML e extrai o texto.
 
@@ -54,20 +82,42 @@ class Transform:
         ``save_csv_2(path: str, file_csv: DataFrame, indice: str, update: bool = False) -> None``:
             Salva um DataFrame como um arquivo CSV.
 
+        ``salvar_se_alterado(file_path: str, conteudo: str) -> bool``:
+            Grava o arquivo apenas se o conteúdo mudou.
+
+        ``hash_arquivo(file_path: str) -> str``:
+            Calcula o hash SHA-256 de um arquivo.
+
+        ``hash_entradas(indice: str) -> Dict[str, str]``:
+            Calcula o hash dos arquivos de entrada de um índice.
+
+        ``hash_saidas(new_dir: str, indice: str) -> Dict[str, str]``:
+            Calcula o hash dos arquivos de saída de um índice.
+
+        ``indice_inalterado(registro: dict, entradas: Dict[str, str]) -> bool``:
+            Verifica se um índice pode ser pulado.
+
+        ``carregar_manifesto() -> dict`` / ``salvar_manifesto(manifesto: dict) -> None``:
+            Lê e grava o manifesto.
+
+        ``save_matriz_participacao() -> None``:
+            Salva a matriz ativo x índice com as participações de todas as carteiras.
+
         ``create_directory(indice: str) -> str``:
             Cria um diretório para o índice, se não existir.
 
-        ``process_csv(indice: str, new_dir: str, update: bool = False) -> DataFrame``:
+        ``process_csv(indice: str, new_dir: str, update: bool = False, file_csv: DataFrame = None) -> DataFrame``:
             Processa e salva os dados de um arquivo CSV para um índice.
 
         ``process_html(indice: str, new_dir: str, update: bool = False) -> None``:
             Processa e salva os dados de um arquivo HTML para um índice.
 
-        ``execution(update: bool = True) -> None``:
+        ``execution(update: bool = True, forcar: bool = False) -> None``:
             Executa o fluxo principal de transformação de dados.
     """
     
-    def __init__(self, path_extracted_data: str, path_processed_data: str, indices: str, dict_indices):
+    def __init__(self, path_extracted_data: str, path_processed_data: str, indices: str, dict_indices,
+                 path_manifesto: str = None, slugs: Dict[str, str] = None, path_participacoes: str = None):
         """
         Inicializa a classe Transform com os caminhos de dados e índices.
 
@@ -76,49 +126,73 @@ class Transform:
             path_processed_data (str): Caminho para o diretório onde os dados processados serão salvos.
             indices (list): Lista de índices a serem processados.
             dict_indices (dict): Dicionário que mapeia os índices a suas descrições.
+            path_manifesto (str, optional): Caminho do manifesto. Padrão é ``manifesto.json``
+                dentro de ``path_processed_data``.
+            slugs (dict, optional): Mapeamento índice -> slug da página do índice na B3.
+                Índices sem slug são associados à página de nome mais parecido.
+            path_participacoes (str, optional): Caminho da matriz ativo x índice. Padrão é
+                ``participacoes.json`` dentro de ``path_processed_data``.
         """
         self.path_extracted_data = path_extracted_data
         self.path_processed_data = path_processed_data
         self.indices = indices
         self.dict_indices = dict_indices
+        self.path_manifesto = path_manifesto or join(path_processed_data, 'manifesto.json')
+        self.slugs = slugs or {}
+        self.path_participacoes = path_participacoes or join(path_processed_data, 'participacoes.json')
+        self.arquivos = None
 
-    def loc_data_csv(self, indice: str) -> str:
+    def indexar_arquivos(self) -> Dict[str, Dict[str, str]]:
         """
-        Encontra o arquivo CSV correspondente a um índice no diretório de dados.
+        Varre o diretório de dados uma única vez e associa cada índice aos seus arquivos.
 
-        Args:
-            indice (str): O índice a ser buscado.
+        Para o CSV, vale o arquivo ``XXXXDia_dd-mm-yy.csv`` com a data mais recente.
+        Para o HTML, usa o arquivo ``info_<slug>.htm`` do mapeamento ``slugs``; apenas
+        índices sem slug (ou cujo arquivo não existe) recorrem à similaridade de nomes.
 
         Returns:
-            str: Nome do arquivo CSV encontrado, ou None se não houver.
+            dict: Índice -> {'csv': nome do CSV ou None, 'htm': nome do HTML ou None}.
         """
+        csvs = {}
+        htms = set()
         for file in listdir(self.path_extracted_data):
-            if indice.lower() in file.lower() and file.split('.')[-1] == 'csv':
-                return file
-    
-    def loc_data_htm(self, indice: str) -> str:
+            encontrado = identificar_arquivo(file)
+            if encontrado:
+                indice, data = encontrado
+                if indice not in csvs or data > csvs[indice][0]:
+                    csvs[indice] = (data, file)
+            elif file.endswith('.htm'):
+                htms.add(file)
+
+        self.arquivos = {}
+        for indice in self.indices:
+            htm = f'info_{self.slugs[indice]}.htm' if indice in self.slugs else None
+            if htm not in htms:
+                htm = self.htm_mais_similar(indice, htms)
+            self.arquivos[indice] = {
+                'csv': csvs[indice.upper()][1] if indice.upper() in csvs else None,
+                'htm': htm,
+            }
+        return self.arquivos
+
+    def htm_mais_similar(self, indice: str, files) -> Optional[str]:
         """
-        Localiza um arquivo HTML correspondente a um índice.
-
-        A função procura primeiro por um arquivo cujo nome contém o índice
-        (ignorando maiúsculas/minúsculas). Se não encontrado, ela calcula
-        a similaridade entre os nomes dos arquivos HTML e o nome do índice
-        fornecido, retornando o arquivo com a maior similaridade.
+        Localiza, por similaridade de nome, a página HTML de um índice sem slug mapeado.
 
         Args:
             indice (str): O índice a ser buscado no nome do arquivo.
+            files (iterable): Nomes dos arquivos HTML disponíveis.
 
         Returns:
-            str: O nome do arquivo HTML correspondente ou o mais similar.
+            str: O nome do arquivo HTML que contém o índice ou o mais similar (None se não houver arquivos).
         """
-        files = [file for file in listdir(self.path_extracted_data) if file.endswith('.htm')]
-
+        files = sorted(files)
         if not files:
-            raise FileNotFoundError('Nenhum arquivo HTML encontrado.')
-        
+            return None
+
         # Tenta encontrar um arquivo exato
         for file in files:
-            if f'-{indice.lower()}-' in file.lower():
+            if f'-{indice.lower()}-' in file.lower() or file.lower().endswith(f'-{indice.lower()}.htm'):
                 return file
 
         # Se não encontrado, calcula a similaridade
@@ -126,13 +200,48 @@ class Transform:
 
         return max(result, key=result.get)
 
+    def loc_data_csv(self, indice: str) -> str:
+        """
+        Encontra o arquivo CSV mais recente correspondente a um índice no diretório de dados.
+
+        Args:
+            indice (str): O índice a ser buscado.
+
+        Returns:
+            str: Nome do arquivo CSV encontrado, ou None se não houver.
+        """
+        if self.arquivos is None:
+            self.indexar_arquivos()
+        return self.arquivos.get(indice, {}).get('csv')
+    
+    def loc_data_htm(self, indice: str) -> str:
+        """
+        Localiza o arquivo HTML correspondente a um índice.
+
+        Args:
+            indice (str): O índice a ser buscado.
+
+        Returns:
+            str: O nome do arquivo HTML correspondente.
+
+        Raises:
+            FileNotFoundError: Se nenhum arquivo HTML for encontrado.
+        """
+        if self.arquivos is None:
+            self.indexar_arquivos()
+        file = self.arquivos.get(indice, {}).get('htm')
+        if file is None:
+            raise FileNotFoundError('Nenhum arquivo HTML encontrado.')
+        return file
+
     def read_data_csv(self, file: str, skiprows: int = 1, skipfooter: int = 2, na_values : List[str] = ['NaN', '']) -> DataFrame:
         """
-        Lê um arquivo CSV e processa seus dados.
+        Lê um arquivo CSV "Carteira do Dia" e processa seus dados.
 
-        Esta função realiza a leitura de um arquivo CSV localizado no diretório
-        especificado, aplicando configurações específicas para formatação e tratamento
-        de dados, como remoção de linhas desnecessárias e renomeação de colunas.
+        A leitura é feita por ``carteira.ler_carteira_do_dia``, que remove o título e o
+        rodapé do arquivo e converte as linhas sem o custo fixo do ``read_csv``. A quantidade
+        teórica é lida como Int64 (inteiro anulável), a participação como float64 e o tipo
+        como categoria.
 
         Args:
             file (str): O nome do arquivo CSV a ser lido.
@@ -141,29 +250,19 @@ class Transform:
             na_values (list, optional): Valores a serem considerados como NaN. Padrão é ['NaN', ''].
 
         Returns:
-            DataFrame: Um DataFrame do Pandas contendo os dados processados, com
-            colunas renomeadas e a última coluna removida.
+            DataFrame: Um DataFrame do Pandas com as colunas ``carteira.COLUNAS`` tipadas.
 
         Raises:
             FileNotFoundError: Se o arquivo não for encontrado.
             Exception: Para outros erros durante a leitura do arquivo.
         """
-        if na_values is None:
-            na_values = ['NaN', '']
         try:
-            file_csv = read_csv(
-                join(self.path_extracted_data, file), 
-                encoding='ISO-8859-1', 
-                delimiter=';', 
-                skiprows=skiprows, 
-                skipfooter=skipfooter, 
-                na_values=na_values, 
-                on_bad_lines='warn', 
-                engine='python'
-            ).reset_index()
-            file_csv.columns = ['Código', 'Ação', 'Tipo', 'Qtde. Teórica', 'Part. (%)', '']
-            file_csv = file_csv.iloc[:, :-1]  # Remove a última coluna
-            return file_csv
+            return ler_carteira_do_dia(
+                join(self.path_extracted_data, file),
+                linhas_cabecalho=skiprows,
+                linhas_rodape=skipfooter,
+                na_values=na_values,
+            )
         except FileNotFoundError:
             print(f"Erro: O arquivo '{file}' não foi encontrado.")
             raise
@@ -171,12 +270,48 @@ class Transform:
             print(f"Erro ao ler o arquivo: {e}")
             raise
 
+    def read_data_csvs(self, indices: List[str] = None) -> DataFrame:
+        """
+        Lê de uma só vez as carteiras de vários índices.
+
+        Args:
+            indices (list, optional): Índices a serem lidos. Padrão é todos os índices.
+
+        Returns:
+            DataFrame: Carteiras empilhadas, com a coluna categórica ``Índice``.
+        """
+        indices = self.indices if indices is None else indices
+        return ler_carteiras(self.path_extracted_data, {indice: self.loc_data_csv(indice) for indice in indices})
+
+    def carteiras_por_indice(self, indices: List[str]) -> Dict[str, DataFrame]:
+        """
+        Lê em lote as carteiras dos índices e separa o resultado por índice.
+
+        Se a leitura em lote falhar (por exemplo, um arquivo corrompido), retorna um
+        dicionário vazio e cada índice é lido individualmente por ``process_csv``.
+
+        Args:
+            indices (list): Índices a serem lidos.
+
+        Returns:
+            dict: Índice -> carteira (sem a coluna ``Índice``).
+        """
+        try:
+            carteiras = self.read_data_csvs(indices)
+        except Exception as e:
+            print(f'Erro na leitura em lote das carteiras, lendo arquivo a arquivo: {e}')
+            return {}
+        return {
+            indice: carteira.drop(columns='Índice').reset_index(drop=True)
+            for indice, carteira in carteiras.groupby('Índice', observed=True, sort=False)
+        }
+
     def read_data_htm(self, file: str, encoding: str = 'utf-8') -> str:
         """
         Lê um arquivo HTML e extrai o texto.
 
-        Esta função abre um arquivo HTML, analisa seu conteúdo com BeautifulSoup
-        e retorna o texto extraído. O texto é retornado como uma string única, 
+        Esta função abre um arquivo HTML, analisa seu conteúdo com o lxml
+        e retorna o texto extraído (o mesmo de ``get_text(strip=True)`` do BeautifulSoup). O texto é retornado como uma string única, 
         com espaços extras removidos.
 
         Args:
@@ -197,8 +332,7 @@ class Transform:
 
         try:
             with open(file_path, 'r', encoding=encoding) as htm:
-                soup = BeautifulSoup(htm, 'html.parser')
-                return soup.get_text(strip=True)
+                return texto_documento(htm.read())
         except Exception as e:
             raise Exception(f'Erro ao ler o arquivo {file_path}: {e}')
 
@@ -218,11 +352,10 @@ class Transform:
         new_file = join(path, f'Códigos_{file_name}.txt')
         if not exists(new_file) or update is True:
             try:
-                with open(new_file, 'w', encoding='utf-8') as file:
-                    
-                    file.write('\n'.join(file_csv['Código'].values) + '\n') # <---!!
-                
-                print(f'Códigos salvos em {new_file}.') 
+                if self.salvar_se_alterado(new_file, '\n'.join(file_csv['Código'].values) + '\n'):
+                    print(f'Códigos salvos em {new_file}.') 
+                else:
+                    print(f'Códigos inalterados: {new_file}')
             except Exception as e:
                 print(f'Erro ao salvar o arquivo {e}.')
         else:
@@ -248,9 +381,10 @@ class Transform:
 
         if not exists(new_file) or update:
             try:
-                with open(new_file, 'w', encoding='utf-8') as file:
-                    file.write(textwrap.fill(file_htm, width=50))
-                print(f'Apresentação salva em {new_file}.')
+                if self.salvar_se_alterado(new_file, textwrap.fill(file_htm, width=50)):
+                    print(f'Apresentação salva em {new_file}.')
+                else:
+                    print(f'Apresentação inalterada: {new_file}')
             except OSError as e:
                 print(f'Erro ao salvar o arquivo: {e}')
         else:
@@ -260,7 +394,8 @@ class Transform:
         """
         Salva um DataFrame como um arquivo CSV.
 
-        O arquivo é salvo no diretório especificado e nomeado como 'Tabela_{indice}.csv'.
+        O arquivo é salvo no diretório especificado e nomeado como 'Tabela_{indice}.csv',
+        com os números no formato publicado pela B3 (``carteira.formatar_carteira``).
         A atualização é feita se o arquivo já existir e o parâmetro update for True.
 
         Args:
@@ -275,13 +410,147 @@ class Transform:
         try:
             file_path = join(path, f'Tabela_{indice}.csv')
             if not exists(file_path) or update:
-                file_csv.to_csv(file_path, index=False, encoding='utf-8')
-                print(f'Arquivo salvo em: {file_path}')
+                if self.salvar_se_alterado(file_path, formatar_carteira(file_csv).to_csv(index=False)):
+                    print(f'Arquivo salvo em: {file_path}')
+                else:
+                    print(f'Arquivo inalterado: {file_path}')
             else:
                 print(f'O arquivo já existe: {file_path}')
         except Exception as e:
             print(f'Erro ao salvar o arquivo: {e}')
     
+    def salvar_se_alterado(self, file_path: str, conteudo: str) -> bool:
+        """
+        Grava o arquivo apenas se o conteúdo mudou.
+
+        Manter arquivos inalterados preserva a data de modificação e evita diffs
+        desnecessários em ``processed_data``.
+
+        Args:
+            file_path (str): Caminho do arquivo.
+            conteudo (str): Conteúdo a ser gravado (UTF-8).
+
+        Returns:
+            bool: True se o arquivo foi gravado, False se o conteúdo já era o mesmo.
+        """
+        dados = conteudo.encode('utf-8')
+        if exists(file_path):
+            with open(file_path, 'rb') as file:
+                if file.read() == dados:
+                    return False
+        with open(file_path, 'wb') as file:
+            file.write(dados)
+        return True
+
+    def hash_arquivo(self, file_path: str) -> str:
+        """
+        Calcula o hash SHA-256 de um arquivo.
+
+        Args:
+            file_path (str): Caminho do arquivo.
+
+        Returns:
+            str: Hash em hexadecimal.
+        """
+        with open(file_path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def hash_entradas(self, indice: str) -> Dict[str, str]:
+        """
+        Calcula o hash dos arquivos de entrada (CSV e HTML) de um índice.
+
+        Args:
+            indice (str): O índice.
+
+        Returns:
+            dict: Nome do arquivo de entrada -> hash.
+        """
+        arquivos = [self.loc_data_csv(indice), self.loc_data_htm(indice)]
+        return {file: self.hash_arquivo(join(self.path_extracted_data, file)) for file in arquivos if file}
+
+    def hash_saidas(self, new_dir: str, indice: str) -> Dict[str, str]:
+        """
+        Calcula o hash dos arquivos de saída de um índice.
+
+        Args:
+            new_dir (str): Diretório de saída do índice.
+            indice (str): O índice.
+
+        Returns:
+            dict: Nome do arquivo de saída -> hash (apenas os arquivos existentes).
+        """
+        arquivos = [f'Tabela_{indice}.csv', f'Códigos_{indice}.txt', f'Apresentação_{indice}.txt']
+        return {file: self.hash_arquivo(join(new_dir, file)) for file in arquivos if exists(join(new_dir, file))}
+
+    def indice_inalterado(self, registro: dict, entradas: Dict[str, str]) -> bool:
+        """
+        Verifica se um índice pode ser pulado.
+
+        O índice é pulado quando o manifesto registra as mesmas entradas, a mesma versão
+        da transformação e as saídas continuam no disco com o mesmo conteúdo.
+
+        Args:
+            registro (dict): Registro do índice no manifesto (ou None).
+            entradas (dict): Hash atual das entradas do índice.
+
+        Returns:
+            bool: True se nada mudou desde o último processamento.
+        """
+        if not registro or registro.get('versao') != VERSAO_TRANSFORM or registro.get('entradas') != entradas:
+            return False
+        new_dir = join(self.path_processed_data, 'Setores', registro['diretorio'])
+        return bool(registro.get('saidas')) and self.hash_saidas(new_dir, registro['diretorio']) == registro['saidas']
+
+    def carregar_manifesto(self) -> dict:
+        """
+        Lê o manifesto da transformação incremental.
+
+        Returns:
+            dict: Registro por índice (vazio se o manifesto não existir).
+        """
+        if not exists(self.path_manifesto):
+            return {}
+        with open(self.path_manifesto, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def salvar_manifesto(self, manifesto: dict) -> None:
+        """
+        Grava o manifesto (de forma atômica e apenas se houver alteração).
+
+        Args:
+            manifesto (dict): Registro por índice.
+        """
+        conteudo = json.dumps(manifesto, ensure_ascii=False, indent=2, sort_keys=True) + '\n'
+        tmp = f'{self.path_manifesto}.tmp'
+        if exists(self.path_manifesto):
+            with open(self.path_manifesto, 'r', encoding='utf-8') as file:
+                if file.read() == conteudo:
+                    return
+        with open(tmp, 'w', encoding='utf-8') as file:
+            file.write(conteudo)
+        replace(tmp, self.path_manifesto)
+
+    def save_matriz_participacao(self) -> None:
+        """
+        Salva a matriz ativo x índice com as participações de todas as carteiras.
+
+        O arquivo é um índice invertido (ativo -> {índice: participação}) que permite saber
+        em quais índices um ativo está sem ler os arquivos ``Códigos_{indice}.txt``.
+        """
+        try:
+            datas = {}
+            for indice in self.indices:
+                file = self.loc_data_csv(indice)
+                if file:
+                    datas[indice] = identificar_arquivo(file)[1].isoformat()
+            matriz = MatrizParticipacao.de_carteiras(self.read_data_csvs(), datas)
+            if self.salvar_se_alterado(self.path_participacoes, matriz.para_json()):
+                print(f'Matriz de participações salva em {self.path_participacoes}.')
+            else:
+                print(f'Matriz de participações inalterada: {self.path_participacoes}')
+        except Exception as e:
+            print(f'Erro ao salvar a matriz de participações: {e}')
+
     def create_directory(self, indice: str) -> str:
         """
         Cria um diretório para o índice, se não existir.
@@ -298,7 +567,7 @@ class Transform:
             print(f'Diretório criado: {new_dir}')
         return new_dir
 
-    def process_csv(self, indice: str, new_dir: str, update: bool = False) -> DataFrame:
+    def process_csv(self, indice: str, new_dir: str, update: bool = False, file_csv: DataFrame = None) -> DataFrame:
         """
         Processa e salva os dados de um arquivo CSV para um índice.
 
@@ -308,12 +577,14 @@ class Transform:
             indice (str): O índice do qual os dados serão processados.
             new_dir (str): Diretório onde os arquivos processados serão salvos.
             update (bool): Se True, força a atualização dos arquivos existentes.
+            file_csv (DataFrame, optional): Carteira já lida (ver ``carteiras_por_indice``).
+                Se não informada, o arquivo do índice é lido.
 
         Returns:
             DataFrame: DataFrame com os dados do índice processado.
         """
-        file_name = self.loc_data_csv(indice)
-        file_csv = self.read_data_csv(file_name)
+        if file_csv is None:
+            file_csv = self.read_data_csv(self.loc_data_csv(indice))
         self.save_codigos_carteira_setor(new_dir, indice, file_csv, update=update)
         self.save_csv_2(new_dir, file_csv, indice, update=update)
         return file_csv
@@ -333,31 +604,62 @@ class Transform:
         file_htm = self.read_data_htm(file_name)
         self.save_informacoes_sobre_o_setor(new_dir, indice, file_htm, update=update)
 
-    def execution(self, update: bool = True) -> None:
+    def execution(self, update: bool = True, forcar: bool = False) -> None:
         """
         Executa o fluxo principal de transformação de dados.
 
         Esta função itera sobre todos os índices e processa os dados correspondentes, 
-        lidando com exceções durante o processo.
+        lidando com exceções durante o processo. Índices cujas entradas e saídas não
+        mudaram desde a última execução (segundo o manifesto) são pulados, e as carteiras
+        dos demais são lidas em lote.
 
         Args:
             update (bool): Se True, força a atualização dos arquivos existentes.
+            forcar (bool): Se True, ignora o manifesto e reprocessa todos os índices.
         """
+        manifesto = self.carregar_manifesto()
+        self.indexar_arquivos()
+        pendentes = {}
         for indice in self.indices:
+            try:
+                entradas = self.hash_entradas(indice)
+            except Exception as e:
+                print(f'Erro ao processar o índice {indice}: {e}')
+                continue
+            if not forcar and self.indice_inalterado(manifesto.get(indice), entradas):
+                print(f'Índice sem alterações: {indice}')
+            else:
+                pendentes[indice] = entradas
+
+        carteiras = self.carteiras_por_indice(list(pendentes)) if pendentes else {}
+        for indice, entradas in pendentes.items():
             try:
                 new_dir = self.create_directory(indice)
-                file_csv = self.process_csv(indice, new_dir, update)
+                file_csv = self.process_csv(indice, new_dir, update, carteiras.get(indice))
                 self.process_html(indice, new_dir, update)
+                manifesto[indice] = {
+                    'versao': VERSAO_TRANSFORM,
+                    'diretorio': indice,
+                    'entradas': entradas,
+                    'saidas': self.hash_saidas(new_dir, indice),
+                }
 
             except Exception as e:
                 print(f'Erro ao processar o índice {indice}: {e}')
+        self.salvar_manifesto(manifesto)
+
+        if pendentes or not exists(self.path_participacoes):
+            self.save_matriz_participacao()
 
 if __name__ == '__main__':
     transform_composicao_da_carteira = Transform(
         config.path_extracted_data, 
         config.path_processed_data, 
         config.INDICES.keys(),
-        config.INDICES)
+        config.INDICES,
+        config.path_manifesto,
+        config.SLUGS_INDICES,
+        config.path_participacoes)
     
     transform_composicao_da_carteira.execution(
         update=True
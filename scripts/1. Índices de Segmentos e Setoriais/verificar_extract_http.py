@@ -0,0 +1,103 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+from threading import Thread
+import sys
+import config
+from extract_composicao_da_carteira_indices_setoriais import ExtractHTTP
+from comum.listados import decodificar_parametros
+
+__python__ = 3.10
+
+# Arquivo baixado pelo site (em `path_extracted_data`) que corresponde à resposta gravada de cada índice
+ESPERADOS = {
+    'IMOB': 'IMOBDia_22-10-24.csv',
+    'IDIV': 'IDIVDia_22-10-24.csv',
+}
+
+
+def servidor_stub(path_fixtures: str) -> ThreadingHTTPServer:
+    """
+    Servidor HTTP local que responde ``GetDownloadPortfolioDay`` com as respostas gravadas.
+
+    O índice é lido dos parâmetros em base64 da URL, e o corpo da resposta é o conteúdo de
+    ``<indice>.txt`` (o CSV em base64, entre aspas, como na API da B3). Outras URLs ou índices
+    sem resposta gravada recebem 404.
+
+    Args:
+        path_fixtures (str): Pasta das respostas gravadas.
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução (em uma thread) numa porta livre de 127.0.0.1.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            indice = decodificar_parametros(self.path).get('index')
+            if '/indexProxy/indexCall/GetDownloadPortfolioDay/' not in self.path or indice is None:
+                self.send_error(404)
+                return
+            try:
+                with open(join(path_fixtures, f'{indice}.txt'), 'rb') as file:
+                    corpo = file.read()
+            except FileNotFoundError:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *argumentos):
+            pass
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def verificar(path_fixtures: str, esperados: dict) -> list:
+    """
+    Executa ``ExtractHTTP`` contra o servidor local e compara os arquivos gerados com os do site.
+
+    Args:
+        path_fixtures (str): Pasta das respostas gravadas.
+        esperados (dict): Índice -> nome do arquivo esperado, presente em ``config.path_extracted_data``.
+
+    Returns:
+        list: Descrição de cada divergência (nome ou conteúdo do arquivo).
+    """
+    servidor = servidor_stub(path_fixtures)
+    erros = []
+    try:
+        with TemporaryDirectory() as tmp:
+            extract = ExtractHTTP(tmp, list(esperados), url_base=f'http://127.0.0.1:{servidor.server_port}')
+            extract.execute()
+            gerados = set(listdir(tmp))
+            for indice, nome in esperados.items():
+                if nome not in gerados:
+                    erros.append(f'{indice}: {nome} não foi gerado (arquivos: {sorted(gerados)})')
+                    continue
+                with open(join(tmp, nome), 'rb') as file:
+                    gerado = file.read()
+                with open(join(config.path_extracted_data, nome), 'rb') as file:
+                    referencia = file.read()
+                if gerado != referencia:
+                    erros.append(f'{indice}: {nome} difere do arquivo baixado pelo site '
+                                 f'({len(gerado)} bytes, esperado {len(referencia)})')
+            extras = gerados - set(esperados.values())
+            if extras:
+                erros.append(f'Arquivos inesperados: {sorted(extras)}')
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    return erros
+
+
+if __name__ == '__main__':
+    erros = verificar(config.path_fixtures_carteira, ESPERADOS)
+    print(f'\nÍndices verificados: {len(ESPERADOS)}, divergências: {len(erros)}')
+    for erro in erros:
+        print(f'  {erro}')
+    sys.exit(1 if erros else 0)
@@ -1,12 +1,32 @@
 from os.path import join, dirname, abspath
+import sys
 
 # Define o diretório base para os caminhos dos dados
 diretorio_base = dirname(dirname(dirname(abspath(__file__))))
 
+# Permite importar o pacote compartilhado `scripts/comum` e o pacote `b3_dados` (raiz do repositório)
+sys.path.append(dirname(dirname(abspath(__file__))))
+sys.path.append(dirname(dirname(dirname(abspath(__file__)))))
+
 # Especifica os caminhos para os dados extraídos e processados
 path_extracted_data = join(diretorio_base, 'extracted_data', '2. Horário de negociação', 'table.htm')
 path_processed_data = join(diretorio_base, 'processed_data', '2. Horário de negociação', 'Tabela_horarios_de_negociacao_no_mercado_de_acoes.csv')
 
+# Tabela normalizada: uma linha por mercado e fase (mercado, fase, inicio, fim)
+path_processed_fases = join(diretorio_base, 'processed_data', '2. Horário de negociação', 'Fases_do_pregao_por_mercado.csv')
+
+# Cache em disco das páginas da B3 (requisições condicionais com ETag/Last-Modified)
+path_cache_http = join(diretorio_base, 'extracted_data', 'cache_http')
+
+# Validade, em segundos, de uma página em cache antes de revalidá-la no servidor
+CACHE_TTL = 6 * 3600
+
+# Tamanho máximo do cache em disco, em bytes (as páginas menos usadas são removidas)
+CACHE_TAMANHO_MAXIMO = 200 * 1024 * 1024
+
+# Ignora o cache e baixa a página de novo
+FORCAR_ATUALIZACAO = False
+
 # URL para a extração de dados
 url = 'https://www.b3.com.br/pt_br/solucoes/plataformas/puma-trading-system/para-participantes-e-traders/horario-de-negociacao/acoes/'
 
@@ -1,7 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
+from os.path import exists
 from pandas import DataFrame
 import config
+from b3_dados.horarios import normalizar, para_csv
+from b3_dados.http import CacheHTTP
+from comum.analise_html import linhas_primeira_tabela
+from comum.requisicoes import BuscadorConcorrente
 from typing import List
 
 class ExtractAndTransform:
@@ -10,14 +14,21 @@ class ExtractAndTransform:
 
     Esta classe realiza a extração de dados de uma tabela localizada em uma 
     URL específica, transforma esses dados em um DataFrame do pandas e, 
-    em seguida, salva o DataFrame em um arquivo CSV.
+    em seguida, salva o DataFrame em um arquivo CSV. A tabela também é normalizada
+    (uma linha por mercado e fase, ver ``b3_dados.horarios``) e salva em um segundo CSV.
+
+    A página é guardada em um cache revalidado por ETag/Last-Modified, então uma nova
+    execução com a página inalterada custa uma resposta 304, e o CSV só é regravado
+    quando o conteúdo muda.
 
     Attributes:
         path_processed_data (str): Caminho para o arquivo CSV onde os dados 
             processados serão salvos.
+        path_processed_fases (str): Caminho para o CSV da tabela normalizada.
         url (str): URL da página web de onde os dados serão extraídos.
         headers (list): Lista de cabeçalhos a serem utilizados no DataFrame 
             resultante.
+        buscador (BuscadorConcorrente): Camada de requisições com cache.
 
     Methods:
         ``extract() -> List[str]``:
@@ -26,14 +37,21 @@ class ExtractAndTransform:
         ``transform(extract_data: List[str]) -> DataFrame``:
             Transforma os dados extraídos em um DataFrame do pandas.
 
+        ``transform_fases(df_data: DataFrame) -> DataFrame``:
+            Normaliza a tabela em uma linha por mercado e fase.
+
         ``save(df_data: DataFrame) -> None``:
             Salva o DataFrame em um arquivo CSV.
 
+        ``save_fases(df_fases: DataFrame) -> None``:
+            Salva a tabela normalizada em um arquivo CSV.
+
         ``run()``:
             Executa o processo de extração, transformação e salvamento.
     """
     
-    def __init__(self, path_processed_data: str, url: str, headers: List[str]):
+    def __init__(self, path_processed_data: str, url: str, headers: List[str], buscador: BuscadorConcorrente = None,
+                 path_processed_fases: str = None):
         """
         Inicializa a instância da classe ExtractAndTransform.
 
@@ -41,34 +59,39 @@ class ExtractAndTransform:
             path_processed_data (str): Caminho para o arquivo CSV onde os dados processados serão salvos.
             url (str): URL da página web de onde os dados serão extraídos.
             headers (list): Lista de cabeçalhos a serem utilizados no DataFrame resultante.
+            buscador (BuscadorConcorrente, optional): Camada de requisições a ser usada. Se omitida,
+                é criada com o cache definido em ``config``.
+            path_processed_fases (str, optional): Caminho para o CSV da tabela normalizada. Padrão
+                é ``config.path_processed_fases``.
         """
         self.path_processed_data = path_processed_data
+        self.path_processed_fases = path_processed_fases or config.path_processed_fases
         self.url = url
         self.headers = headers
+        self.buscador = buscador or BuscadorConcorrente(
+            max_simultaneas=1,
+            cache=CacheHTTP(config.path_cache_http, config.CACHE_TTL, config.CACHE_TAMANHO_MAXIMO),
+            forcar=config.FORCAR_ATUALIZACAO)
     
     def extract(self) -> List[str]:
         """
         Extrai os dados da tabela HTML localizada na URL especificada.
 
-        Realiza uma requisição GET à URL e utiliza BeautifulSoup para analisar o conteúdo HTML.
+        Realiza uma requisição GET à URL e analisa o conteúdo HTML com o lxml, em modo
+        incremental: apenas a primeira tabela é montada, e a análise para ao fim dela.
         Retorna uma lista de listas, onde cada sublista representa uma linha da tabela.
 
         Returns:
             list: Lista contendo as linhas da tabela extraídas. Retorna uma lista vazia se ocorrer um erro.
         """
         try:
-            response = requests.get(self.url)
+            response = self.buscador.get(self.url)
             response.raise_for_status() 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            tabela = soup.find('table')
-            if tabela is None:
+            print(f"Página obtida ({response.origem}): {self.url}")
+            dados = linhas_primeira_tabela(response.text)
+            if dados is None:
                 print("Tabela não encontrada na página.")
                 return []
-            dados = []
-            for tr in tabela.find_all('tr')[1:]:
-                linha = [td.get_text(strip=True) for td in tr.find_all('td')]
-                if linha:
-                    dados.append(linha)
             print(f"Dados extraídos: {len(dados)} linhas.")
             return dados
         except requests.RequestException as e:
@@ -95,10 +118,37 @@ class ExtractAndTransform:
         df_data = DataFrame(extract_data, columns=self.headers)
         print("Dados transformados em DataFrame.")
         return df_data
-    
+
+    def transform_fases(self, df_data: DataFrame) -> DataFrame:
+        """
+        Normaliza a tabela em uma linha por mercado e fase (``mercado``, ``fase``, ``inicio``, ``fim``).
+
+        Args:
+            df_data (DataFrame): DataFrame retornado por ``transform``.
+
+        Returns:
+            DataFrame: Tabela normalizada, com os horários como ``datetime.time``. Retorna um
+            DataFrame vazio se não houver dados.
+        """
+        if df_data.empty:
+            return DataFrame()
+        df_fases = normalizar(df_data)
+        print(f"Tabela normalizada: {len(df_fases)} fases de {df_fases['mercado'].nunique()} mercados.")
+        return df_fases
+
+    def _gravar(self, conteudo: str, path: str) -> None:
+        if exists(path):
+            with open(path, 'r', encoding='utf-8', newline='') as file:
+                if file.read() == conteudo:
+                    print(f"Dados inalterados: {path}")
+                    return
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            file.write(conteudo)
+        print(f"Dados salvos em: {path}")
+
     def save(self, df_data: DataFrame) -> None:
         """
-        Salva o DataFrame em um arquivo CSV.
+        Salva o DataFrame em um arquivo CSV, se o conteúdo for diferente do arquivo existente.
 
         Args:
             df_data (DataFrame): DataFrame que contém os dados a serem salvos.
@@ -107,16 +157,38 @@ class ExtractAndTransform:
             None
         """
         try:
-            df_data.to_csv(self.path_processed_data, index=False, encoding='utf-8')
-            print(f"Dados salvos em: {self.path_processed_data}")
+            if df_data.empty:
+                print("Nenhum dado para salvar.")
+                return
+            self._gravar(df_data.to_csv(index=False), self.path_processed_data)
         except Exception as e:
             print(f"Erro ao salvar os dados: {e}")
 
+    def save_fases(self, df_fases: DataFrame) -> None:
+        """
+        Salva a tabela normalizada em um arquivo CSV (horários como ``HH:MM``), se o conteúdo
+        for diferente do arquivo existente.
+
+        Args:
+            df_fases (DataFrame): DataFrame retornado por ``transform_fases``.
+
+        Returns:
+            None
+        """
+        try:
+            if df_fases.empty:
+                print("Nenhuma fase para salvar.")
+                return
+            self._gravar(para_csv(df_fases), self.path_processed_fases)
+        except Exception as e:
+            print(f"Erro ao salvar as fases: {e}")
+
     def run(self):
         """Executa o processo de extração, transformação e salvamento."""
         extract_data = self.extract()
         transform_data = self.transform(extract_data)
         self.save(transform_data)
+        self.save_fases(self.transform_fases(transform_data))
 
 if __name__ == '__main__':
     extract_and_transform = ExtractAndTransform(
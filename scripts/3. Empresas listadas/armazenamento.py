@@ -0,0 +1,349 @@
+import json
+import sqlite3
+from datetime import datetime
+from hashlib import sha256
+from os import listdir
+from os.path import join, exists, isdir
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+from pandas import DataFrame, read_sql_query
+from registros import CAMPOS, CAMPOS_CONTROLE, carregar_registros, ler_registro_legado, escrever_registros
+
+__python__ = 3.10
+
+
+class ArmazenamentoEmpresas:
+    """
+    Armazenamento único (SQLite) dos dados extraídos das empresas listadas.
+
+    Substitui as pastas ``<codigo>/url_<codigo>.txt`` e ``<codigo>/infos_<codigo>.txt``: cada
+    empresa é uma linha com a URL, os campos de informação e a data de cada coleta. Gravações
+    são pontuais (upsert por código) e a leitura do catálogo completo é uma única consulta.
+    A conexão é compartilhada entre threads e protegida por um lock, o que permite que os
+    trabalhadores do pool gravem diretamente.
+
+    Cada gravação também é acrescentada a um log JSON Lines (``path_log``), que é o formato
+    versionado no repositório: o banco pode ser recriado a partir dele a qualquer momento.
+    O tamanho e o sha256 do log refletido no banco ficam na tabela ``meta`` (atualizados na
+    mesma transação de cada gravação); quando o log muda por fora (ex.: ``git pull`` ou
+    ``registros.compactar``), o banco é recriado a partir dele na abertura.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite.
+        path_log (str): Caminho do log JSON Lines (None para não registrar).
+
+    Methods:
+        ``salvar_url(codigo: str, url: str, update: bool = False) -> bool``:
+            Grava a URL de uma empresa.
+
+        ``get_url(codigo: str) -> Optional[str]``:
+            Retorna a URL de uma empresa.
+
+        ``remover_url(codigo: str) -> None``:
+            Remove a URL de uma empresa.
+
+        ``salvar_infos(infos: List[str], update: bool = False) -> bool``:
+            Grava as informações de uma empresa.
+
+        ``get_infos(codigo: str) -> Optional[List[str]]``:
+            Retorna as informações de uma empresa.
+
+        ``remover_infos(codigo: str) -> None``:
+            Remove as informações de uma empresa.
+
+        ``urls() -> Dict[str, str]``:
+            Retorna as URLs de todas as empresas.
+
+        ``codigos() -> List[str]``:
+            Lista os códigos armazenados.
+
+        ``codigos_pendentes(update: bool = False) -> List[str]``:
+            Lista os códigos com URL cujas informações ainda não foram extraídas.
+
+        ``ler_tabela() -> DataFrame``:
+            Lê o catálogo completo em uma única consulta.
+
+        ``importar_log(path: str) -> int``:
+            Importa um arquivo JSON Lines de empresas.
+
+        ``sincronizar_log() -> bool``:
+            Recria o banco a partir do log se ele mudou desde a última importação ou gravação.
+
+        ``importar_diretorios(path: str) -> int``:
+            Importa as pastas por código do formato anterior.
+    """
+
+    def __init__(self, path: str, path_legado: Optional[str] = None, path_log: Optional[str] = None):
+        """
+        Abre (ou cria) o armazenamento.
+
+        Com ``path_log``, o banco é sincronizado com o log JSON Lines (``sincronizar_log``): na
+        criação, ou quando o log mudou desde a última gravação, os dados são importados dele.
+        Se o log ainda não existir, ele é criado a partir do banco, depois de importada a pasta
+        no formato anterior (apenas na criação do banco).
+
+        :param path: Caminho do arquivo SQLite.
+        :param path_legado: Pasta no formato anterior (uma subpasta por código).
+        :param path_log: Caminho do log JSON Lines.
+        """
+        self.path = path
+        self.path_log = path_log
+        novo = not exists(path)
+        self._lock = Lock()
+        self._log = None
+        self._conexao = sqlite3.connect(path, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute(f'''
+            CREATE TABLE IF NOT EXISTS empresas (
+                codigo TEXT PRIMARY KEY,
+                {', '.join(f'{campo} TEXT' for campo in CAMPOS[1:] + CAMPOS_CONTROLE)}
+            )''')
+        self._conexao.execute('CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL)')
+        self._conexao.commit()
+        if novo and path_legado and isdir(path_legado) and not (path_log and exists(path_log)):
+            self.importar_diretorios(path_legado)
+        if path_log:
+            if not exists(path_log):
+                escrever_registros(path_log, self._registros())
+            self.sincronizar_log()
+            # Sem conversão de fim de linha: o tamanho e o hash em ``meta`` são os dos bytes gravados
+            self._log = open(path_log, 'a', encoding='utf-8', newline='')
+
+    @staticmethod
+    def _agora() -> str:
+        return datetime.now().isoformat(timespec='seconds')
+
+    def _executar(self, sql: str, parametros: tuple = (), registro: Optional[Dict] = None) -> list:
+        with self._lock:
+            cursor = self._conexao.execute(sql, parametros)
+            linhas = cursor.fetchall()
+            if registro is not None and self._log is not None:
+                linha = json.dumps(registro, ensure_ascii=False) + '\n'
+                self._log.write(linha)
+                self._log.flush()
+                dados = linha.encode('utf-8')
+                self._hash_log.update(dados)
+                self._tamanho_log += len(dados)
+                self._gravar_estado_log()
+            self._conexao.commit()
+            return linhas
+
+    def _gravar_estado_log(self) -> None:
+        # Chamado com o lock adquirido; o commit é feito junto com a gravação dos dados
+        self._conexao.executemany('INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)', [
+            ('log_tamanho', str(self._tamanho_log)),
+            ('log_sha256', self._hash_log.hexdigest()),
+        ])
+
+    def _registros(self) -> Iterable[Dict[str, Optional[str]]]:
+        colunas = CAMPOS + CAMPOS_CONTROLE
+        with self._lock:
+            linhas = self._conexao.execute(f'SELECT {", ".join(colunas)} FROM empresas ORDER BY codigo').fetchall()
+        for linha in linhas:
+            yield {coluna: valor for coluna, valor in zip(colunas, linha) if valor is not None}
+
+    def _inserir_registros(self, registros: Iterable[Dict[str, Optional[str]]], substituir: bool = False) -> int:
+        colunas = CAMPOS + CAMPOS_CONTROLE
+        linhas = [tuple(registro.get(coluna) for coluna in colunas) for registro in registros]
+        with self._lock:
+            if substituir:
+                # Recriação a partir do log: os dados e o estado do log na mesma transação
+                self._conexao.execute('DELETE FROM empresas')
+                self._gravar_estado_log()
+            self._conexao.executemany(
+                f'''INSERT OR REPLACE INTO empresas ({', '.join(colunas)})
+                    VALUES ({', '.join('?' * len(colunas))})''', linhas)
+            self._conexao.commit()
+        return len(linhas)
+
+    def salvar_url(self, codigo: str, url: str, update: bool = False) -> bool:
+        """
+        Grava a URL de uma empresa.
+
+        :param codigo: Código da empresa.
+        :param url: URL da página da empresa.
+        :param update: Se True, sobrescreve a URL existente.
+        :return: True se a URL foi gravada, False se já existia.
+        """
+        if not update and self.get_url(codigo) is not None:
+            print(f'URL já existente: {codigo}')
+            return False
+        registro = {'codigo': codigo, 'url': url, 'atualizado_url': self._agora()}
+        self._executar(
+            '''INSERT INTO empresas (codigo, url, atualizado_url) VALUES (?, ?, ?)
+               ON CONFLICT(codigo) DO UPDATE SET url = excluded.url, atualizado_url = excluded.atualizado_url''',
+            tuple(registro.values()), registro)
+        print(f'URL salva: {codigo}')
+        return True
+
+    def get_url(self, codigo: str) -> Optional[str]:
+        """
+        Retorna a URL de uma empresa.
+
+        :param codigo: Código da empresa.
+        :return: URL salva, ou None se não existir.
+        """
+        linhas = self._executar('SELECT url FROM empresas WHERE codigo = ?', (codigo,))
+        return linhas[0][0] if linhas else None
+
+    def remover_url(self, codigo: str) -> None:
+        """
+        Remove a URL de uma empresa.
+
+        :param codigo: Código da empresa.
+        """
+        self._executar('UPDATE empresas SET url = NULL, atualizado_url = NULL WHERE codigo = ?', (codigo,),
+                       {'codigo': codigo, 'url': None, 'atualizado_url': None})
+
+    def salvar_infos(self, infos: List[str], update: bool = False) -> bool:
+        """
+        Grava as informações de uma empresa.
+
+        :param infos: Lista na ordem de ``CAMPOS`` (o primeiro item é o código).
+        :param update: Se True, sobrescreve as informações existentes.
+        :return: True se as informações foram gravadas, False se já existiam.
+        :raises ValueError: Se a lista não tiver a quantidade de campos esperada.
+        """
+        if len(infos) != len(CAMPOS):
+            raise ValueError(f'Quantidade de informações incorreta: {infos}')
+        codigo = infos[0]
+        if not update and self.get_infos(codigo) is not None:
+            print(f'Informações já existentes: {codigo}')
+            return False
+        registro = dict(zip(CAMPOS, infos), atualizado_infos=self._agora())
+        atribuicoes = ', '.join(f'{campo} = excluded.{campo}' for campo in CAMPOS[1:])
+        self._executar(
+            f'''INSERT INTO empresas ({', '.join(registro)})
+                VALUES ({', '.join('?' * len(registro))})
+                ON CONFLICT(codigo) DO UPDATE SET {atribuicoes}, atualizado_infos = excluded.atualizado_infos''',
+            tuple(registro.values()), registro)
+        print(f'Informações salvas: {codigo}')
+        return True
+
+    def get_infos(self, codigo: str) -> Optional[List[str]]:
+        """
+        Retorna as informações de uma empresa.
+
+        :param codigo: Código da empresa.
+        :return: Lista na ordem de ``CAMPOS``, ou None se ainda não extraídas.
+        """
+        linhas = self._executar(
+            f'SELECT {", ".join(CAMPOS)} FROM empresas WHERE codigo = ? AND atualizado_infos IS NOT NULL',
+            (codigo,))
+        return list(linhas[0]) if linhas else None
+
+    def remover_infos(self, codigo: str) -> None:
+        """
+        Remove as informações de uma empresa.
+
+        :param codigo: Código da empresa.
+        """
+        registro = dict.fromkeys(CAMPOS[1:] + ['atualizado_infos'])
+        self._executar(
+            f'''UPDATE empresas SET {', '.join(f'{campo} = NULL' for campo in registro)} WHERE codigo = ?''',
+            (codigo,), {'codigo': codigo, **registro})
+
+    def urls(self) -> Dict[str, str]:
+        """
+        Retorna as URLs de todas as empresas, em uma única consulta.
+
+        :return: Dicionário código -> URL.
+        """
+        return dict(self._executar('SELECT codigo, url FROM empresas WHERE url IS NOT NULL ORDER BY codigo'))
+
+    def codigos(self) -> List[str]:
+        """
+        Lista os códigos armazenados.
+
+        :return: Códigos em ordem alfabética.
+        """
+        return [linha[0] for linha in self._executar('SELECT codigo FROM empresas ORDER BY codigo')]
+
+    def codigos_pendentes(self, update: bool = False) -> List[str]:
+        """
+        Lista os códigos com URL cujas informações ainda não foram extraídas.
+
+        :param update: Se True, retorna todos os códigos com URL.
+        :return: Códigos em ordem alfabética.
+        """
+        filtro = '' if update else ' AND atualizado_infos IS NULL'
+        return [linha[0] for linha in self._executar(
+            f'SELECT codigo FROM empresas WHERE url IS NOT NULL{filtro} ORDER BY codigo')]
+
+    def ler_tabela(self) -> DataFrame:
+        """
+        Lê o catálogo completo em uma única consulta.
+
+        :return: DataFrame com as colunas de ``CAMPOS`` e ``CAMPOS_CONTROLE``, apenas das
+                 empresas com informações extraídas.
+        """
+        with self._lock:
+            return read_sql_query(
+                f'''SELECT {', '.join(CAMPOS + CAMPOS_CONTROLE)} FROM empresas
+                    WHERE atualizado_infos IS NOT NULL ORDER BY codigo''',
+                self._conexao)
+
+    def importar_log(self, path: str) -> int:
+        """
+        Importa um arquivo JSON Lines de empresas, lido em uma única passagem.
+
+        :param path: Caminho do arquivo ``.jsonl``.
+        :return: Quantidade de códigos importados.
+        """
+        total = self._inserir_registros(carregar_registros(path).values())
+        print(f'Códigos importados de {path}: {total}')
+        return total
+
+    def sincronizar_log(self) -> bool:
+        """
+        Recria o banco a partir do log se ele mudou desde a última importação ou gravação.
+
+        O log é lido uma vez para calcular o seu sha256; se o tamanho ou o hash forem diferentes
+        dos registrados em ``meta``, a tabela é substituída pelo conteúdo do log, em uma única
+        transação. As gravações locais também estão no log, então nada se perde.
+
+        :return: True se o banco foi recriado a partir do log.
+        """
+        with open(self.path_log, 'rb') as file:
+            conteudo = file.read()
+        self._hash_log = sha256(conteudo)
+        self._tamanho_log = len(conteudo)
+        with self._lock:
+            estado = dict(self._conexao.execute('SELECT chave, valor FROM meta'))
+        if estado == {'log_tamanho': str(self._tamanho_log), 'log_sha256': self._hash_log.hexdigest()}:
+            return False
+        total = self._inserir_registros(carregar_registros(self.path_log).values(), substituir=True)
+        print(f'Códigos importados de {self.path_log}: {total}')
+        return True
+
+    def importar_diretorios(self, path: str) -> int:
+        """
+        Importa as pastas por código do formato anterior, em uma única transação.
+
+        :param path: Pasta com uma subpasta por código.
+        :return: Quantidade de códigos importados.
+        """
+        agora = self._agora()
+        registros = []
+        for codigo in listdir(path):
+            registro = ler_registro_legado(join(path, codigo), codigo)
+            if registro is None:
+                continue
+            if 'url' in registro:
+                registro['atualizado_url'] = agora
+            if 'nome_do_pregao' in registro:
+                registro['atualizado_infos'] = agora
+            registros.append(registro)
+        total = self._inserir_registros(registros)
+        print(f'Códigos importados de {path}: {total}')
+        return total
+
+    def fechar(self) -> None:
+        """
+        Fecha a conexão com o banco e o log.
+        """
+        with self._lock:
+            self._conexao.close()
+            if self._log is not None:
+                self._log.close()
+
@@ -0,0 +1,74 @@
+from os import listdir, makedirs
+from os.path import join, exists
+from shutil import copyfile
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import config
+from armazenamento import ArmazenamentoEmpresas
+from registros import CAMPOS, carregar_registros, ler_tabela
+
+__python__ = 3.10
+
+
+def ler_infos_por_arquivo(path: str) -> list:
+    """
+    Leitura anterior: um ``open`` + ``eval`` por ``infos_<codigo>.txt``.
+
+    Mantida aqui apenas como referência de comparação.
+    """
+    lista = []
+    for codigo in listdir(path):
+        path_infos_codigo = join(path, codigo, f'infos_{codigo}.txt')
+        if exists(path_infos_codigo):
+            with open(path_infos_codigo, 'r', encoding='utf-8') as file:
+                lista.append(eval(file.read()))
+    return lista
+
+
+def gerar_diretorios(registros: dict, path: str) -> None:
+    """
+    Grava o catálogo no formato anterior (``<codigo>/url_<codigo>.txt`` e ``infos_<codigo>.txt``).
+
+    As pastas por código não são mais versionadas; são recriadas aqui, a partir do JSON Lines,
+    apenas para a comparação.
+    """
+    for codigo, registro in registros.items():
+        makedirs(join(path, codigo))
+        if registro.get('url'):
+            with open(join(path, codigo, f'url_{codigo}.txt'), 'w', encoding='utf-8') as file:
+                file.write(registro['url'])
+        if registro.get('atualizado_infos'):
+            with open(join(path, codigo, f'infos_{codigo}.txt'), 'w', encoding='utf-8') as file:
+                file.write(str([registro.get(campo) or '' for campo in CAMPOS]))
+
+
+def medir(nome: str, funcao, repeticoes: int = 5) -> float:
+    """
+    Executa a função ``repeticoes`` vezes e imprime o melhor tempo.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = perf_counter()
+        resultado = funcao()
+        tempos.append(perf_counter() - inicio)
+    melhor = min(tempos)
+    print(f'{nome:<45} {melhor * 1000:>9.1f} ms  ({len(resultado)} registros)')
+    return melhor
+
+
+if __name__ == '__main__':
+    with TemporaryDirectory() as tmp:
+        path_jsonl = join(tmp, 'empresas_listadas.jsonl')
+        copyfile(config.path_registros, path_jsonl)
+        path_legado = join(tmp, 'pastas')
+        gerar_diretorios(carregar_registros(path_jsonl), path_legado)
+        armazenamento = ArmazenamentoEmpresas(join(tmp, 'empresas_listadas.sqlite'), path_log=path_jsonl)
+
+        print('\nCarga do catálogo completo (melhor de 5):')
+        base = medir('Pastas por código (open + eval)', lambda: ler_infos_por_arquivo(path_legado))
+        jsonl = medir('JSON Lines (carregar_registros)', lambda: carregar_registros(path_jsonl))
+        tabela = medir('JSON Lines (ler_tabela -> DataFrame)', lambda: ler_tabela(path_jsonl))
+        banco = medir('SQLite (ArmazenamentoEmpresas.ler_tabela)', armazenamento.ler_tabela)
+        armazenamento.fechar()
+
+        print(f'\nGanho JSON Lines: {base / jsonl:.1f}x, SQLite: {base / banco:.1f}x')
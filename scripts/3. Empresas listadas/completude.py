@@ -0,0 +1,130 @@
+import json
+import re
+from os import replace
+from os.path import exists
+from typing import Dict, Iterable, List, Set
+from pandas import DataFrame
+from registros import CAMPOS
+
+__python__ = 3.10
+
+# Peso de cada campo na pontuação de completude (o código é a chave e sempre existe)
+PESOS_CAMPOS = {
+    'nome_do_pregao': 3,
+    'cnpj': 3,
+    'atividade_principal': 1,
+    'classificacao_setorial': 1,
+    'codigo_de_negociacao': 1,
+    'escriturador': 1,
+}
+
+# Campos sem os quais o registro é considerado parcial. Os demais podem faltar de fato
+# (empresas sem ações negociadas não têm código de negociação nem escriturador).
+CAMPOS_ESSENCIAIS = ['nome_do_pregao', 'cnpj']
+
+# Formato do CNPJ exibido na página. Outro valor no campo (ex.: a data gravada quando os campos
+# da página foram lidos deslocados) não conta como preenchido, e o registro volta para o reparo.
+PADRAO_CNPJ = r'^\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}$'
+
+
+class RegistroIncompleto(Exception):
+    """
+    A página foi lida, mas o registro ainda tem campos essenciais vazios (nova tentativa).
+    """
+
+
+def campos_preenchidos(tabela: DataFrame) -> DataFrame:
+    """
+    Indica, para cada registro e campo, se o valor está preenchido.
+
+    Valores nulos, vazios ou só com espaços contam como não preenchidos, assim como um CNPJ
+    fora de ``PADRAO_CNPJ``. A verificação é feita coluna a coluna (operações vetorizadas do
+    pandas), sem percorrer as linhas.
+
+    :param tabela: Registros com as colunas de ``CAMPOS``.
+    :return: DataFrame booleano com as colunas de ``PESOS_CAMPOS``.
+    """
+    valores = tabela[list(PESOS_CAMPOS)].fillna('').astype(str).apply(lambda coluna: coluna.str.strip())
+    preenchidos = valores != ''
+    preenchidos['cnpj'] = valores['cnpj'].str.match(PADRAO_CNPJ)
+    return preenchidos
+
+
+def pontuar_completude(tabela: DataFrame) -> DataFrame:
+    """
+    Pontua a completude de cada registro em uma única passagem vetorizada.
+
+    :param tabela: Registros com as colunas de ``CAMPOS``.
+    :return: DataFrame com as colunas ``codigo``, ``pontuacao`` (0 a 1, ponderada por
+             ``PESOS_CAMPOS``), ``campos_vazios``, ``essenciais_vazios`` e ``incompleto``
+             (algum campo de ``CAMPOS_ESSENCIAIS`` vazio).
+    """
+    preenchidos = campos_preenchidos(tabela)
+    pesos = list(PESOS_CAMPOS.values())
+    essenciais_vazios = (~preenchidos[CAMPOS_ESSENCIAIS]).sum(axis=1)
+    return DataFrame({
+        'codigo': tabela['codigo'],
+        'pontuacao': preenchidos.mul(pesos).sum(axis=1) / sum(pesos),
+        'campos_vazios': (~preenchidos).sum(axis=1),
+        'essenciais_vazios': essenciais_vazios,
+        'incompleto': essenciais_vazios > 0,
+    })
+
+
+def fila_reextracao(tabela: DataFrame, ignorar: Iterable[str] = ()) -> List[str]:
+    """
+    Códigos dos registros parciais, em ordem de prioridade para uma nova extração.
+
+    Vêm primeiro os registros com mais campos essenciais vazios e, entre eles, os de menor
+    pontuação (os registros só com o código antes dos que têm apenas o CNPJ).
+
+    :param tabela: Registros com as colunas de ``CAMPOS``.
+    :param ignorar: Códigos que não devem entrar na fila (ex.: confirmados vazios na fonte,
+                    ver ``ler_incompletos_confirmados``).
+    :return: Códigos a extrair novamente.
+    """
+    pontuacao = pontuar_completude(tabela)
+    pontuacao = pontuacao[pontuacao['incompleto'] & ~pontuacao['codigo'].isin(set(ignorar))]
+    incompletos = pontuacao.sort_values(
+        ['essenciais_vazios', 'pontuacao', 'codigo'], ascending=[False, True, True])
+    return incompletos['codigo'].tolist()
+
+
+def registro_completo(infos: List[str]) -> bool:
+    """
+    Verifica se um registro recém-extraído tem todos os campos essenciais.
+
+    :param infos: Registro na ordem de ``CAMPOS``.
+    :return: True se nenhum campo de ``CAMPOS_ESSENCIAIS`` estiver vazio e o CNPJ estiver no
+             formato de ``PADRAO_CNPJ``.
+    """
+    registro: Dict[str, str] = {campo: (valor or '').strip() for campo, valor in zip(CAMPOS, infos)}
+    return (all(registro.get(campo) for campo in CAMPOS_ESSENCIAIS)
+            and re.match(PADRAO_CNPJ, registro['cnpj']) is not None)
+
+
+def ler_incompletos_confirmados(path: str) -> Set[str]:
+    """
+    Códigos cujo registro incompleto foi confirmado na fonte (a API não traz os campos).
+
+    :param path: Caminho do arquivo JSON (lista de códigos).
+    :return: Códigos confirmados (vazio se o arquivo não existir).
+    """
+    if not exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as file:
+        return set(json.load(file))
+
+
+def gravar_incompletos_confirmados(path: str, codigos: Iterable[str]) -> None:
+    """
+    Grava os códigos confirmados vazios na fonte (gravação atômica, em ordem alfabética).
+
+    :param path: Caminho do arquivo JSON.
+    :param codigos: Códigos confirmados.
+    """
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as file:
+        json.dump(sorted(codigos), file, ensure_ascii=False, indent=0)
+        file.write('\n')
+    replace(tmp, path)
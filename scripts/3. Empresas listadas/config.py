@@ -1,21 +1,94 @@
 from os.path import join, dirname, abspath
-from selenium.webdriver.chrome.options import Options
+import sys
 
 base_dir = dirname(dirname(dirname(abspath(__file__))))
 
+# Permite importar o pacote compartilhado `scripts/comum` e o pacote `b3_dados` (raiz do repositório)
+sys.path.append(dirname(dirname(abspath(__file__))))
+sys.path.append(dirname(dirname(dirname(abspath(__file__)))))
+
+from comum.navegador import opcoes_chrome
+
 # Caminhos para os diretórios de dados extraídos e processados
 path_extracted_data = join(base_dir, 'extracted_data', '3. Empresas listadas')
 path_processed_data = join(base_dir, 'processed_data', '3. Empresas listadas')
 
+# Banco SQLite com a URL, as informações e a data de coleta de cada empresa.
+# Quando o banco e o log JSON Lines não existem, as pastas por código do formato anterior
+# (em `path_extracted_data`, se ainda existirem localmente) são importadas para ele.
+path_banco = join(base_dir, 'extracted_data', 'empresas_listadas.sqlite')
+
+# Log JSON Lines com todas as gravações do banco (versionado; o banco é recriado a partir dele)
+path_registros = join(base_dir, 'extracted_data', 'empresas_listadas.jsonl')
+
 # URL da página de listagem de empresas na B3
 url = 'https://sistemaswebb3-listados.b3.com.br/listedCompaniesPage/search?language=pt-br'
 
-# Configurações do Selenium para o navegador Chrome
-options = Options()
-options.add_argument("--start-maximized")  # Inicia o navegador em modo maximizado
-options.add_argument("--disable-infobars")  # Desabilita a barra de informações
-options.add_argument("--disable-extensions")  # Desabilita as extensões do navegador
-options.add_argument("--incognito")  # Inicia o navegador em modo de navegação anônima
-options.add_argument("--disable-gpu")  # Desabilita a aceleração de GPU (útil em ambientes sem interface gráfica)
-options.add_argument("--no-sandbox")  # Desabilita o sandboxing (necessário em alguns ambientes)
-options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.93 Safari/537.36")  # Define o user agent
\ No newline at end of file
+# Endereço base dos sistemas de listados da B3 (pode apontar para um servidor local de testes)
+url_listados = 'https://sistemaswebb3-listados.b3.com.br'
+
+# Modo de extração das URLs e das informações das empresas: 'api' (JSON, sem navegador), 'selenium'
+# (leitura do DOM) ou 'captura' (navegador, com o JSON das respostas capturado pelo DevTools)
+MODO_EXTRACAO = 'api'
+
+# Quantidade de empresas por página nas chamadas à API de listagem
+TAMANHO_PAGINA_API = 120
+
+# Quantidade de trabalhadores (navegadores) na extração das informações das empresas
+N_TRABALHADORES = 4
+
+# Quantidade máxima de navegadores abertos no pool compartilhado pelas extrações
+TAMANHO_POOL_NAVEGADORES = N_TRABALHADORES
+
+# Tempo limite, em segundos, das esperas do Selenium (carregamento, troca de página, download)
+TIMEOUT_PAGINA = 30
+
+# Tempo, em segundos, sem novas requisições da página para considerá-la carregada
+OCIOSIDADE_REDE = 0.5
+
+# Tempo máximo, em segundos, aguardando o site responder antes de reiniciar após uma falha
+TIMEOUT_REINICIO = 40
+
+# Reinícios da navegação da listagem após falhas consecutivas, com espera exponencial entre eles
+MAX_REINICIOS = 10
+ESPERA_REINICIO_INICIAL = 2.0
+ESPERA_REINICIO_MAXIMA = 120.0
+
+# Falhas em uma mesma posição da listagem (página e item) antes de ignorá-la
+TENTATIVAS_POR_ITEM = 3
+
+# Após a extração, extrai novamente os registros sem nome do pregão ou CNPJ (ver `completude.py`)
+REPARAR_INCOMPLETOS = False
+
+# Pasta com respostas gravadas da API de detalhes das empresas (usada para testes sem rede)
+path_fixtures_api = join(base_dir, 'extracted_data', 'fixtures_api_empresas_listadas')
+
+# Uso das respostas gravadas no modo 'api': None (somente rede), 'gravar' (rede + grava em
+# `path_fixtures_api`) ou 'reproduzir' (sem rede, a partir de `path_fixtures_api`)
+MODO_FIXTURES = None
+
+# Respostas JSON da listagem capturadas no modo 'captura' (uma por página; os detalhes das
+# empresas são gravados em `path_fixtures_api`, no formato lido pelo modo 'api')
+path_captura_listagem = join(base_dir, 'extracted_data', 'captura_listagem_empresas_listadas')
+
+# Checkpoint da navegação da listagem (página e item atuais, códigos concluídos e falhas)
+path_checkpoint_urls = join(base_dir, 'extracted_data', 'checkpoint_empresas_listadas_urls.json')
+
+# Checkpoint da extração das informações (fora da pasta das empresas, que é listada código a código)
+path_checkpoint_informacoes = join(base_dir, 'extracted_data', 'checkpoint_empresas_listadas_informacoes.json')
+
+# Checkpoint da nova extração dos registros incompletos
+path_checkpoint_reparo = join(base_dir, 'extracted_data', 'checkpoint_empresas_listadas_reparo.json')
+
+# Códigos cujo registro continua incompleto na própria API (modo 'api'): o reparo não os repete.
+# Apague o arquivo para verificá-los de novo.
+path_incompletos_confirmados = join(base_dir, 'extracted_data', 'empresas_listadas_incompletos_confirmados.json')
+
+# Executa os navegadores sem janela
+HEADLESS = True
+
+# Configurações do Selenium para o navegador Chrome (argumentos em `comum.navegador.ARGUMENTOS_PADRAO`)
+options = opcoes_chrome(headless=HEADLESS)
+
+# Opções do modo 'captura' (com o log de eventos de rede do DevTools)
+options_captura = opcoes_chrome(headless=HEADLESS, captura_rede=True)
@@ -1,21 +1,59 @@
 
 import config
-from os import listdir, remove
+import json
+import re
+from os import makedirs
 from os.path import join, exists
-from time import sleep
+from threading import Lock
+from typing import Dict, List, Optional
+import requests
+from armazenamento import ArmazenamentoEmpresas
+from completude import (RegistroIncompleto, fila_reextracao, gravar_incompletos_confirmados,
+                        ler_incompletos_confirmados, pontuar_completude, registro_completo)
+from b3_dados.http import criar_sessao
+from comum.checkpoint import Checkpoint
+from comum.coleta_dom import coletar_xpaths
+from comum.esperas import HistogramaLatencias, aguardar
+from comum.captura_rede import CapturaRede
+from comum.listados import codificar_parametros, decodificar_parametros
+from comum.fila_trabalho import PoolTrabalhadores, ErroPermanente
+from comum.navegador import PoolNavegadores, obter_pool
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    WebDriverException,
-)
+
+# Seção da página da empresa com os campos extraídos
+XPATH_SECAO = '//*[@id="divContainerIframeB3"]/app-companies-overview'
+
+# Rótulo de cada campo da seção, na ordem de CAMPOS (sem o código), e o caminho do valor a partir
+# do parágrafo seguinte ao rótulo. Os campos são localizados pelo texto do rótulo, e não pela
+# posição: nas empresas com código de negociação há um bloco a mais na seção (com uma data) antes
+# do CNPJ, e os XPaths posicionais liam a data como CNPJ e o CNPJ como atividade principal.
+ROTULOS_CAMPOS = {
+    'nome_do_pregao': ('Preg', ''),
+    'codigo_de_negociacao': ('Negocia', '/a'),
+    'cnpj': ('CNPJ', ''),
+    'atividade_principal': ('Atividade', ''),
+    'classificacao_setorial': ('Classifica', ''),
+    'escriturador': ('Escriturador', '/span[1]'),
+}
+
+
+def xpath_campo(rotulo: str, caminho_valor: str = '') -> str:
+    """
+    XPath do valor de um campo da seção ``app-companies-overview``.
+
+    O rótulo é o primeiro parágrafo da seção cujo texto contém ``rotulo``; o valor é o parágrafo
+    seguinte, no mesmo bloco.
+
+    :param rotulo: Trecho do texto do rótulo (sem acentos, para não depender da grafia exata).
+    :param caminho_valor: Caminho relativo ao parágrafo do valor (ex.: ``'/a'``).
+    :return: XPath do elemento com o valor.
+    """
+    return f"({XPATH_SECAO}//p[contains(normalize-space(.), '{rotulo}')])[1]/following-sibling::p[1]{caminho_valor}"
+
+
+# XPath de cada campo da seção app-companies-overview, na ordem de CAMPOS (sem o código)
+XPATHS_CAMPOS = {campo: xpath_campo(*rotulo) for campo, rotulo in ROTULOS_CAMPOS.items()}
 
 class Extract:
     """
@@ -23,177 +61,524 @@ class Extract:
 
     Esta classe utiliza Selenium para acessar páginas da B3, coletando informações relevantes de empresas
     listadas, como nome do pregão, código de negociação, CNPJ, atividade principal, classificação setorial e
-    escriturador. Os dados extraídos são salvos em arquivos de texto em um diretório especificado.
+    escriturador. Os dados extraídos são gravados no armazenamento único das empresas listadas.
+
+    A extração é distribuída entre vários navegadores, alimentados por uma fila compartilhada
+    de códigos, e registrada em um checkpoint para que uma interrupção não obrigue a
+    repetir os códigos já concluídos. Os navegadores vêm do pool compartilhado do processo:
+    são iniciados em paralelo antes da extração, devolvidos ao pool ao final e substituídos
+    apenas quando um trabalhador falha.
 
     Attributes:
-        path_extracted_data (str): Caminho para o diretório onde os dados extraídos serão armazenados.
+        armazenamento (ArmazenamentoEmpresas): Armazenamento de onde as URLs são lidas e onde as informações são gravadas.
+        path_checkpoint (str): Caminho do arquivo de checkpoint da extração.
+        latencias (HistogramaLatencias): Duração de cada etapa (carregar a página, ler os campos).
+        pool (PoolNavegadores): Pool de onde os navegadores dos trabalhadores são emprestados.
+        resposta_deterministica (bool): Se uma nova extração do mesmo código traz sempre o mesmo
+            registro (modo 'api'). Nesse caso, um registro incompleto não é repetido no reparo.
 
     Methods:
         ``get_urls(codigo: str) -> str``:
-            Obtém a URL correspondente a um código de empresa a partir de um arquivo.
+            Obtém a URL correspondente a um código de empresa no armazenamento.
+
+        ``check_infos() -> List[str]``:
+            Verifica a integridade dos dados extraídos e lista as empresas pendentes.
+
+        ``criar_recurso() -> webdriver.Chrome``:
+            Empresta um navegador do pool para um trabalhador.
+
+        ``fechar_recurso(driver: webdriver.Chrome) -> None``:
+            Devolve o navegador de um trabalhador ao pool.
 
-        ``get_element_xpath(driver: webdriver.Chrome, nome: str, xpath: str) -> str``:
-            Extrai o texto de um elemento HTML com base no seu XPath.
+        ``aquecer(n_trabalhadores: int) -> None``:
+            Inicia os navegadores dos trabalhadores em paralelo.
 
-        ``save_data(path: str, dados, update: bool = False)``:
-            Salva os dados extraídos em um arquivo, com opção de atualização.
+        ``descartar_recurso(driver: webdriver.Chrome) -> None``:
+            Encerra o navegador de um trabalhador que falhou.
 
-        ``check_infos()``:
-            Verifica a integridade dos dados extraídos, removendo arquivos inválidos.
+        ``extrair_infos(driver: webdriver.Chrome, codigo: str, update: bool = False) -> list``:
+            Extrai e salva as informações de uma empresa.
 
-        ``run(update: bool = False)``:
+        ``run(update: bool = False, n_trabalhadores: int = config.N_TRABALHADORES)``:
             Executa o processo de extração de dados das URLs das empresas listadas.
+
+        ``reparar(n_trabalhadores: int = config.N_TRABALHADORES, path_checkpoint: str = ..., path_confirmados: str = ...) -> List[str]``:
+            Extrai novamente apenas os registros parciais, em ordem de prioridade.
+
+        ``executar_fila(codigos: List[str], processar, path_checkpoint: str, n_trabalhadores: int) -> Dict``:
+            Processa os códigos com o pool de trabalhadores e um checkpoint.
     """
     
-    def __init__(self, path_extracted_data: str):
-        self.path_extracted_data = path_extracted_data
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, path_checkpoint: str = config.path_checkpoint_informacoes,
+                 pool: PoolNavegadores = None):
+        self.armazenamento = armazenamento
+        self.path_checkpoint = path_checkpoint
+        self.latencias = HistogramaLatencias()
+        self.pool = pool or obter_pool('empresas', config.TAMANHO_POOL_NAVEGADORES, config.options)
+        self.resposta_deterministica = False
     
     def get_urls(self, codigo: str) -> str:
-        try:
-            path_dir_page = join(self.path_extracted_data, codigo, f'url_{codigo}.txt')
-            with open(path_dir_page, 'r', encoding='utf-8') as file:
-                file = file.read()
-                if codigo in file:
-                    print(f"Sucesso ao abrir o arquivo: '{codigo}'.")
-                    return file
-        except OSError as e:
-            print(f'Erro ao acessar arquivos em {path_dir_page}: {e}')
+        url = self.armazenamento.get_url(codigo)
+        if url is not None and codigo in url:
+            print(f"Sucesso ao obter a URL: '{codigo}'.")
+            return url
+        print(f'URL não encontrada para o código: {codigo}')
             
 
-    def get_element_xpath(self, driver: webdriver.Chrome, nome: str, xpath: str) -> str:
+    def check_infos(self) -> List[str]:
         """
-        Obtém o texto de um elemento da página usando seu XPath.
+        Verifica a integridade dos dados extraídos.
 
-        Esta função espera até que o elemento esteja presente na página e retorna seu texto.
+        A quantidade de campos de cada registro já é validada na gravação; aqui o catálogo
+        é lido em uma única consulta para listar as empresas com URL ainda sem informações
+        e contar os registros parciais (sem nome do pregão ou CNPJ, ver ``completude.py``).
 
-        :param driver: Instância do webdriver utilizada para a navegação.
-        :param nome: Nome do elemento, utilizado para mensagens de log.
-        :param xpath: XPath do elemento a ser localizado.
-        :return: O texto do elemento se encontrado; caso contrário, uma string vazia.
+        :return: Códigos com URL cujas informações ainda não foram extraídas.
         """
-        try:
-            elemento = WebDriverWait(driver, 0.1).until(
-                EC.presence_of_element_located((By.XPATH, xpath))
-            )
-            return elemento.text
-        except NoSuchElementException:
-            print(f"Erro: O elemento '{nome}' não foi encontrado.")
-            return ""
-        except WebDriverException as e:
-            print(f"Erro ao interagir com o WebDriver '{nome}'")
-            return ""
-        
-    def save_data(self, path: str, dados, update: bool = False):
+        tabela = self.armazenamento.ler_tabela()
+        pendentes = self.armazenamento.codigos_pendentes()
+        for codigo in pendentes:
+            print(f'Informações ausentes: {codigo}')
+        incompletos = int(pontuar_completude(tabela)['incompleto'].sum())
+        print(f'Empresas com informações: {len(tabela)}, Sem informações: {len(pendentes)}, '
+              f'Incompletas: {incompletos}')
+        return pendentes
+
+    def criar_recurso(self) -> webdriver.Chrome:
         """
-        Salva dados em um arquivo, se não existir ou se a atualização for permitida.
+        Empresta um navegador do pool para um trabalhador.
 
-        Esta função grava os dados fornecidos no caminho especificado. Se o arquivo já existir,
-        a gravação só ocorre se o parâmetro `update` for definido como True.
+        :return: Instância do Chrome configurada com ``config.options``.
+        """
+        with self.latencias.medir('retirar navegador'):
+            return self.pool.retirar()
+
+    def fechar_recurso(self, driver: webdriver.Chrome) -> None:
+        """
+        Devolve o navegador de um trabalhador ao pool (ele continua aberto para o próximo uso).
+
+        :param driver: Navegador a ser devolvido.
+        """
+        self.pool.devolver(driver)
+
+    def aquecer(self, n_trabalhadores: int) -> None:
+        """
+        Inicia em paralelo, antes da extração, os navegadores que os trabalhadores vão usar.
 
-        :param path: Caminho do arquivo onde os dados serão salvos.
-        :param dados: Dados a serem salvos no arquivo.
+        Trabalhadores além do tamanho do pool aguardam a devolução de um navegador.
+
+        :param n_trabalhadores: Quantidade de trabalhadores em paralelo.
+        """
+        with self.latencias.medir('aquecer navegadores'):
+            self.pool.aquecer(min(n_trabalhadores, self.pool.tamanho))
+
+    def descartar_recurso(self, driver: webdriver.Chrome) -> None:
+        """
+        Encerra o navegador de um trabalhador que falhou; o pool cria outro na próxima retirada.
+
+        :param driver: Navegador a ser descartado.
+        """
+        self.pool.devolver(driver, falhou=True)
+
+    def extrair_infos(self, driver: webdriver.Chrome, codigo: str, update: bool = False) -> list:
+        """
+        Extrai e salva as informações de uma empresa.
+
+        Todos os campos são lidos por um único script no navegador (``XPATHS_CAMPOS``), em vez
+        de uma chamada ao WebDriver por campo.
+
+        :param driver: Navegador do trabalhador.
+        :param codigo: Código da empresa.
         :param update: Indica se o arquivo existente deve ser atualizado.
+        :return: Lista com as informações extraídas.
+        :raises ErroPermanente: Se a URL da empresa não estiver disponível.
+        :raises WebDriverException: Se a página não puder ser carregada (o pool tenta novamente).
+        :raises TempoEsgotado: Se o nome do pregão não aparecer dentro de ``config.TIMEOUT_PAGINA``.
         """
-        if not exists(path) or update:
-            try:
-                with open(path, 'w', encoding='utf-8') as file:
-                    file.write(str(dados))
-                print(f"Informações salvas em: {path}")
-            except OSError as e:
-                print(f'Erro ao salvar o arquivo: {e}')
-        else:
-            print(f'O arquivo já existe: {path}')
-    
-    def check_infos(self):
-        for i, codigo in enumerate(listdir(self.path_extracted_data)):
-            path_info = join(self.path_extracted_data, codigo, f'infos_{codigo}.txt')
-            with open(path_info, 'r', encoding='utf-8') as file:
-                file = file.read()
-            if not codigo in file:
-                print(f'Informações incorretas: {codigo}, N° {i}')
-                print(f'Arquivo deletado: {path_info}.')
-                remove(path_info)
-            else:
-                print(f'Código: {codigo}, Status: OK, N° {i}')
-            
-            if len(eval(file)) != 7:
-                print(f'Quantidade de informações incorretas: {codigo}, N° {i}')
-                print(f'Arquivo deletado: {path_info}.')
-                remove(path_info)
+        url = self.get_urls(codigo)
+        if url is None:
+            raise ErroPermanente(f'URL não encontrada para o código {codigo}')
+
+        with self.latencias.medir('carregar empresa'):
+            driver.get(url)
+
+        # A seção é preenchida pelo Angular depois do carregamento do documento: o script que lê
+        # todos os campos é repetido até o nome do pregão aparecer (uma chamada por verificação)
+        def campos_preenchidos() -> Optional[Dict[str, Optional[str]]]:
+            campos = coletar_xpaths(driver, XPATHS_CAMPOS, latencias=self.latencias, etapa='coletar campos')
+            return campos if campos['nome_do_pregao'] else None
+
+        with self.latencias.medir('aguardar campos'):
+            campos = aguardar(campos_preenchidos, config.TIMEOUT_PAGINA, descricao=f'campos da empresa {codigo}')
+
+        infos = [codigo] + [campos[campo] or '' for campo in XPATHS_CAMPOS]
+        
+        self.armazenamento.salvar_infos(infos, update)
 
-    def run(self, update=False):
+        print(infos)
+        return infos
+
+    def run(self, update: bool = False, n_trabalhadores: int = config.N_TRABALHADORES):
         """
         Executa o processo de extração de dados das URLs.
 
-        Esta função percorre todas as páginas disponíveis, obtém as URLs correspondentes,
-        e extrai informações relevantes de cada uma delas usando um navegador controlado pelo Selenium.
+        Os códigos pendentes são colocados em uma fila consumida por ``n_trabalhadores``
+        trabalhadores, cada um com o seu recurso (navegador ou sessão HTTP). Cada trabalhador
+        repete os códigos que falharem com espera exponencial e recria o seu recurso após cada erro. Os códigos concluídos ficam registrados no
+        checkpoint; se o processo for interrompido, a próxima execução continua de onde parou.
+        O checkpoint é apagado quando não restam falhas (códigos sem URL ou sem fixture não contam
+        como falha: são ignorados, sem novas tentativas).
+
+        :param update: Indica se as informações já extraídas devem ser atualizadas.
+        :param n_trabalhadores: Quantidade de trabalhadores em paralelo.
+        """
+        codigos = self.armazenamento.codigos_pendentes(update)
+        print(f'Códigos pendentes: {len(codigos)}')
+        try:
+            self.executar_fila(codigos, lambda recurso, codigo: self.extrair_infos(recurso, codigo, update),
+                               self.path_checkpoint, n_trabalhadores)
+        finally:
+            self.latencias.imprimir()
+            self.check_infos()
+
+    def reparar(self, n_trabalhadores: int = config.N_TRABALHADORES,
+                path_checkpoint: str = config.path_checkpoint_reparo,
+                path_confirmados: str = config.path_incompletos_confirmados) -> List[str]:
         """
+        Extrai novamente apenas os registros parciais.
 
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=config.options)
+        Os registros sem nome do pregão ou CNPJ são encontrados em uma única passagem sobre o
+        catálogo (``completude.fila_reextracao``) e enfileirados por prioridade: primeiro os que
+        não têm nenhum dos dois. Com o navegador, um registro que continua incompleto após a
+        extração conta como falha (a página pode não ter terminado de carregar), e o trabalhador
+        tenta de novo com espera exponencial e um navegador novo. Quando a resposta é
+        determinística (``resposta_deterministica``, modo 'api'), repetir não muda o resultado:
+        o registro é um erro permanente, e o código é gravado em ``path_confirmados`` para
+        não voltar à fila nos próximos reparos. Os códigos concluídos ficam em um checkpoint
+        próprio.
 
-        try:
+        :param n_trabalhadores: Quantidade de trabalhadores em paralelo.
+        :param path_checkpoint: Caminho do checkpoint do reparo.
+        :param path_confirmados: Caminho da lista de códigos confirmados vazios na fonte.
+        :return: Códigos que continuam incompletos.
+        """
+        confirmados = ler_incompletos_confirmados(path_confirmados)
+        codigos = fila_reextracao(self.armazenamento.ler_tabela(), ignorar=confirmados)
+        print(f'Registros incompletos: {len(codigos)} (confirmados vazios na fonte, ignorados: {len(confirmados)})')
+        novos_confirmados = set()
+        lock = Lock()
 
-            for i, codigo in enumerate(listdir(self.path_extracted_data)):
-                print(f'Código: {codigo}, N° {i}')
-                url = self.get_urls(codigo)
-                path_save = join(self.path_extracted_data, codigo, f'infos_{codigo}.txt')
-                
-                if not exists(path_save) or update:
-                    try:
-
-                        driver.get(url) 
-                                
-                        nome_do_pregao = self.get_element_xpath(
-                            driver, 'Nome do Pregão', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[1]/div/div/p[2]'
-                            )
-                        
-                        codigo_de_negociacao = self.get_element_xpath(
-                            driver, 'Código de Negociação', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[1]/div/div/p[4]/a'
-                            )
-                        
-                        cnpj = self.get_element_xpath(
-                            driver, 'CNPJ', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[1]/div/div/div[2]/p[2]'
-                            )
-                        atividade_principal = self.get_element_xpath(
-                            driver, 'Atividade Principal', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[1]/div/div/div[3]/p[2]'
-                            )
-                        
-                        classificacao_setorial = self.get_element_xpath(
-                            driver, 'Classificação Setorial', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[1]/div/div/div[4]/p[2]'
-                            )
-                        
-                        escriturador = self.get_element_xpath(
-                            driver, 'Escriturador', 
-                            '//*[@id="divContainerIframeB3"]/app-companies-overview/div/div[2]/div/div/p[2]/span[1]'
-                            )
-                        
-                        infos = [codigo, nome_do_pregao, codigo_de_negociacao, cnpj, atividade_principal, 
-                                classificacao_setorial, escriturador]
-                        
-                        self.save_data(path_save, infos, update)
-
-                        print(infos)
-                            
-                    except WebDriverException as e:
-                        print(f"Erro ao acessar a URL {url} ou extrair dados: {e}")
-                    except Exception as e:
-                        driver.quit()
-                        print(f"Erro ao processar as páginas: {e}")
-                        print("Tentando reiniciar o processo...")
-                        sleep(20)
-                        self.run(update=False)
+        def reextrair(recurso, codigo: str) -> None:
+            infos = self.extrair_infos(recurso, codigo, update=True)
+            if registro_completo(infos):
+                return
+            if self.resposta_deterministica:
+                with lock:
+                    novos_confirmados.add(codigo)
+                raise ErroPermanente(f'{codigo}: a fonte não traz nome do pregão ou CNPJ')
+            raise RegistroIncompleto(f'{codigo} continua sem nome do pregão ou CNPJ')
 
+        try:
+            resultado = self.executar_fila(codigos, reextrair, path_checkpoint, n_trabalhadores)
         finally:
+            self.latencias.imprimir()
             self.check_infos()
-            driver.quit() 
+            if novos_confirmados:
+                gravar_incompletos_confirmados(path_confirmados, confirmados | novos_confirmados)
+                print(f'Confirmados vazios na fonte: {len(novos_confirmados)} (gravados em {path_confirmados})')
+        return resultado['falhas'] + resultado['permanentes']
+
+    def executar_fila(self, codigos: List[str], processar, path_checkpoint: str,
+                      n_trabalhadores: int) -> Dict[str, List[str]]:
+        """
+        Processa os códigos, na ordem da lista, com o pool de trabalhadores e um checkpoint.
+
+        :param codigos: Códigos a processar, em ordem de prioridade.
+        :param processar: Função ``processar(recurso, codigo)``; exceções indicam falha.
+        :param path_checkpoint: Caminho do checkpoint.
+        :param n_trabalhadores: Quantidade de trabalhadores em paralelo.
+        :return: Códigos concluídos, com falha, com erro permanente e ignorados (já concluídos
+                 no checkpoint). O checkpoint é apagado quando não há falhas, mesmo que haja
+                 erros permanentes.
+        """
+        if codigos:
+            self.aquecer(n_trabalhadores)
+
+        checkpoint = Checkpoint(path_checkpoint)
+        pool = PoolTrabalhadores(
+            processar,
+            n_trabalhadores=n_trabalhadores,
+            criar_recurso=self.criar_recurso,
+            fechar_recurso=self.fechar_recurso,
+            descartar_recurso=self.descartar_recurso,
+            checkpoint=checkpoint,
+        )
+        resultado = pool.executar(codigos)
+        print(f"Concluídos: {len(resultado['concluidos'])}, Falhas: {len(resultado['falhas'])}, "
+              f"Ignorados (erro permanente): {len(resultado['permanentes'])}, "
+              f"Já concluídos no checkpoint: {len(resultado['ignorados'])}")
+        # Erros permanentes (ex.: código sem URL) não se resolvem com uma nova execução
+        if not resultado['falhas']:
+            checkpoint.limpar()
+        return resultado
+
+
+class ExtractAPI(Extract):
+    """
+    Extrai as informações das empresas pela API JSON da B3, sem navegador.
+
+    A seção ``app-companies-overview`` da página da empresa é preenchida pelo endpoint
+    ``listedCompaniesProxy/CompanyCall/GetDetail``, que recebe o código CVM em base64.
+    Esta classe chama o endpoint diretamente (uma sessão HTTP por trabalhador do pool)
+    e preenche o mesmo registro de sete campos gravado pelo modo Selenium.
+
+    Para testes sem rede, as respostas podem ser gravadas em uma pasta de fixtures
+    (``modo_fixtures='gravar'``) e depois reproduzidas (``modo_fixtures='reproduzir'``).
+
+    Attributes:
+        url_base (str): Endereço base dos sistemas de listados da B3.
+        timeout (float): Tempo limite de cada requisição, em segundos.
+        path_fixtures (str): Pasta das respostas gravadas.
+        modo_fixtures (str): None, 'gravar' ou 'reproduzir'.
+
+    Methods:
+        ``criar_recurso() -> requests.Session``:
+            Cria a sessão HTTP de um trabalhador.
+
+        ``get_codigo_cvm(codigo: str) -> str``:
+            Obtém o código CVM da empresa a partir da URL salva.
+
+        ``get_detalhe(session: requests.Session, codigo_cvm: str) -> Dict``:
+            Obtém o JSON de detalhes da empresa (da API ou das fixtures).
+
+        ``montar_infos(codigo: str, detalhe: Dict) -> list``:
+            Converte o JSON de detalhes no registro de sete campos.
+
+        ``extrair_infos(session: requests.Session, codigo: str, update: bool = False) -> list``:
+            Extrai e salva as informações de uma empresa.
+    """
+
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, path_checkpoint: str = config.path_checkpoint_informacoes,
+                 url_base: str = config.url_listados, timeout: float = 30,
+                 path_fixtures: str = config.path_fixtures_api, modo_fixtures: Optional[str] = None):
+        """
+        Inicializa a classe ExtractAPI.
+
+        :param armazenamento: Armazenamento das empresas listadas.
+        :param path_checkpoint: Caminho do arquivo de checkpoint da extração.
+        :param url_base: Endereço base da API (permite apontar para um servidor local de testes).
+        :param timeout: Tempo limite de cada requisição, em segundos.
+        :param path_fixtures: Pasta das respostas gravadas.
+        :param modo_fixtures: None (somente rede), 'gravar' (rede + grava) ou 'reproduzir' (sem rede).
+        """
+        super().__init__(armazenamento, path_checkpoint)
+        if modo_fixtures not in (None, 'gravar', 'reproduzir'):
+            raise ValueError(f'Modo de fixtures inválido: {modo_fixtures}')
+        self.url_base = url_base.rstrip('/')
+        self.timeout = timeout
+        self.path_fixtures = path_fixtures
+        self.modo_fixtures = modo_fixtures
+        # O JSON de GetDetail é o mesmo a cada chamada: um campo vazio não aparece repetindo
+        self.resposta_deterministica = True
+
+    def criar_recurso(self) -> requests.Session:
+        """
+        Cria a sessão HTTP de um trabalhador (no lugar do navegador).
+
+        :return: Sessão com conexão persistente.
+        """
+        return criar_sessao(max_conexoes=1)
+
+    def fechar_recurso(self, session: requests.Session) -> None:
+        """
+        Encerra a sessão HTTP de um trabalhador.
+
+        :param session: Sessão a ser encerrada.
+        """
+        session.close()
+
+    def descartar_recurso(self, session: requests.Session) -> None:
+        """
+        Encerra a sessão HTTP de um trabalhador que falhou.
+
+        :param session: Sessão a ser encerrada.
+        """
+        session.close()
+
+    def aquecer(self, n_trabalhadores: int) -> None:
+        """
+        Nada a iniciar antecipadamente: as sessões HTTP são criadas pelos trabalhadores.
+
+        :param n_trabalhadores: Quantidade de trabalhadores em paralelo.
+        """
+
+    def get_codigo_cvm(self, codigo: str) -> str:
+        """
+        Obtém o código CVM da empresa a partir da URL salva.
+
+        :param codigo: Código da empresa.
+        :return: Código CVM (ex.: '23264' em ``.../main/23264/ABEV/overview``).
+        :raises ErroPermanente: Se a URL não existir ou não tiver o código CVM.
+        """
+        url = self.get_urls(codigo)
+        resultado = re.search(r'/main/(\d+)/', url or '')
+        if resultado is None:
+            raise ErroPermanente(f'Código CVM não encontrado para o código {codigo}')
+        return resultado.group(1)
+
+    def get_detalhe(self, session: requests.Session, codigo_cvm: str) -> Dict:
+        """
+        Obtém o JSON de detalhes da empresa.
+
+        :param session: Sessão HTTP do trabalhador.
+        :param codigo_cvm: Código CVM da empresa.
+        :return: JSON de detalhes da empresa.
+        :raises requests.HTTPError: Se a API retornar um status de erro.
+        """
+        path_fixture = join(self.path_fixtures, f'{codigo_cvm}.json')
+        if self.modo_fixtures == 'reproduzir':
+            if not exists(path_fixture):
+                raise ErroPermanente(f'Fixture não encontrada: {path_fixture}')
+            with open(path_fixture, 'r', encoding='utf-8') as file:
+                return json.load(file)
+
+        parametros = codificar_parametros({'codeCVM': codigo_cvm, 'language': 'pt-br'})
+        url = f'{self.url_base}/listedCompaniesProxy/CompanyCall/GetDetail/{parametros}'
+        response = session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        detalhe = response.json()
+
+        if self.modo_fixtures == 'gravar':
+            makedirs(self.path_fixtures, exist_ok=True)
+            with open(path_fixture, 'w', encoding='utf-8') as file:
+                json.dump(detalhe, file, ensure_ascii=False)
+        return detalhe
+
+    @staticmethod
+    def formatar_cnpj(cnpj: str) -> str:
+        """
+        Formata o CNPJ como exibido na página (ex.: '07.526.557/0001-00').
+
+        :param cnpj: CNPJ com ou sem formatação.
+        :return: CNPJ formatado, ou o valor original se não tiver 14 dígitos.
+        """
+        digitos = re.sub(r'\D', '', cnpj or '')
+        if len(digitos) != 14:
+            return cnpj or ''
+        return f'{digitos[:2]}.{digitos[2:5]}.{digitos[5:8]}/{digitos[8:12]}-{digitos[12:]}'
+
+    def montar_infos(self, codigo: str, detalhe: Dict) -> list:
+        """
+        Converte o JSON de detalhes no registro de sete campos.
+
+        O código de negociação exibido na página é o primeiro de ``otherCodes``.
+
+        :param codigo: Código da empresa.
+        :param detalhe: JSON de detalhes da empresa.
+        :return: Lista [codigo, nome_do_pregao, codigo_de_negociacao, cnpj, atividade_principal,
+                 classificacao_setorial, escriturador].
+        """
+        outros_codigos = detalhe.get('otherCodes') or []
+        codigo_de_negociacao = outros_codigos[0].get('code', '') if outros_codigos else ''
+        return [
+            codigo,
+            (detalhe.get('tradingName') or '').strip(),
+            codigo_de_negociacao,
+            self.formatar_cnpj(detalhe.get('cnpj')),
+            (detalhe.get('activity') or '').strip(),
+            (detalhe.get('industryClassification') or '').strip(),
+            (detalhe.get('institutionCommon') or '').strip(),
+        ]
+
+    def extrair_infos(self, session: requests.Session, codigo: str, update: bool = False) -> list:
+        """
+        Extrai e salva as informações de uma empresa.
+
+        :param session: Sessão HTTP do trabalhador.
+        :param codigo: Código da empresa.
+        :param update: Indica se o arquivo existente deve ser atualizado.
+        :return: Lista com as informações extraídas.
+        """
+        detalhe = self.get_detalhe(session, self.get_codigo_cvm(codigo))
+        infos = self.montar_infos(codigo, detalhe)
+        self.armazenamento.salvar_infos(infos, update)
+        print(infos)
+        return infos
+
+
+
+class ExtractCaptura(ExtractAPI):
+    """
+    Extrai as informações das empresas pelo navegador, capturando o JSON de detalhes em vez de ler o DOM.
+
+    Cada trabalhador usa um navegador do pool ``'empresas_captura'`` (com o log de rede do
+    DevTools). Ao abrir a página da empresa, a resposta de ``GetDetail`` recebida pelo aplicativo
+    Angular é capturada (``comum.captura_rede``), gravada sem alterações em ``path_fixtures``
+    (``<codigo_cvm>.json``, o mesmo formato do modo ``'api'``) e convertida no registro de sete
+    campos por ``montar_infos``. Os XPaths da seção ``app-companies-overview`` não são usados.
+
+    Methods:
+        ``extrair_infos(driver: webdriver.Chrome, codigo: str, update: bool = False) -> list``:
+            Abre a página da empresa, captura o JSON de detalhes e salva as informações.
+    """
+
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, path_checkpoint: str = config.path_checkpoint_informacoes,
+                 path_fixtures: str = config.path_fixtures_api, pool: PoolNavegadores = None):
+        """
+        Inicializa a classe ExtractCaptura.
+
+        :param armazenamento: Armazenamento das empresas listadas.
+        :param path_checkpoint: Caminho do arquivo de checkpoint da extração.
+        :param path_fixtures: Pasta onde os JSON de detalhes capturados são gravados.
+        :param pool: Pool de navegadores com captura de rede. Padrão é o pool ``'empresas_captura'``.
+        """
+        super().__init__(armazenamento, path_checkpoint, path_fixtures=path_fixtures)
+        self.pool = pool or obter_pool('empresas_captura', config.TAMANHO_POOL_NAVEGADORES, config.options_captura)
+
+    # Os recursos dos trabalhadores são navegadores do pool, como no modo Selenium
+    criar_recurso = Extract.criar_recurso
+    fechar_recurso = Extract.fechar_recurso
+    descartar_recurso = Extract.descartar_recurso
+    aquecer = Extract.aquecer
+
+    def extrair_infos(self, driver: webdriver.Chrome, codigo: str, update: bool = False) -> list:
+        """
+        Abre a página da empresa, captura o JSON de detalhes e salva as informações.
+
+        :param driver: Navegador do trabalhador.
+        :param codigo: Código da empresa.
+        :param update: Indica se as informações existentes devem ser atualizadas.
+        :return: Lista com as informações extraídas.
+        :raises ErroPermanente: Se a URL da empresa não estiver disponível.
+        :raises TempoEsgotado: Se a resposta não chegar dentro de ``config.TIMEOUT_PAGINA``.
+        """
+        codigo_cvm = self.get_codigo_cvm(codigo)
+        captura = CapturaRede(driver, {'detalhe': r'/CompanyCall/GetDetail/'})
+        captura.limpar()
+        with self.latencias.medir('capturar detalhe'):
+            driver.get(self.armazenamento.get_url(codigo))
+            resposta = captura.aguardar(
+                'detalhe', lambda r: str(decodificar_parametros(r['url']).get('codeCVM')) == codigo_cvm,
+                config.TIMEOUT_PAGINA)
+
+        makedirs(self.path_fixtures, exist_ok=True)
+        with open(join(self.path_fixtures, f'{codigo_cvm}.json'), 'w', encoding='utf-8') as file:
+            file.write(resposta['corpo'])
+
+        infos = self.montar_infos(codigo, json.loads(resposta['corpo']))
+        self.armazenamento.salvar_infos(infos, update)
+        print(infos)
+        return infos
+
 
 if __name__ == '__main__':
-    extract = Extract(config.path_extracted_data)
+    armazenamento = ArmazenamentoEmpresas(config.path_banco, config.path_extracted_data, config.path_registros)
+    if config.MODO_EXTRACAO == 'api':
+        extract = ExtractAPI(armazenamento, modo_fixtures=config.MODO_FIXTURES)
+    elif config.MODO_EXTRACAO == 'captura':
+        extract = ExtractCaptura(armazenamento)
+    else:
+        extract = Extract(armazenamento)
     extract.run()
-
-    
\ No newline at end of file
+    if config.REPARAR_INCOMPLETOS:
+        extract.reparar()
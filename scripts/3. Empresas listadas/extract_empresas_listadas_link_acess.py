@@ -2,11 +2,6 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from time import sleep
-from os.path import join, exists
-from os import makedirs, listdir, remove
 import config
 from selenium.common.exceptions import (
     NoSuchElementException,
@@ -14,21 +9,49 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException,
     WebDriverException,
 )
-from typing import List
-import config
+from time import monotonic, sleep
+import json
+from typing import List, Dict
+from os import makedirs
+from os.path import join
+from b3_dados.http import criar_sessao
+from comum.esperas import (HistogramaLatencias, TempoEsgotado, aguardar, aguardar_documento_pronto,
+                           aguardar_rede_ociosa, aguardar_url_disponivel)
+from comum.checkpoint import Checkpoint
+from comum.coleta_dom import coletar_textos
+from comum.fila_trabalho import espera_exponencial
+from comum.captura_rede import CapturaRede
+from comum.listados import codificar_parametros, decodificar_parametros
+from comum.navegador import PoolNavegadores, obter_pool
+from armazenamento import ArmazenamentoEmpresas
 
 __python__ = 3.10
 
+# Títulos dos cards da listagem (classe 'card-title2') e códigos de cada card, na ordem da página
+XPATH_TITULOS_CARDS = "//*[contains(concat(' ', normalize-space(@class), ' '), ' card-title2 ')]"
+XPATH_CODIGOS_CARDS = '//*[@id="nav-bloco"]/div/div/div/div/h5'
+
 class Extract:
     """
     Classe para extrair informações de empresas listadas na B3.
 
     Esta classe utiliza Selenium para acessar a interface web da B3 e coletar dados sobre empresas,
-    como códigos de negociação e URLs correspondentes. Os dados extraídos são armazenados em arquivos
-    de texto em um diretório específico.
+    como códigos de negociação e URLs correspondentes. As URLs extraídas são gravadas no
+    armazenamento único das empresas listadas.
+
+    As esperas acompanham o estado real da página (documento carregado, rede ociosa, troca
+    de URL ou do número da página) em vez de pausas fixas, e a duração de cada etapa é
+    registrada em ``latencias``. O navegador é emprestado do pool compartilhado do processo,
+    então uma reinicialização após falha reaproveita um navegador já aberto (ou substitui
+    apenas o que falhou).
 
     Attributes:
-        path_extracted_data (str): Caminho para o diretório onde os dados extraídos serão salvos.
+        armazenamento (ArmazenamentoEmpresas): Armazenamento onde as URLs serão gravadas.
+        latencias (HistogramaLatencias): Duração de cada etapa da navegação.
+        pool (PoolNavegadores): Pool de onde o navegador é emprestado.
+        path_checkpoint (str): Caminho do checkpoint da navegação (posição, códigos concluídos e falhas).
+        item_em_andamento (str): Posição (``'pagina:item'``) do item que ``percorrer`` está
+            processando, ou None antes do primeiro item e entre uma página e outra.
 
     Methods:
         ``get_codigos_page(driver: webdriver.Chrome) -> List[str]``:
@@ -37,6 +60,9 @@ class Extract:
         ``get_quantidade_de_paginas(driver: webdriver.Chrome) -> int``:
             Extrai o número total de páginas disponíveis.
 
+        ``get_cards(driver: webdriver.Chrome) -> List[str]``:
+            Extrai os códigos de todos os cards da página, em uma única chamada ao navegador.
+
         ``get_codigo_page(driver: webdriver.Chrome, n_item: int) -> str``:
             Extrai o texto do código na página com base na posição do item.
 
@@ -52,30 +78,52 @@ class Extract:
         ``adjust_numero_pagina(driver: webdriver.Chrome, numero_pagina_loop: int) -> bool``:
             Ajusta a página atual do driver até que o número da página corresponda ao esperado.
 
-        ``save_file(path: str, content: str, update: bool = False) -> None``:
-            Salva o conteúdo em um arquivo no caminho especificado.
-
         ``check_urls() -> bool``:
             Verifica a validade das URLs salvas.
 
-        ``run() -> None``:
+        ``percorrer(driver: webdriver.Chrome, checkpoint: Checkpoint) -> None``:
+            Percorre a listagem a partir da posição salva e grava as URLs.
+
+        ``run(max_reinicios: int = config.MAX_REINICIOS) -> None``:
             Extrai informações de empresas listadas na B3 a partir da interface web.
     """
     
-    def __init__(self, path_extracted_data: str):
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, pool: PoolNavegadores = None,
+                 path_checkpoint: str = config.path_checkpoint_urls):
         """
         Inicializa a classe Extract.
 
-        :param path_extracted_data: Caminho para o diretório onde os dados extraídos serão salvos.
+        :param armazenamento: Armazenamento onde as URLs serão gravadas.
+        :param pool: Pool de navegadores. Padrão é o pool ``'empresas'`` do processo.
+        :param path_checkpoint: Caminho do checkpoint da navegação.
         """
-        self.path_extracted_data = path_extracted_data
+        self.armazenamento = armazenamento
+        self.path_checkpoint = path_checkpoint
+        self.latencias = HistogramaLatencias()
+        self.pool = pool or obter_pool('empresas', config.TAMANHO_POOL_NAVEGADORES, config.options)
+        self.item_em_andamento = None
+
+    def aguardar_pagina(self, driver: webdriver.Chrome, etapa: str) -> None:
+        """
+        Aguarda o documento carregar e as requisições da página terminarem.
+
+        :param driver: Instância do WebDriver.
+        :param etapa: Nome da etapa registrado em ``latencias``.
+        """
+        with self.latencias.medir(etapa):
+            try:
+                aguardar_documento_pronto(driver, config.TIMEOUT_PAGINA)
+                aguardar_rede_ociosa(driver, config.TIMEOUT_PAGINA, config.OCIOSIDADE_REDE)
+            except TempoEsgotado as e:
+                print(f'Aviso: {e}')
     
     def get_codigos_page(self, driver: webdriver.Chrome) -> List[str]:
         """
         Extrai códigos de empresas listadas na página atual.
 
         Esta função localiza todos os elementos com a classe 'card-title2' e retorna uma lista
-        de textos únicos contidos nesses elementos.
+        de textos únicos contidos nesses elementos. Os textos são lidos por um único script
+        no navegador, e não com uma chamada ao WebDriver por card.
 
         :param driver: Instância do WebDriver para interação com a página.
         :return: Lista de códigos extraídos, sem duplicatas.
@@ -86,8 +134,8 @@ class Extract:
             WebDriverWait(driver, 10).until(
                 EC.presence_of_all_elements_located((By.CLASS_NAME, 'card-title2'))
             )
-            rows = driver.find_elements(By.CLASS_NAME, 'card-title2')
-            return list({row.text for row in rows})
+            titulos = coletar_textos(driver, XPATH_TITULOS_CARDS, latencias=self.latencias, etapa='coletar títulos')
+            return list(dict.fromkeys(titulos))
         except NoSuchElementException:
             print("Nenhum elemento encontrado com a classe 'card-title2'.")
             return []
@@ -119,6 +167,25 @@ class Extract:
             print("O texto encontrado não pode ser convertido para um inteiro.")
             raise
 
+    def get_cards(self, driver: webdriver.Chrome) -> List[str]:
+        """
+        Extrai os códigos de todos os cards da página atual, na ordem dos itens.
+
+        Um único script no navegador lê todos os cards; a posição na lista corresponde ao
+        ``n_item`` (baseado em 1) usado por ``get_codigo_page`` e ``acess_page_codigo``.
+
+        :param driver: Instância do WebDriver para interação com a página.
+        :return: Códigos dos cards, na ordem da página (vazia se a página não carregar).
+        """
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.XPATH, XPATH_CODIGOS_CARDS))
+            )
+            return coletar_textos(driver, XPATH_CODIGOS_CARDS, latencias=self.latencias, etapa='coletar cards')
+        except WebDriverException as e:
+            print(f"Erro ao interagir com o WebDriver: {e}")
+            return []
+
     def get_codigo_page(self, driver: webdriver.Chrome, n_item: int) -> str:
         """
         Extrai o texto do código na página com base na posição do item.
@@ -217,46 +284,34 @@ class Extract:
         """
         Ajusta a página atual do driver até que o número da página corresponda ao esperado.
 
-        Verifica continuamente o número da página exibido e navega para a próxima página
-        até que o número atual seja igual ao número esperado.
+        Verifica o número da página exibido e navega para a próxima página até que o número
+        atual seja igual ao número esperado. Após cada clique, aguarda o número da página
+        mudar (em vez de uma pausa fixa).
 
         :param driver: Instância do WebDriver para interagir com o navegador.
         :param numero_pagina_loop: O número da página esperado.
         :return: True se o número da página atual corresponder ao número esperado, False caso contrário.
         """
         xpath_numero_pagina = self.get_xpath_numero_pagina(driver)
-        if xpath_numero_pagina == numero_pagina_loop:
-            return True
-        sleep(0.2)
-        while True:
-            xpath_numero_pagina = self.get_xpath_numero_pagina(driver)
-            sleep(0.1)
-            if xpath_numero_pagina == numero_pagina_loop:
-                return True
-            self.next_page(driver)
+        while xpath_numero_pagina != numero_pagina_loop:
+            if xpath_numero_pagina > numero_pagina_loop:
+                return False
+            anterior = xpath_numero_pagina
+
+            def pagina_trocada():
+                numero = self.get_xpath_numero_pagina(driver)
+                return numero if numero != anterior else None
+
+            with self.latencias.medir('trocar página'):
+                self.next_page(driver)
+                try:
+                    xpath_numero_pagina = aguardar(pagina_trocada, config.TIMEOUT_PAGINA,
+                                                   descricao=f'página {anterior + 1}')
+                except TempoEsgotado as e:
+                    print(f'Aviso: {e}')
+                    return False
+        return True
         
-    def save_file(self, path: str, content: str, update: bool = False) -> None:
-        """
-        Salva o conteúdo em um arquivo no caminho especificado.
-
-        Verifica se o arquivo já existe. Se não existir ou se o parâmetro `update` for True,
-        o conteúdo será salvo. Caso contrário, uma mensagem informando que o arquivo já existe será exibida.
-
-        :param path: Caminho do arquivo onde o conteúdo será salvo.
-        :param content: O conteúdo a ser salvo no arquivo.
-        :param update: Se True, o arquivo existente será sobrescrito.
-        :raises OSError: Se ocorrer um erro ao tentar salvar o arquivo.
-        """
-        if not exists(path) or update:
-            try:
-                with open(path, 'w', encoding='utf-8') as file:
-                    file.write(str(content))
-                print(f"Informações salvas em: {path}")
-            except OSError as e:
-                print(f'Erro ao salvar o arquivo: {e}')
-        else:
-            print(f'O arquivo já existe: {path}')
-    
     def check_urls(self) -> bool:
         """
         Verifica a validade das URLs salvas.
@@ -267,28 +322,99 @@ class Extract:
         :return: True se alguma URL inválida foi encontrada e removida, False caso contrário.
         """
         chave = False
-        for codigo in listdir(self.path_extracted_data):
-            path = join(self.path_extracted_data, codigo, f'url_{codigo}.txt')
-            with open(path, 'r', encoding='utf-8') as file:
-                file = file.read()
-            if not codigo in file:
-                remove(path)
+        for codigo, url in self.armazenamento.urls().items():
+            if not codigo in url:
+                self.armazenamento.remover_url(codigo)
                 chave = True
                 print(f'Informações incorretas: {codigo}.')
-                print(f'Arquivo deletado: {path}.')
+                print(f'URL removida: {codigo}.')
             else:
                 print(f'Codigo: {codigo}, Status: OK')
                     
         return chave
 
-    def run(self) -> None:
+    def percorrer(self, driver: webdriver.Chrome, checkpoint: Checkpoint) -> None:
+        """
+        Percorre a listagem a partir da posição salva no checkpoint e grava as URLs.
+
+        A posição (página e item) é registrada antes de cada item, então uma falha é retomada
+        no próprio item que falhou. Enquanto o item é processado, a sua posição fica em
+        ``item_em_andamento``, e só uma falha nesse intervalo conta para ele; quando o item
+        termina, as suas falhas anteriores são zeradas. Posições que já falharam
+        ``config.TENTATIVAS_POR_ITEM`` vezes seguidas são ignoradas.
+
+        :param driver: Instância do WebDriver.
+        :param checkpoint: Estado da navegação (posição, códigos concluídos e falhas).
+        """
+        pagina_inicial = checkpoint.posicao.get('pagina', 1)
+        item_inicial = checkpoint.posicao.get('item', 1)
+        count_data = checkpoint.posicao.get('contagem', 0)
+
+        driver.get(config.url)
+        self.aguardar_pagina(driver, 'carregar listagem')
+        total_paginas = self.get_quantidade_de_paginas(driver)
+        print(f'Número de páginas total: {total_paginas}')
+        if (pagina_inicial, item_inicial) != (1, 1):
+            print(f'Retomando da página {pagina_inicial}, item {item_inicial} '
+                  f'({len(checkpoint.concluidos)} códigos concluídos)')
+
+        for numero_da_pagina in range(pagina_inicial, total_paginas + 1):
+            self.adjust_numero_pagina(driver, numero_da_pagina)
+            print(f'Número da página: {numero_da_pagina}')
+
+            inicio_pagina = monotonic()
+            with self.latencias.medir('ler cards'):
+                cards = self.get_cards(driver)
+            if not cards:
+                raise TempoEsgotado(f'Nenhum card encontrado na página {numero_da_pagina}')
+
+            primeiro_item = item_inicial if numero_da_pagina == pagina_inicial else 1
+            for n_item in range(primeiro_item, len(cards) + 1):
+                posicao = f'{numero_da_pagina}:{n_item}'
+                if checkpoint.falhas.get(posicao, 0) >= config.TENTATIVAS_POR_ITEM:
+                    print(f'Página {numero_da_pagina}, Item: {n_item} ignorado após '
+                          f'{checkpoint.falhas[posicao]} falhas')
+                    continue
+                checkpoint.atualizar_posicao(pagina=numero_da_pagina, item=n_item, contagem=count_data)
+                self.item_em_andamento = posicao
+
+                count_data += 1
+                self.adjust_numero_pagina(driver, numero_da_pagina)
+                codigo = cards[n_item - 1] or self.get_codigo_page(driver, n_item)
+                print(f'Página {numero_da_pagina}, Item: {n_item}, Código: {codigo}, N°: {count_data}')
+
+                if self.armazenamento.get_url(codigo) is None:
+                    url_listagem = driver.current_url
+                    with self.latencias.medir('abrir empresa'):
+                        self.acess_page_codigo(driver, n_item)
+                        aguardar(lambda: driver.current_url != url_listagem, config.TIMEOUT_PAGINA,
+                                 descricao=f'página da empresa {codigo}')
+                    self.armazenamento.salvar_url(codigo, driver.current_url, update=False)
+                    driver.back()
+                    with self.latencias.medir('voltar à listagem'):
+                        aguardar(lambda: driver.current_url == url_listagem, config.TIMEOUT_PAGINA,
+                                 descricao='retorno à listagem')
+                        WebDriverWait(driver, config.TIMEOUT_PAGINA).until(
+                            EC.presence_of_element_located((By.XPATH, XPATH_CODIGOS_CARDS))
+                        )
+                if codigo:
+                    checkpoint.marcar_concluido(codigo)
+                checkpoint.remover_falhas(posicao)
+                self.item_em_andamento = None
+
+            checkpoint.atualizar_posicao(pagina=numero_da_pagina + 1, item=1, contagem=count_data)
+            duracao = monotonic() - inicio_pagina
+            self.latencias.registrar('página completa', duracao)
+            print(f'Página {numero_da_pagina}: {len(cards)} cards em {duracao:.2f}s')
+
+    def run(self, max_reinicios: int = config.MAX_REINICIOS) -> None:
         """
         Extrai informações de empresas listadas na B3 a partir da interface web.
 
-        Inicializa um navegador Chrome, acessa a página de listagem de empresas e itera
+        Empresta um navegador Chrome do pool, acessa a página de listagem de empresas e itera
         através de todas as páginas disponíveis. Para cada página, ele extrai códigos de empresas,
-        salva-os em arquivos e verifica a existência de diretórios correspondentes. Além disso,
-        acessa páginas específicas para cada código, salvando as URLs.
+        e, para cada código ainda sem URL no armazenamento, acessa a página correspondente
+        e grava a URL.
 
         O fluxo do processo é o seguinte:
         1. Acessa a URL da lista de empresas.
@@ -297,56 +423,269 @@ class Extract:
         4. Para cada código extraído, acessa a página correspondente, salva a URL e volta para a lista.
         5. Realiza verificações para assegurar que as URLs estão corretas.
 
-        :raises Exception: Levanta exceções gerais em caso de falhas durante a interação com o navegador 
-                        ou ao acessar elementos na página.
+        A posição na listagem fica em um checkpoint (``path_checkpoint``). Após uma falha, o
+        navegador é descartado e o processo é reiniciado em um laço (sem recursão) a partir da
+        página e do item em que parou, com espera exponencial entre os reinícios. Uma nova
+        execução do script também continua de onde a anterior parou. O checkpoint é apagado
+        quando a listagem termina sem URLs inválidas.
+
+        A falha só é atribuída a uma posição se ``percorrer`` já tinha começado o item
+        (``item_em_andamento``); erros ao abrir a listagem ou trocar de página não contam para
+        nenhum item. Os reinícios são contados enquanto a posição do checkpoint não avança:
+        se a posição avançou desde a falha anterior, a contagem recomeça.
+
+        :param max_reinicios: Reinícios seguidos (sem avanço da posição) permitidos antes de
+            desistir (o checkpoint é mantido).
         """
+        checkpoint = Checkpoint(self.path_checkpoint, salvar_a_cada=1)
+        reinicios = 0
+        posicao_ultima_falha = None
         try:
-            
-            with webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=config.options) as driver:
+            while True:
+                self.item_em_andamento = None
+                try:
+                    with self.pool.emprestar() as driver:
+                        self.percorrer(driver, checkpoint)
+                except Exception as e:
+                    pagina, item = checkpoint.posicao.get('pagina', 1), checkpoint.posicao.get('item', 1)
+                    if posicao_ultima_falha is not None and (pagina, item) > posicao_ultima_falha:
+                        reinicios = 0
+                    posicao_ultima_falha = (pagina, item)
+                    reinicios += 1
+                    if self.item_em_andamento is not None:
+                        falhas = checkpoint.registrar_falha(self.item_em_andamento)
+                        print(f'Erro ao processar a página {pagina}, item {item} '
+                              f'(falha {falhas} nesse item): {e}')
+                    else:
+                        print(f'Erro antes do item {item} da página {pagina} '
+                              f'(nenhuma falha atribuída ao item): {e}')
+                    if reinicios > max_reinicios:
+                        print(f'Processo interrompido após {max_reinicios} reinícios. '
+                              f'A próxima execução continua do checkpoint: {self.path_checkpoint}')
+                        return
+                    espera = espera_exponencial(reinicios, config.ESPERA_REINICIO_INICIAL,
+                                                config.ESPERA_REINICIO_MAXIMA)
+                    print(f'Reinício {reinicios}/{max_reinicios} em {espera:.1f}s...')
+                    with self.latencias.medir('aguardar reinício'):
+                        sleep(espera)
+                        try:
+                            aguardar_url_disponivel(config.url, timeout=config.TIMEOUT_REINICIO)
+                        except TempoEsgotado as erro:
+                            print(f'Aviso: {erro}')
+                    continue
+
+                reinicios = 0
+                posicao_ultima_falha = None
+                if not self.check_urls():
+                    checkpoint.limpar()
+                    return
+                # URLs inválidas foram removidas: nova passagem desde a primeira página
+                print('URLs inválidas removidas. Percorrendo a listagem novamente.')
+                checkpoint.limpar()
+        finally:
+            self.latencias.imprimir()
+
+
+class ExtractAPI(Extract):
+    """
+    Coleta as URLs das empresas listadas a partir da API de listagem da B3, sem navegador.
+
+    A página de busca é um aplicativo Angular que preenche os cards com o resultado do endpoint
+    ``listedCompaniesProxy/CompanyCall/GetInitialCompanies``. Cada item do resultado já traz o
+    código CVM e o código de negociação, que formam a URL da página da empresa
+    (``listedCompaniesPage/main/{codeCVM}/{issuingCompany}/overview``). Assim, o catálogo completo
+    de URLs é produzido em uma única passagem pelas páginas da listagem, sem cliques.
+
+    Attributes:
+        url_base (str): Endereço base dos sistemas de listados da B3.
+        tamanho_pagina (int): Quantidade de empresas por página da listagem.
+        session (requests.Session): Sessão HTTP com pool de conexões.
+
+    Methods:
+        ``get_pagina_empresas(numero_pagina: int) -> Dict``:
+            Obtém uma página da listagem de empresas.
+
+        ``montar_url_empresa(empresa: Dict) -> str``:
+            Monta a URL da página de uma empresa a partir de um item da listagem.
+
+        ``salvar_pagina(numero_da_pagina: int, pagina: Dict, update: bool, count_data: int) -> int``:
+            Salva a URL de cada empresa de uma página da listagem.
+
+        ``run(update: bool = False) -> None``:
+            Percorre a listagem e salva a URL de cada empresa.
+    """
+
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, url_base: str = config.url_listados,
+                 tamanho_pagina: int = config.TAMANHO_PAGINA_API, timeout: float = 30):
+        """
+        Inicializa a classe ExtractAPI.
+
+        :param armazenamento: Armazenamento onde as URLs serão gravadas.
+        :param url_base: Endereço base da API (permite apontar para um servidor local de testes).
+        :param tamanho_pagina: Quantidade de empresas por página da listagem.
+        :param timeout: Tempo limite de cada requisição, em segundos.
+        """
+        super().__init__(armazenamento)
+        self.url_base = url_base.rstrip('/')
+        self.tamanho_pagina = tamanho_pagina
+        self.timeout = timeout
+        self.session = criar_sessao()
+
+    def get_pagina_empresas(self, numero_pagina: int) -> Dict:
+        """
+        Obtém uma página da listagem de empresas.
+
+        :param numero_pagina: Número da página (baseado em 1).
+        :return: Resposta da API, com as chaves ``page`` (paginação) e ``results`` (empresas).
+        :raises requests.HTTPError: Se a API retornar um status de erro.
+        """
+        parametros = codificar_parametros({
+            'language': 'pt-br',
+            'pageNumber': numero_pagina,
+            'pageSize': self.tamanho_pagina,
+        })
+        url = f'{self.url_base}/listedCompaniesProxy/CompanyCall/GetInitialCompanies/{parametros}'
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def montar_url_empresa(self, empresa: Dict) -> str:
+        """
+        Monta a URL da página de uma empresa a partir de um item da listagem.
+
+        :param empresa: Item de ``results`` da API de listagem.
+        :return: URL da página de visão geral da empresa.
+        """
+        return (f"{self.url_base}/listedCompaniesPage/main/"
+                f"{empresa['codeCVM']}/{empresa['issuingCompany']}/overview?language=pt-br")
+
+    def run(self, update: bool = False) -> None:
+        """
+        Percorre a listagem e salva a URL de cada empresa.
+
+        A primeira página informa o total de páginas; as demais são lidas em sequência,
+        uma única vez cada. As URLs são gravadas no armazenamento, como no modo Selenium.
+
+        :param update: Se True, sobrescreve URLs já salvas.
+        """
+        primeira_pagina = self.get_pagina_empresas(1)
+        total_paginas = primeira_pagina['page']['totalPages']
+        print(f'Número de páginas total: {total_paginas}')
+
+        count_data = 0
+        for numero_da_pagina in range(1, total_paginas + 1):
+            pagina = primeira_pagina if numero_da_pagina == 1 else self.get_pagina_empresas(numero_da_pagina)
+            count_data = self.salvar_pagina(numero_da_pagina, pagina, update, count_data)
+
+        self.check_urls()
+
+    def salvar_pagina(self, numero_da_pagina: int, pagina: Dict, update: bool, count_data: int) -> int:
+        """
+        Salva a URL de cada empresa de uma página da listagem.
+
+        :param numero_da_pagina: Número da página (baseado em 1).
+        :param pagina: Resposta da API de listagem.
+        :param update: Se True, sobrescreve URLs já salvas.
+        :param count_data: Quantidade de empresas das páginas anteriores.
+        :return: Quantidade de empresas até esta página.
+        """
+        print(f'Número da página: {numero_da_pagina}')
+        for empresa in pagina['results']:
+            codigo = empresa.get('issuingCompany')
+            if not codigo or not empresa.get('codeCVM'):
+                continue
+            count_data += 1
+            print(f'Página {numero_da_pagina}, Código: {codigo}, N°: {count_data}')
+
+            self.armazenamento.salvar_url(codigo, self.montar_url_empresa(empresa), update=update)
+        return count_data
+
+
+class ExtractCaptura(ExtractAPI):
+    """
+    Coleta as URLs das empresas pelo navegador, capturando o JSON da listagem em vez de ler o DOM.
+
+    O navegador abre a página de busca e avança pelas páginas da listagem; a cada página, a
+    resposta de ``GetInitialCompanies`` que o aplicativo Angular recebe é capturada pelo log de
+    rede do DevTools (``comum.captura_rede``), gravada sem alterações em
+    ``path_captura/pagina_NNNN.json`` e convertida em URLs como no modo ``'api'``. Não há
+    leitura de cards nem XPaths por item: o navegador só é usado para paginar.
+
+    Attributes:
+        path_captura (str): Pasta onde as respostas da listagem são gravadas.
+
+    Methods:
+        ``capturar_pagina(captura: CapturaRede, numero_pagina: int) -> Dict``:
+            Aguarda, grava e retorna a resposta de uma página da listagem.
+
+        ``run(update: bool = False) -> None``:
+            Percorre a listagem no navegador e salva a URL de cada empresa.
+    """
+
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, path_captura: str = config.path_captura_listagem,
+                 pool: PoolNavegadores = None):
+        """
+        Inicializa a classe ExtractCaptura.
+
+        :param armazenamento: Armazenamento onde as URLs serão gravadas.
+        :param path_captura: Pasta onde as respostas da listagem são gravadas.
+        :param pool: Pool de navegadores com captura de rede. Padrão é o pool ``'empresas_captura'``.
+        """
+        super().__init__(armazenamento)
+        self.path_captura = path_captura
+        self.pool = pool or obter_pool('empresas_captura', config.TAMANHO_POOL_NAVEGADORES, config.options_captura)
+
+    def capturar_pagina(self, captura: CapturaRede, numero_pagina: int) -> Dict:
+        """
+        Aguarda a resposta de uma página da listagem, grava o JSON original e o retorna.
+
+        :param captura: Captura de rede do navegador.
+        :param numero_pagina: Número da página esperada (parâmetro ``pageNumber`` da chamada).
+        :return: Resposta da API de listagem.
+        :raises TempoEsgotado: Se a resposta não chegar dentro de ``config.TIMEOUT_PAGINA``.
+        """
+        with self.latencias.medir('capturar listagem'):
+            resposta = captura.aguardar(
+                'listagem', lambda r: str(decodificar_parametros(r['url']).get('pageNumber')) == str(numero_pagina),
+                config.TIMEOUT_PAGINA)
+        makedirs(self.path_captura, exist_ok=True)
+        with open(join(self.path_captura, f'pagina_{numero_pagina:04d}.json'), 'w', encoding='utf-8') as file:
+            file.write(resposta['corpo'])
+        return json.loads(resposta['corpo'])
+
+    def run(self, update: bool = False) -> None:
+        """
+        Percorre a listagem no navegador e salva a URL de cada empresa.
+
+        :param update: Se True, sobrescreve URLs já salvas.
+        """
+        try:
+            with self.pool.emprestar() as driver:
+                captura = CapturaRede(driver, {'listagem': r'/CompanyCall/GetInitialCompanies/'})
+                captura.limpar()
                 driver.get(config.url)
-                sleep(3)
-                total_paginas = self.get_quantidade_de_paginas(driver)
+                pagina = self.capturar_pagina(captura, 1)
+                total_paginas = pagina['page']['totalPages']
                 print(f'Número de páginas total: {total_paginas}')
-                
-                count_data = 0
-                for numero_da_pagina in range(1, total_paginas + 1):
-                    self.adjust_numero_pagina(driver, numero_da_pagina)
-                    print(f'Número da página: {numero_da_pagina}')
-
-                    lista_codigos = self.get_codigos_page(driver)
-
-                    sleep(3)
-
-                    for n_item in range(1, len(lista_codigos) + 1):
-                        count_data += 1
-                        self.adjust_numero_pagina(driver, numero_da_pagina)
-                        codigo = self.get_codigo_page(driver, n_item)
-                        print(f'Página {numero_da_pagina}, Item: {n_item}, Código: {codigo}, N°: {count_data}')
-
-                        path_dir_codigo = join(self.path_extracted_data, codigo)
-                        if not exists(path_dir_codigo):
-                            makedirs(path_dir_codigo)
-                        
-                        if not exists(path_dir_codigo) or not exists(join(path_dir_codigo, f'url_{codigo}.txt')):
-                            sleep(3)
-                            self.acess_page_codigo(driver, n_item)
-                            sleep(3)
-                            self.save_file(join(self.path_extracted_data, codigo, f'url_{codigo}.txt'), driver.current_url, update=False)
-                            sleep(3)
-                            driver.back()
-                            sleep(2)
-                    
-            if self.check_urls():
-                self.run()
 
-        except Exception as e:
-            print(f"Erro ao processar as páginas: {e}")
-            print("Tentando reiniciar o processo...")
-            driver.quit() 
-            sleep(40)
-            self.run()
+                count_data = self.salvar_pagina(1, pagina, update, count_data=0)
+                for numero_da_pagina in range(2, total_paginas + 1):
+                    self.next_page(driver)
+                    pagina = self.capturar_pagina(captura, numero_da_pagina)
+                    count_data = self.salvar_pagina(numero_da_pagina, pagina, update, count_data)
+        finally:
+            self.latencias.imprimir()
+
+        self.check_urls()
+
 
 if __name__ == '__main__':
 
-    extract = Extract(config.path_extracted_data)
+    armazenamento = ArmazenamentoEmpresas(config.path_banco, config.path_extracted_data, config.path_registros)
+    if config.MODO_EXTRACAO == 'api':
+        extract = ExtractAPI(armazenamento)
+    elif config.MODO_EXTRACAO == 'captura':
+        extract = ExtractCaptura(armazenamento)
+    else:
+        extract = Extract(armazenamento)
     extract.run()
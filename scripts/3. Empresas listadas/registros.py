@@ -0,0 +1,167 @@
+import ast
+import json
+from datetime import datetime
+from os import listdir, replace
+from os.path import join, exists, isdir
+from typing import Dict, Iterable, Iterator, Optional
+from pandas import DataFrame
+import config
+
+__python__ = 3.10
+
+# Campos do registro de informações de cada empresa, na ordem gravada pelos extratores
+CAMPOS = ['codigo', 'nome_do_pregao', 'codigo_de_negociacao', 'cnpj', 'atividade_principal',
+          'classificacao_setorial', 'escriturador']
+
+# Campos de cada linha do arquivo JSON Lines (além de CAMPOS)
+CAMPOS_CONTROLE = ['url', 'atualizado_url', 'atualizado_infos']
+
+
+def iterar_registros(path: str) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Lê um arquivo JSON Lines de empresas, uma linha por vez.
+
+    Cada linha é um objeto JSON com o ``codigo`` e apenas os campos gravados naquele
+    momento (o arquivo funciona como um log de alterações). Linhas vazias são ignoradas.
+
+    :param path: Caminho do arquivo ``.jsonl``.
+    :return: Iterador de dicionários, na ordem do arquivo.
+    :raises ValueError: Se uma linha não for um JSON válido ou não tiver ``codigo``.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        for numero, linha in enumerate(file, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'Linha {numero} inválida em {path}: {e}') from e
+            if not registro.get('codigo'):
+                raise ValueError(f'Linha {numero} sem código em {path}')
+            yield registro
+
+
+def carregar_registros(path: str) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Carrega o arquivo JSON Lines em uma única passagem, consolidando as alterações por código.
+
+    Linhas posteriores sobrescrevem os campos das anteriores (a última gravação vence).
+
+    :param path: Caminho do arquivo ``.jsonl``.
+    :return: Dicionário código -> registro consolidado.
+    """
+    registros: Dict[str, Dict[str, Optional[str]]] = {}
+    for registro in iterar_registros(path):
+        registros.setdefault(registro['codigo'], {}).update(registro)
+    return registros
+
+
+def ler_tabela(path: str) -> DataFrame:
+    """
+    Lê o arquivo JSON Lines como tabela, com uma linha por empresa.
+
+    :param path: Caminho do arquivo ``.jsonl``.
+    :return: DataFrame com as colunas de ``CAMPOS`` e ``CAMPOS_CONTROLE``, ordenado por código.
+    """
+    registros = carregar_registros(path)
+    return DataFrame(
+        [registros[codigo] for codigo in sorted(registros)],
+        columns=CAMPOS + CAMPOS_CONTROLE,
+    )
+
+
+def escrever_registros(path: str, registros: Iterable[Dict[str, Optional[str]]]) -> int:
+    """
+    Grava registros em um arquivo JSON Lines (substituindo o conteúdo, de forma atômica).
+
+    :param path: Caminho do arquivo ``.jsonl``.
+    :param registros: Registros a serem gravados.
+    :return: Quantidade de linhas gravadas.
+    """
+    total = 0
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as file:
+        for registro in registros:
+            file.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            total += 1
+    replace(tmp, path)
+    return total
+
+
+def compactar(path: str) -> int:
+    """
+    Reescreve o log com uma única linha consolidada por código.
+
+    :param path: Caminho do arquivo ``.jsonl``.
+    :return: Quantidade de códigos no arquivo compactado.
+    """
+    registros = carregar_registros(path)
+    return escrever_registros(path, (registros[codigo] for codigo in sorted(registros)))
+
+
+def ler_registro_legado(path_dir_codigo: str, codigo: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Lê um código no formato anterior (``url_<codigo>.txt`` e ``infos_<codigo>.txt``).
+
+    O arquivo de informações contém a representação em texto de uma lista Python, que é
+    interpretada com ``ast.literal_eval`` (apenas literais; nenhum código é executado).
+
+    :param path_dir_codigo: Pasta do código.
+    :param codigo: Código da empresa.
+    :return: Registro no formato JSON Lines, ou None se a pasta não tiver dados.
+    """
+    registro: Dict[str, Optional[str]] = {'codigo': codigo}
+    path_url = join(path_dir_codigo, f'url_{codigo}.txt')
+    path_infos = join(path_dir_codigo, f'infos_{codigo}.txt')
+
+    if exists(path_url):
+        with open(path_url, 'r', encoding='utf-8') as file:
+            registro['url'] = file.read()
+
+    if exists(path_infos):
+        try:
+            with open(path_infos, 'r', encoding='utf-8') as file:
+                infos = ast.literal_eval(file.read())
+        except (OSError, ValueError, SyntaxError) as e:
+            print(f'Erro ao ler o arquivo {path_infos}: {e}')
+            infos = None
+        if isinstance(infos, (list, tuple)) and len(infos) == len(CAMPOS):
+            registro.update(zip(CAMPOS[1:], infos[1:]))
+        elif infos is not None:
+            print(f'Quantidade de informações incorretas: {codigo}')
+
+    return registro if len(registro) > 1 else None
+
+
+def migrar_diretorios(path_legado: str, path_jsonl: str, data_coleta: Optional[str] = None) -> int:
+    """
+    Converte as pastas por código do formato anterior em um arquivo JSON Lines.
+
+    :param path_legado: Pasta com uma subpasta por código.
+    :param path_jsonl: Arquivo ``.jsonl`` de destino (substituído).
+    :param data_coleta: Data gravada em ``atualizado_url``/``atualizado_infos`` (padrão: agora).
+    :return: Quantidade de códigos migrados.
+    """
+    data_coleta = data_coleta or datetime.now().isoformat(timespec='seconds')
+
+    def registros():
+        for codigo in sorted(listdir(path_legado)):
+            registro = ler_registro_legado(join(path_legado, codigo), codigo)
+            if registro is None:
+                continue
+            if 'url' in registro:
+                registro['atualizado_url'] = data_coleta
+            if 'nome_do_pregao' in registro:
+                registro['atualizado_infos'] = data_coleta
+            yield registro
+
+    total = escrever_registros(path_jsonl, registros())
+    print(f'Códigos migrados para {path_jsonl}: {total}')
+    return total
+
+
+if __name__ == '__main__':
+    if isdir(config.path_extracted_data):
+        migrar_diretorios(config.path_extracted_data, config.path_registros)
+    else:
+        print(f'Nenhuma pasta no formato anterior em {config.path_extracted_data}: nada a migrar.')
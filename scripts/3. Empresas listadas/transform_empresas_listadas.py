@@ -1,87 +1,61 @@
 
 
 
-from os import listdir
-from os.path import join, exists
+from os.path import join
 from pandas import DataFrame
 import config
 from yfinance import download
+from armazenamento import ArmazenamentoEmpresas
+from registros import CAMPOS
 
 class Transform:
     """
     Classe para transformar dados extraídos em um formato utilizável.
 
-    Esta classe é responsável por ler os dados de arquivos extraídos, processá-los e 
-    salvá-los em um formato CSV. Os dados são esperados em arquivos de texto específicos 
-    que contêm informações sobre empresas listadas.
+    Esta classe é responsável por ler os dados extraídos, processá-los e salvá-los em
+    um formato CSV. Os dados são lidos do armazenamento único das empresas listadas.
 
     Attributes:
-        path_extracted_data (str): Caminho para o diretório onde os dados extraídos estão armazenados.
+        armazenamento (ArmazenamentoEmpresas): Armazenamento com os dados extraídos.
         path_processed_data (str): Caminho para o diretório onde os dados processados serão salvos.
 
     Methods:
         ``read_data() -> DataFrame``:
-            Lê e compila dados de arquivos de informações em um DataFrame.
+            Lê os dados das empresas em um DataFrame.
 
         ``run() -> None``:
             Executa o processo de leitura e transformação dos dados, salvando-os em um arquivo CSV.
     """
     
-    def __init__(self, path_extracted_data: str, path_processed_data: str):
+    def __init__(self, armazenamento: ArmazenamentoEmpresas, path_processed_data: str):
         """
         Inicializa a classe Transform.
 
-        :param path_extracted_data: Caminho para o diretório onde os dados extraídos estão armazenados.
+        :param armazenamento: Armazenamento com os dados extraídos das empresas listadas.
         :param path_processed_data: Caminho para o diretório onde os dados processados serão salvos.
         """
-        self.path_extracted_data = path_extracted_data
+        self.armazenamento = armazenamento
         self.path_processed_data = path_processed_data
         self.lista_serie_disponivel = [[], []] # OK, NO
 
     def read_data(self) -> DataFrame:
         """
-        Lê e compila dados de arquivos de informações em um DataFrame.
+        Lê os dados das empresas em um DataFrame.
 
-        Esta função percorre todos os diretórios dentro do caminho especificado para
-        dados extraídos, procurando arquivos nomeados 'infos_<codigo>.txt'. Cada arquivo
-        é lido e os dados, que devem estar em formato de lista, são armazenados em uma 
-        lista. Essa lista é então convertida em um DataFrame do Pandas.
-
-        Espera-se que cada arquivo contenha uma lista com os seguintes elementos:
+        Todo o catálogo é lido do armazenamento em uma única consulta, com as colunas:
         
-        - [0]: 'codigo' (Identificador único do item)
-        - [1]: 'nome_do_pregao' (Nome do pregão correspondente)
-        - [2]: 'codigo_de_negociacao' (Código usado para negociação)
-        - [3]: 'cnpj' (Cadastro Nacional da Pessoa Jurídica)
-        - [4]: 'atividade_principal' (Descrição da atividade principal)
-        - [5]: 'classificacao_setorial' (Classificação do setor econômico)
-        - [6]: 'escriturador' (Nome do escriturador responsável)
-
-        A função trata erros ao tentar ler arquivos, imprimindo uma mensagem no console 
-        caso ocorra algum problema, mas a execução continuará para os demais arquivos.
+        - 'codigo' (Identificador único do item)
+        - 'nome_do_pregao' (Nome do pregão correspondente)
+        - 'codigo_de_negociacao' (Código usado para negociação)
+        - 'cnpj' (Cadastro Nacional da Pessoa Jurídica)
+        - 'atividade_principal' (Descrição da atividade principal)
+        - 'classificacao_setorial' (Classificação do setor econômico)
+        - 'escriturador' (Nome do escriturador responsável)
 
         :return: Um DataFrame contendo os dados coletados, com colunas correspondentes
                 aos atributos relevantes.
         """
-        lista = []
-        erros = []
-        for codigo in listdir(self.path_extracted_data):
-            path_infos_codigo = join(self.path_extracted_data, codigo, f'infos_{codigo}.txt') 
-            if exists(path_infos_codigo):
-                try:
-                    with open(path_infos_codigo, 'r', encoding='utf-8') as file:
-                        data = eval(file.read())
-                        lista.append(data)
-                except OSError as e:
-                    erros.append(codigo)
-                    print(f"Erro ao ler o arquivo {path_infos_codigo}: {e}")
-        if erros:
-            print(f'Erros ao ler os arquivos: {erros}')
-
-        headers = ['codigo', 'nome_do_pregao', 'codigo_de_negociacao', 'cnpj', 'atividade_principal', 
-                   'classificacao_setorial', 'escriturador']
-        
-        return DataFrame(lista, columns=headers)
+        return self.armazenamento.ler_tabela()[CAMPOS]
 
     
     def run(self) -> None:
@@ -96,5 +70,6 @@ class Transform:
 
         
 if __name__ == '__main__':
-    transform = Transform(config.path_extracted_data, config.path_processed_data)
+    armazenamento = ArmazenamentoEmpresas(config.path_banco, config.path_extracted_data, config.path_registros)
+    transform = Transform(armazenamento, config.path_processed_data)
     transform.run()
@@ -0,0 +1,127 @@
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+import sys
+import config
+from armazenamento import ArmazenamentoEmpresas
+from extract_empresas_listadas_informacoes_link import Extract, ExtractAPI
+from registros import CAMPOS, carregar_registros
+
+__python__ = 3.10
+
+# Campos comparados com o catálogo extraído da página
+CAMPOS_COMPARADOS = ['nome_do_pregao', 'codigo_de_negociacao', 'cnpj', 'escriturador']
+
+
+def codigos_com_fixture(path_fixtures: str, catalogo: dict) -> list:
+    """
+    Códigos do catálogo cuja URL tem uma resposta gravada na pasta de fixtures.
+
+    :param path_fixtures: Pasta das respostas gravadas (``<codigo_cvm>.json``).
+    :param catalogo: Registros do catálogo, por código (ver ``registros.carregar_registros``).
+    :return: Códigos com fixture, na ordem do catálogo.
+    """
+    cvms = {file[:-len('.json')] for file in listdir(path_fixtures) if file.endswith('.json')}
+    return [codigo for codigo, registro in catalogo.items()
+            if any(f'/main/{cvm}/' in (registro.get('url') or '') for cvm in cvms)]
+
+
+def extrair(criar_extract, codigos: list, catalogo: dict) -> dict:
+    """
+    Executa um extrator sobre um armazenamento temporário com as URLs dos códigos.
+
+    :param criar_extract: Função ``criar_extract(armazenamento, path_checkpoint)`` que cria o extrator.
+    :param codigos: Códigos a extrair.
+    :param catalogo: Registros do catálogo, por código (de onde vêm as URLs).
+    :return: Registro gravado de cada código, na ordem de ``CAMPOS`` (None se não foi gravado).
+    """
+    with TemporaryDirectory() as tmp:
+        armazenamento = ArmazenamentoEmpresas(join(tmp, 'empresas.sqlite'))
+        for codigo in codigos:
+            armazenamento.salvar_url(codigo, catalogo[codigo]['url'])
+        extract = criar_extract(armazenamento, join(tmp, 'checkpoint.json'))
+        extract.run(n_trabalhadores=1)
+        extraidos = {codigo: armazenamento.get_infos(codigo) for codigo in codigos}
+        armazenamento.fechar()
+    return extraidos
+
+
+def reproduzir(path_fixtures: str, catalogo: dict) -> dict:
+    """
+    Reproduz as respostas gravadas pelo caminho completo do modo 'api' (``modo_fixtures='reproduzir'``).
+
+    As URLs das empresas com fixture são copiadas para um armazenamento temporário, e cada código
+    passa por ``ExtractAPI.run`` (código CVM da URL, leitura da fixture, ``montar_infos`` e gravação).
+
+    :param path_fixtures: Pasta das respostas gravadas (``<codigo_cvm>.json``).
+    :param catalogo: Registros do catálogo, por código (ver ``registros.carregar_registros``).
+    :return: Registro reproduzido de cada código, na ordem de ``CAMPOS``.
+    """
+    return extrair(lambda armazenamento, path_checkpoint: ExtractAPI(
+        armazenamento, path_checkpoint=path_checkpoint, path_fixtures=path_fixtures, modo_fixtures='reproduzir'),
+        codigos_com_fixture(path_fixtures, catalogo), catalogo)
+
+
+def extrair_paginas(codigos: list, catalogo: dict) -> dict:
+    """
+    Lê as páginas das empresas pelo navegador (modo Selenium, ``XPATHS_CAMPOS``).
+
+    Requer o Chrome e acesso ao site da B3.
+
+    :param codigos: Códigos a extrair.
+    :param catalogo: Registros do catálogo, por código (de onde vêm as URLs).
+    :return: Registro lido de cada código, na ordem de ``CAMPOS``.
+    """
+    return extrair(lambda armazenamento, path_checkpoint: Extract(armazenamento, path_checkpoint=path_checkpoint),
+                   codigos, catalogo)
+
+
+def divergencias(codigo: str, infos: list, registro: dict, campos: list = CAMPOS_COMPARADOS,
+                 origem: str = 'catálogo') -> list:
+    """
+    Compara um registro reproduzido com o registro do catálogo, campo a campo.
+
+    Um registro com os campos deslocados (ex.: o CNPJ gravado em ``atividade_principal``) é uma
+    divergência como outra qualquer; a mensagem apenas indica o deslocamento.
+
+    :param codigo: Código da empresa.
+    :param infos: Registro reproduzido, na ordem de ``CAMPOS`` (ou None, se não foi gravado).
+    :param registro: Registro do catálogo.
+    :param campos: Campos comparados.
+    :param origem: Origem de ``registro``, citada nas mensagens.
+    :return: Descrição de cada divergência.
+    """
+    if infos is None:
+        return [f'{codigo}: registro não gravado']
+    reproduzido = dict(zip(CAMPOS, infos))
+    erros = []
+    for campo in campos:
+        if reproduzido[campo] == (registro.get(campo) or ''):
+            continue
+        erro = f"{codigo}.{campo}: {reproduzido[campo]!r} != {registro.get(campo)!r} ({origem})"
+        if campo == 'cnpj' and (reproduzido['cnpj'] == registro.get('atividade_principal')
+                                or reproduzido['atividade_principal'] == registro.get('cnpj')):
+            erro += ', campos deslocados (CNPJ e atividade principal em colunas diferentes)'
+        erros.append(erro)
+    return erros
+
+
+if __name__ == '__main__':
+    # Uso: python verificar_fixtures_api.py [selenium]
+    catalogo = carregar_registros(config.path_registros)
+    reproduzidos = reproduzir(config.path_fixtures_api, catalogo)
+    if sys.argv[1:] == ['selenium']:
+        # Compara todos os campos lidos da página pelo navegador com as respostas gravadas
+        referencia = {codigo: dict(zip(CAMPOS, infos)) for codigo, infos in reproduzidos.items() if infos}
+        comparados = extrair_paginas(list(referencia), catalogo)
+        erros = [erro for codigo, infos in comparados.items()
+                 for erro in divergencias(codigo, infos, referencia[codigo], CAMPOS[1:], 'API')]
+    else:
+        comparados = reproduzidos
+        erros = [erro for codigo, infos in comparados.items()
+                 for erro in divergencias(codigo, infos, catalogo[codigo])]
+
+    print(f'\nFixtures reproduzidas: {len(reproduzidos)}, comparadas: {len(comparados)}, divergências: {len(erros)}')
+    for erro in erros:
+        print(f'  {erro}')
+    sys.exit(1 if erros or not comparados else 0)
@@ -0,0 +1,8 @@
+"""
+Módulos compartilhados entre os scripts de extração da B3.
+
+Os scripts de cada pasta (``1. Índices de Segmentos e Setoriais``, ``2. Horário de negociação``,
+``3. Empresas listadas``) importam este pacote depois de ``import config``, que adiciona a pasta
+``scripts`` ao ``sys.path``. A sessão HTTP e o cache em disco ficam no pacote ``b3_dados``
+(``b3_dados.http``), na raiz do repositório, que o ``config`` também adiciona ao ``sys.path``.
+"""
@@ -0,0 +1,200 @@
+from typing import Callable, Iterator, List, Optional
+
+from lxml import etree
+
+__python__ = 3.10
+
+# Tamanho dos blocos de texto entregues ao parser incremental
+TAMANHO_BLOCO = 64 * 1024
+
+# Elementos sem conteúdo, serializados como ``<br/>`` (como o BeautifulSoup faz)
+ELEMENTOS_VAZIOS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                    'param', 'source', 'track', 'wbr'}
+
+# Elementos cujo conteúdo não é texto da página (ignorados, como em ``get_text`` do BeautifulSoup)
+ELEMENTOS_SEM_TEXTO = {'script', 'style', 'template'}
+
+
+def iterar_elementos(texto: str, condicao: Callable[[etree._Element], bool],
+                     tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[etree._Element]:
+    """
+    Percorre um documento HTML e retorna, um a um, os elementos que satisfazem a condição.
+
+    O documento é entregue em blocos a um parser incremental do lxml (``HTMLPullParser``), e a
+    árvore não é mantida: todo elemento fora de uma seleção é esvaziado assim que termina. Só
+    a subárvore de cada elemento selecionado é montada por completo. Se a iteração for
+    interrompida (``break``, ``next``), o restante do documento nem chega a ser analisado.
+
+    A condição é avaliada na abertura de cada elemento (tag e atributos já disponíveis, mas
+    não o conteúdo). Quando elementos selecionados estão aninhados, apenas o mais externo
+    é retornado.
+
+    Args:
+        texto (str): Documento HTML.
+        condicao (Callable): Recebe o elemento e retorna True se ele deve ser selecionado.
+        tamanho_bloco (int): Quantidade de caracteres entregue ao parser por vez.
+
+    Yields:
+        etree._Element: Elemento completo (com a subárvore). Ele é esvaziado quando a
+        iteração avança, então deve ser usado (ou serializado) antes disso.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    selecionados: List[etree._Element] = []
+
+    def eventos() -> Iterator[etree._Element]:
+        for evento, elemento in parser.read_events():
+            if evento == 'start':
+                if condicao(elemento):
+                    selecionados.append(elemento)
+                continue
+            if selecionados and selecionados[-1] is elemento:
+                selecionados.pop()
+                if selecionados:
+                    continue
+                yield elemento
+            elif selecionados:
+                continue
+            # Fora de uma seleção: descarta o conteúdo e os irmãos anteriores já processados
+            elemento.clear(keep_tail=False)
+            pai = elemento.getparent()
+            if pai is not None:
+                while elemento.getprevious() is not None:
+                    del pai[0]
+
+    for inicio in range(0, len(texto), tamanho_bloco):
+        parser.feed(texto[inicio:inicio + tamanho_bloco])
+        yield from eventos()
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        return  # documento vazio
+    yield from eventos()
+
+
+def texto_elemento(elemento: Optional[etree._Element]) -> str:
+    """
+    Texto de um elemento, equivalente a ``get_text(strip=True)`` do BeautifulSoup.
+
+    Cada trecho de texto é aparado e os trechos são concatenados sem separador. Comentários
+    e o conteúdo de ``ELEMENTOS_SEM_TEXTO`` são ignorados.
+
+    Args:
+        elemento (etree._Element, optional): Elemento (ou None, para um documento vazio).
+
+    Returns:
+        str: Texto do elemento.
+    """
+    if elemento is None:
+        return ''
+    partes: List[str] = []
+    _trechos(elemento, partes)
+    return ''.join(partes)
+
+
+def _trechos(elemento: etree._Element, partes: List[str]) -> None:
+    if elemento.tag in ELEMENTOS_SEM_TEXTO:
+        return
+    if elemento.text:
+        partes.append(elemento.text.strip())
+    for filho in elemento:
+        if isinstance(filho.tag, str):  # comentários e instruções de processamento não têm texto
+            _trechos(filho, partes)
+        if filho.tail:
+            partes.append(filho.tail.strip())
+
+
+def serializar(elemento: etree._Element) -> str:
+    """
+    Marcação HTML de um elemento, no mesmo formato de ``str(tag)`` do BeautifulSoup.
+
+    Elementos vazios de ``ELEMENTOS_VAZIOS`` saem como ``<br/>``, e os demais como
+    ``<span></span>``. O elemento é alterado (recebe texto vazio onde não havia texto).
+
+    Args:
+        elemento (etree._Element): Elemento a serializar (sem o texto que o segue).
+
+    Returns:
+        str: Marcação do elemento.
+    """
+    for no in elemento.iter(tag=etree.Element):
+        if no.tag not in ELEMENTOS_VAZIOS and no.text is None and not len(no):
+            no.text = ''
+    return etree.tostring(elemento, encoding='unicode', method='xml', with_tail=False)
+
+
+def links(texto: str, contem: str) -> List[str]:
+    """
+    ``href`` dos links cuja marcação contém um trecho (sem diferenciar maiúsculas).
+
+    Args:
+        texto (str): Documento HTML.
+        contem (str): Trecho procurado no link (texto ou atributos, ex.: ``'saiba mais sobre'``).
+
+    Returns:
+        list: Valores de ``href``, na ordem do documento.
+    """
+    contem = contem.lower()
+    encontrados = []
+    for link in iterar_elementos(texto, lambda elemento: elemento.tag == 'a' and 'href' in elemento.attrib):
+        if contem in serializar(link).lower():
+            encontrados.append(link.get('href'))
+    return encontrados
+
+
+def fragmentos_por_id(texto: str, *ids: str) -> str:
+    """
+    Marcação dos elementos com o primeiro ``id`` encontrado, em uma única passagem.
+
+    Equivale a ``soup.find_all(id=ids[0]) or soup.find_all(id=ids[1]) or ...`` seguido da
+    concatenação de ``str(tag)``.
+
+    Args:
+        texto (str): Documento HTML.
+        *ids (str): Identificadores, em ordem de preferência (ex.: ``'panel3a', 'panel1a'``).
+
+    Returns:
+        str: Marcação concatenada (vazia se nenhum identificador existir).
+    """
+    fragmentos = {id_: [] for id_ in ids}
+    for elemento in iterar_elementos(texto, lambda elemento: elemento.get('id') in fragmentos):
+        fragmentos[elemento.get('id')].append(serializar(elemento))
+    for id_ in ids:
+        if fragmentos[id_]:
+            return ''.join(fragmentos[id_])
+    return ''
+
+
+def linhas_primeira_tabela(texto: str) -> Optional[List[List[str]]]:
+    """
+    Textos das células ``<td>`` de cada linha da primeira tabela, sem a primeira linha.
+
+    A análise termina no fim da primeira tabela; o restante da página não é lido.
+
+    Args:
+        texto (str): Documento HTML.
+
+    Returns:
+        list: Uma lista de textos por linha (linhas sem ``<td>`` são omitidas), ou None se
+        a página não tiver tabela.
+    """
+    for tabela in iterar_elementos(texto, lambda elemento: elemento.tag == 'table'):
+        linhas = []
+        for tr in list(tabela.iter('tr'))[1:]:
+            linha = [texto_elemento(td) for td in tr.iter('td')]
+            if linha:
+                linhas.append(linha)
+        return linhas
+    return None
+
+
+def texto_documento(texto: str) -> str:
+    """
+    Texto de um documento HTML inteiro, equivalente a ``BeautifulSoup(texto).get_text(strip=True)``.
+
+    Args:
+        texto (str): Documento (ou fragmento) HTML.
+
+    Returns:
+        str: Texto do documento.
+    """
+    return texto_elemento(etree.fromstring(texto, etree.HTMLParser()))
@@ -0,0 +1,121 @@
+from base64 import b64decode
+from typing import Any, Callable, Dict, List, Optional
+import json
+import re
+
+from comum.esperas import aguardar
+
+__python__ = 3.10
+
+
+class CapturaRede:
+    """
+    Captura as respostas de requisições feitas pela página, a partir do log de desempenho do Chrome.
+
+    Com ``opcoes_chrome(captura_rede=True)``, o ChromeDriver registra os eventos de rede do
+    DevTools (``Network.responseReceived``, ``Network.loadingFinished``, ...). Esta classe lê
+    esses eventos com ``driver.get_log('performance')``, seleciona as respostas cujo URL casa
+    com um dos padrões e obtém o corpo de cada uma com ``Network.getResponseBody``. Assim, os
+    dados chegam exatamente como o aplicativo Angular os recebeu, sem depender do DOM.
+
+    Attributes:
+        driver (webdriver.Chrome): Navegador com o log de desempenho habilitado.
+        padroes (Dict[str, re.Pattern]): Nome -> expressão regular aplicada ao URL da resposta.
+        respostas (List[Dict]): Respostas capturadas e ainda não consumidas por ``aguardar``.
+
+    Methods:
+        ``limpar() -> None``:
+            Descarta os eventos e as respostas acumulados até agora.
+
+        ``coletar() -> List[Dict]``:
+            Lê os eventos novos e retorna as respostas concluídas.
+
+        ``aguardar(nome: str, condicao: Callable = None, timeout: float = 30) -> Dict``:
+            Aguarda (e consome) uma resposta capturada.
+    """
+
+    def __init__(self, driver, padroes: Dict[str, str]):
+        """
+        Inicializa a captura.
+
+        Args:
+            driver (webdriver.Chrome): Navegador com o log de desempenho habilitado.
+            padroes (dict): Nome -> expressão regular do URL (ex.: ``{'detalhe': r'/GetDetail/'}``).
+        """
+        self.driver = driver
+        self.padroes = {nome: re.compile(padrao) for nome, padrao in padroes.items()}
+        self.respostas: List[Dict[str, Any]] = []
+        self._pendentes: Dict[str, Dict[str, Any]] = {}
+
+    def limpar(self) -> None:
+        """Descarta os eventos e as respostas acumulados (chamado antes de uma nova navegação)."""
+        self.driver.get_log('performance')
+        self.respostas.clear()
+        self._pendentes.clear()
+
+    def _corpo(self, id_requisicao: str) -> str:
+        corpo = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': id_requisicao})
+        if corpo.get('base64Encoded'):
+            return b64decode(corpo['body']).decode('utf-8')
+        return corpo['body']
+
+    def coletar(self) -> List[Dict[str, Any]]:
+        """
+        Lê os eventos novos do log e retorna as respostas concluídas desde a última leitura.
+
+        Cada resposta é um dicionário com ``nome`` (do padrão), ``url``, ``status`` e ``corpo``
+        (texto original da resposta). As respostas também são acumuladas em ``respostas``.
+
+        Returns:
+            list: Respostas concluídas nesta leitura.
+        """
+        novas = []
+        for entrada in self.driver.get_log('performance'):
+            mensagem = json.loads(entrada['message'])['message']
+            metodo, parametros = mensagem.get('method'), mensagem.get('params', {})
+            if metodo == 'Network.responseReceived':
+                url = parametros['response']['url']
+                for nome, padrao in self.padroes.items():
+                    if padrao.search(url):
+                        self._pendentes[parametros['requestId']] = {
+                            'nome': nome, 'url': url, 'status': parametros['response'].get('status')}
+                        break
+            elif metodo == 'Network.loadingFinished' and parametros.get('requestId') in self._pendentes:
+                resposta = self._pendentes.pop(parametros['requestId'])
+                try:
+                    resposta['corpo'] = self._corpo(parametros['requestId'])
+                except Exception as e:
+                    print(f"Corpo indisponível para {resposta['url']}: {e}")
+                    continue
+                novas.append(resposta)
+            elif metodo == 'Network.loadingFailed':
+                self._pendentes.pop(parametros.get('requestId'), None)
+        self.respostas.extend(novas)
+        return novas
+
+    def aguardar(self, nome: str, condicao: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 timeout: float = 30) -> Dict[str, Any]:
+        """
+        Aguarda uma resposta capturada do padrão ``nome`` e a remove de ``respostas``.
+
+        Args:
+            nome (str): Nome do padrão.
+            condicao (Callable, optional): Filtro adicional sobre a resposta (ex.: parâmetros do URL).
+            timeout (float): Tempo limite, em segundos.
+
+        Returns:
+            dict: A resposta (``nome``, ``url``, ``status``, ``corpo``).
+
+        Raises:
+            TempoEsgotado: Se nenhuma resposta correspondente chegar dentro do tempo limite.
+        """
+        def encontrada() -> Optional[Dict[str, Any]]:
+            self.coletar()
+            for resposta in self.respostas:
+                if resposta['nome'] == nome and (condicao is None or condicao(resposta)):
+                    self.respostas.remove(resposta)
+                    return resposta
+            return None
+
+        return aguardar(encontrada, timeout, intervalo=0.05, intervalo_maximo=0.25,
+                        descricao=f'resposta {nome}')
@@ -0,0 +1,157 @@
+import json
+from os import remove, replace
+from os.path import exists
+from threading import Lock
+from typing import Any, Dict, Set
+
+__python__ = 3.10
+
+
+class Checkpoint:
+    """
+    Estado persistente de um processo de extração, para retomada após falhas.
+
+    O estado é gravado em JSON (de forma atômica, via arquivo temporário) e guarda os
+    itens já concluídos, a quantidade de falhas por item e, para processos sequenciais
+    (como a navegação página a página), a posição atual. Os métodos são seguros para
+    uso por várias threads.
+
+    Attributes:
+        path (str): Caminho do arquivo JSON do checkpoint.
+        salvar_a_cada (int): Quantidade de alterações entre gravações automáticas.
+        concluidos (set): Itens concluídos.
+        falhas (dict): Quantidade de falhas por item.
+        posicao (dict): Posição atual de um processo sequencial (ex.: ``{'pagina': 3, 'item': 7}``).
+
+    Methods:
+        ``marcar_concluido(item: str) -> None``:
+            Registra um item como concluído.
+
+        ``registrar_falha(item: str) -> int``:
+            Incrementa e retorna a quantidade de falhas de um item.
+
+        ``remover_falhas(item: str) -> None``:
+            Zera a quantidade de falhas de um item (ex.: uma posição que voltou a funcionar).
+
+        ``atualizar_posicao(**valores) -> None``:
+            Registra a posição atual do processo.
+
+        ``salvar() -> None``:
+            Grava o estado atual no disco.
+
+        ``limpar() -> None``:
+            Apaga o checkpoint (usado quando o processo termina sem pendências).
+    """
+
+    def __init__(self, path: str, salvar_a_cada: int = 10):
+        """
+        Inicializa o checkpoint, carregando o estado salvo, se existir.
+
+        Args:
+            path (str): Caminho do arquivo JSON do checkpoint.
+            salvar_a_cada (int): Quantidade de alterações entre gravações automáticas.
+        """
+        self.path = path
+        self.salvar_a_cada = salvar_a_cada
+        self.concluidos: Set[str] = set()
+        self.falhas: Dict[str, int] = {}
+        self.posicao: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._alteracoes = 0
+        self.carregar()
+
+    def carregar(self) -> None:
+        """
+        Carrega o estado salvo no disco, se existir.
+        """
+        if not exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as file:
+            estado = json.load(file)
+        self.concluidos = set(estado.get('concluidos', []))
+        self.falhas = dict(estado.get('falhas', {}))
+        self.posicao = dict(estado.get('posicao', {}))
+        print(f'Checkpoint carregado: {self.path} ({len(self.concluidos)} itens concluídos)')
+
+    def _estado(self) -> Dict[str, Any]:
+        return {'concluidos': sorted(self.concluidos), 'falhas': self.falhas, 'posicao': self.posicao}
+
+    def _registrar_alteracao(self) -> None:
+        self._alteracoes += 1
+        if self._alteracoes >= self.salvar_a_cada:
+            self._gravar()
+
+    def _gravar(self) -> None:
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as file:
+            json.dump(self._estado(), file, ensure_ascii=False)
+        replace(tmp, self.path)
+        self._alteracoes = 0
+
+    def marcar_concluido(self, item: str) -> None:
+        """
+        Registra um item como concluído.
+
+        Args:
+            item (str): Item concluído.
+        """
+        with self._lock:
+            self.concluidos.add(item)
+            self.falhas.pop(item, None)
+            self._registrar_alteracao()
+
+    def registrar_falha(self, item: str) -> int:
+        """
+        Incrementa a quantidade de falhas de um item.
+
+        Args:
+            item (str): Item que falhou.
+
+        Returns:
+            int: Quantidade total de falhas do item.
+        """
+        with self._lock:
+            self.falhas[item] = self.falhas.get(item, 0) + 1
+            self._registrar_alteracao()
+            return self.falhas[item]
+
+    def remover_falhas(self, item: str) -> None:
+        """
+        Zera a quantidade de falhas de um item, sem marcá-lo como concluído.
+
+        Args:
+            item (str): Item que voltou a funcionar.
+        """
+        with self._lock:
+            if self.falhas.pop(item, None) is not None:
+                self._registrar_alteracao()
+
+    def atualizar_posicao(self, **valores) -> None:
+        """
+        Registra a posição atual de um processo sequencial.
+
+        Args:
+            **valores: Campos da posição (ex.: ``pagina=3, item=7``).
+        """
+        with self._lock:
+            self.posicao.update(valores)
+            self._registrar_alteracao()
+
+    def salvar(self) -> None:
+        """
+        Grava o estado atual no disco.
+        """
+        with self._lock:
+            self._gravar()
+
+    def limpar(self) -> None:
+        """
+        Apaga o checkpoint do disco e da memória.
+        """
+        with self._lock:
+            self.concluidos.clear()
+            self.falhas.clear()
+            self.posicao.clear()
+            self._alteracoes = 0
+            if exists(self.path):
+                remove(self.path)
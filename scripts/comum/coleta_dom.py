@@ -0,0 +1,86 @@
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from comum.esperas import HistogramaLatencias
+
+__python__ = 3.10
+
+# Texto do primeiro nó de cada XPath de um objeto {nome: xpath}, em uma única execução no navegador
+SCRIPT_XPATHS = """
+const inicio = performance.now();
+const dados = {};
+for (const [nome, xpath] of Object.entries(arguments[0])) {
+    const no = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    dados[nome] = no ? (no.innerText || no.textContent || '').trim() : null;
+}
+return {dados: dados, ms: performance.now() - inicio};
+"""
+
+# Texto de todos os nós de um XPath, na ordem do documento
+SCRIPT_TEXTOS = """
+const inicio = performance.now();
+const nos = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const dados = [];
+for (let i = 0; i < nos.snapshotLength; i++) {
+    const no = nos.snapshotItem(i);
+    dados.push((no.innerText || no.textContent || '').trim());
+}
+return {dados: dados, ms: performance.now() - inicio};
+"""
+
+
+def coletar(driver, script: str, *argumentos, latencias: Optional[HistogramaLatencias] = None,
+            etapa: str = 'coletar') -> Any:
+    """
+    Executa um script de coleta no navegador em uma única ida e volta ao WebDriver.
+
+    O script deve retornar ``{dados, ms}``, onde ``ms`` é o tempo gasto dentro do navegador.
+    Com ``latencias``, são registradas duas medições: ``etapa`` (ida e volta completa) e
+    ``etapa (navegador)`` (execução do script); a diferença é o custo do protocolo do WebDriver.
+
+    Args:
+        driver (webdriver.Chrome): Navegador.
+        script (str): Script JavaScript (ex.: ``SCRIPT_XPATHS``).
+        *argumentos: Argumentos repassados ao script (``arguments[0]``, ...).
+        latencias (HistogramaLatencias, optional): Onde registrar as durações.
+        etapa (str): Nome da etapa registrada.
+
+    Returns:
+        Any: O valor de ``dados`` retornado pelo script.
+    """
+    inicio = monotonic()
+    resultado = driver.execute_script(script, *argumentos)
+    if latencias is not None:
+        latencias.registrar(etapa, monotonic() - inicio)
+        latencias.registrar(f'{etapa} (navegador)', resultado['ms'] / 1000)
+    return resultado['dados']
+
+
+def coletar_xpaths(driver, campos: Dict[str, str], **kwargs) -> Dict[str, Optional[str]]:
+    """
+    Texto de vários elementos, identificados por XPath, em uma única chamada ao navegador.
+
+    Args:
+        driver (webdriver.Chrome): Navegador.
+        campos (dict): Nome do campo -> XPath.
+        **kwargs: ``latencias`` e ``etapa`` (ver ``coletar``).
+
+    Returns:
+        dict: Nome do campo -> texto (None se o elemento não existir).
+    """
+    return coletar(driver, SCRIPT_XPATHS, campos, **kwargs)
+
+
+def coletar_textos(driver, xpath: str, **kwargs) -> List[str]:
+    """
+    Texto de todos os elementos de um XPath, na ordem do documento, em uma única chamada.
+
+    Args:
+        driver (webdriver.Chrome): Navegador.
+        xpath (str): XPath dos elementos.
+        **kwargs: ``latencias`` e ``etapa`` (ver ``coletar``).
+
+    Returns:
+        list: Textos dos elementos.
+    """
+    return coletar(driver, SCRIPT_TEXTOS, xpath, **kwargs)
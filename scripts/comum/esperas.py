@@ -0,0 +1,316 @@
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from os import listdir
+from os.path import getsize, join
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import requests
+
+__python__ = 3.10
+
+# Extensões de arquivos parciais gravados pelo Chrome (e pelo Firefox) durante o download
+EXTENSOES_PARCIAIS = ('.crdownload', '.part', '.tmp')
+
+# Limites (em segundos) das faixas do histograma de latências
+FAIXAS_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+# Conta os recursos carregados pela página (documento, scripts, XHR/fetch)
+SCRIPT_RECURSOS = "return window.performance.getEntriesByType('resource').length;"
+
+
+class TempoEsgotado(TimeoutError):
+    """
+    A condição esperada não foi satisfeita dentro do tempo limite.
+    """
+
+
+class HistogramaLatencias:
+    """
+    Registra a duração de cada etapa de um processo e resume a distribuição por etapa.
+
+    As durações são agrupadas nas faixas de ``FAIXAS_LATENCIA`` e guardadas integralmente
+    para o cálculo de percentis. Os métodos são seguros para uso por várias threads.
+
+    Attributes:
+        faixas (tuple): Limites superiores das faixas do histograma, em segundos.
+
+    Methods:
+        ``registrar(etapa: str, segundos: float) -> None``:
+            Registra a duração de uma etapa.
+
+        ``medir(etapa: str)``:
+            Gerenciador de contexto que registra a duração do bloco.
+
+        ``resumo() -> Dict[str, Dict[str, float]]``:
+            Contagem, total, p50, p95 e máximo de cada etapa.
+
+        ``histograma(etapa: str) -> Dict[str, int]``:
+            Quantidade de medições em cada faixa.
+
+        ``imprimir() -> None``:
+            Imprime o resumo de todas as etapas.
+    """
+
+    def __init__(self, faixas: Iterable[float] = FAIXAS_LATENCIA):
+        """
+        Inicializa o histograma.
+
+        Args:
+            faixas (iterable): Limites superiores das faixas, em segundos, em ordem crescente.
+        """
+        self.faixas = tuple(faixas)
+        self._duracoes: Dict[str, List[float]] = defaultdict(list)
+        self._lock = Lock()
+
+    def registrar(self, etapa: str, segundos: float) -> None:
+        """
+        Registra a duração de uma etapa.
+
+        Args:
+            etapa (str): Nome da etapa (ex.: ``download``).
+            segundos (float): Duração medida.
+        """
+        with self._lock:
+            self._duracoes[etapa].append(segundos)
+
+    @contextmanager
+    def medir(self, etapa: str):
+        """
+        Registra a duração do bloco ``with`` (mesmo se ele levantar uma exceção).
+
+        Args:
+            etapa (str): Nome da etapa.
+        """
+        inicio = monotonic()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, monotonic() - inicio)
+
+    def resumo(self) -> Dict[str, Dict[str, float]]:
+        """
+        Contagem, total, p50, p95 e máximo de cada etapa.
+
+        Returns:
+            dict: Etapa -> {``n``, ``total``, ``p50``, ``p95``, ``max``} (em segundos).
+        """
+        with self._lock:
+            duracoes = {etapa: sorted(valores) for etapa, valores in self._duracoes.items()}
+        return {
+            etapa: {
+                'n': len(valores),
+                'total': sum(valores),
+                'p50': valores[len(valores) // 2],
+                'p95': valores[min(len(valores) - 1, int(len(valores) * 0.95))],
+                'max': valores[-1],
+            }
+            for etapa, valores in duracoes.items() if valores
+        }
+
+    def histograma(self, etapa: str) -> Dict[str, int]:
+        """
+        Quantidade de medições de uma etapa em cada faixa.
+
+        Args:
+            etapa (str): Nome da etapa.
+
+        Returns:
+            dict: Rótulo da faixa (ex.: ``<=0.5s``, ``>60s``) -> quantidade.
+        """
+        rotulos = [f'<={limite}s' for limite in self.faixas] + [f'>{self.faixas[-1]}s']
+        contagem = [0] * len(rotulos)
+        with self._lock:
+            for segundos in self._duracoes.get(etapa, []):
+                contagem[bisect_left(self.faixas, segundos)] += 1
+        return dict(zip(rotulos, contagem))
+
+    def imprimir(self) -> None:
+        """Imprime o resumo de todas as etapas."""
+        resumo = self.resumo()
+        if not resumo:
+            return
+        print(f"\n{'Etapa':<28}{'n':>6}{'total (s)':>11}{'p50 (s)':>10}{'p95 (s)':>10}{'máx (s)':>10}")
+        for etapa, valores in sorted(resumo.items()):
+            print(f"{etapa:<28}{valores['n']:>6}{valores['total']:>11.2f}{valores['p50']:>10.3f}"
+                  f"{valores['p95']:>10.3f}{valores['max']:>10.3f}")
+
+
+def aguardar(condicao: Callable[[], Any], timeout: float = 10, intervalo: float = 0.05,
+             intervalo_maximo: float = 0.5, descricao: str = 'condição') -> Any:
+    """
+    Repete ``condicao()`` até que retorne um valor verdadeiro.
+
+    O intervalo entre as verificações começa em ``intervalo`` e dobra até ``intervalo_maximo``:
+    condições rápidas são detectadas em poucos milissegundos sem sobrecarregar o navegador
+    nas esperas longas. Exceções da condição contam como "ainda não".
+
+    Args:
+        condicao (Callable): Função sem argumentos.
+        timeout (float): Tempo limite, em segundos.
+        intervalo (float): Intervalo inicial entre verificações, em segundos.
+        intervalo_maximo (float): Intervalo máximo entre verificações, em segundos.
+        descricao (str): Descrição usada na mensagem de erro.
+
+    Returns:
+        Any: O primeiro valor verdadeiro retornado pela condição.
+
+    Raises:
+        TempoEsgotado: Se a condição não for satisfeita dentro do tempo limite.
+    """
+    limite = monotonic() + timeout
+    ultimo_erro = None
+    while True:
+        try:
+            resultado = condicao()
+            if resultado:
+                return resultado
+        except Exception as e:
+            ultimo_erro = e
+        restante = limite - monotonic()
+        if restante <= 0:
+            detalhe = f' (último erro: {ultimo_erro})' if ultimo_erro else ''
+            raise TempoEsgotado(f'Tempo esgotado ({timeout}s) aguardando {descricao}{detalhe}')
+        sleep(min(intervalo, restante))
+        intervalo = min(intervalo * 2, intervalo_maximo)
+
+
+def arquivos_concluidos(diretorio: str) -> Set[str]:
+    """
+    Arquivos do diretório, sem os downloads em andamento.
+
+    Args:
+        diretorio (str): Diretório de download.
+
+    Returns:
+        set: Nomes dos arquivos sem extensão de arquivo parcial.
+    """
+    return {file for file in listdir(diretorio) if not file.endswith(EXTENSOES_PARCIAIS)}
+
+
+def arquivos_parciais(diretorio: str) -> Set[str]:
+    """
+    Downloads em andamento (ou abandonados) no diretório.
+
+    Args:
+        diretorio (str): Diretório de download.
+
+    Returns:
+        set: Nomes dos arquivos com extensão de arquivo parcial.
+    """
+    return {file for file in listdir(diretorio) if file.endswith(EXTENSOES_PARCIAIS)}
+
+
+def aguardar_download(diretorio: str, anteriores: Set[str], timeout: float = 60,
+                      estabilidade: float = 0.2, parciais_anteriores: Optional[Set[str]] = None) -> str:
+    """
+    Aguarda a conclusão de um download iniciado no navegador.
+
+    O Chrome grava o arquivo como ``<nome>.crdownload`` e o renomeia ao terminar. O download
+    é considerado concluído quando aparece um arquivo novo (fora de ``anteriores``), não há
+    mais arquivos parciais novos no diretório e o tamanho do arquivo não muda por
+    ``estabilidade`` segundos. Arquivos parciais que já existiam antes do clique (restos de
+    uma execução interrompida) são ignorados.
+
+    Args:
+        diretorio (str): Diretório de download do navegador.
+        anteriores (set): Arquivos existentes antes do clique (ver ``arquivos_concluidos``).
+        timeout (float): Tempo limite, em segundos.
+        estabilidade (float): Tempo, em segundos, sem mudança de tamanho para aceitar o arquivo.
+        parciais_anteriores (set, optional): Arquivos parciais existentes antes do clique (ver
+            ``arquivos_parciais``). Se omitido, são os existentes no início da espera.
+
+    Returns:
+        str: Nome do arquivo baixado.
+
+    Raises:
+        TempoEsgotado: Se nenhum download terminar dentro do tempo limite.
+    """
+    tamanhos = {}
+    if parciais_anteriores is None:
+        parciais_anteriores = arquivos_parciais(diretorio)
+
+    def concluido() -> Optional[str]:
+        arquivos = listdir(diretorio)
+        if any(file.endswith(EXTENSOES_PARCIAIS) and file not in parciais_anteriores for file in arquivos):
+            return None
+        novos = sorted(set(arquivos) - anteriores - parciais_anteriores)
+        if not novos:
+            return None
+        tamanho = getsize(join(diretorio, novos[0]))
+        agora = monotonic()
+        anterior = tamanhos.get(novos[0])
+        if anterior is None or anterior[0] != tamanho:
+            tamanhos[novos[0]] = (tamanho, agora)
+            return None
+        return novos[0] if agora - anterior[1] >= estabilidade else None
+
+    return aguardar(concluido, timeout, intervalo=0.05, intervalo_maximo=0.2,
+                    descricao=f'download em {diretorio}')
+
+
+def aguardar_documento_pronto(driver, timeout: float = 30) -> None:
+    """
+    Aguarda ``document.readyState == 'complete'``.
+
+    Args:
+        driver (webdriver.Chrome): Navegador.
+        timeout (float): Tempo limite, em segundos.
+
+    Raises:
+        TempoEsgotado: Se o documento não terminar de carregar dentro do tempo limite.
+    """
+    aguardar(lambda: driver.execute_script('return document.readyState') == 'complete', timeout,
+             descricao='document.readyState == complete')
+
+
+def aguardar_rede_ociosa(driver, timeout: float = 30, ociosidade: float = 0.5) -> None:
+    """
+    Aguarda o fim das requisições da página (útil em aplicações Angular, que preenchem a tela
+    por XHR depois do ``load``).
+
+    A rede é considerada ociosa quando o documento está completo e a quantidade de recursos
+    registrados em ``performance.getEntriesByType('resource')`` não muda por ``ociosidade``
+    segundos.
+
+    Args:
+        driver (webdriver.Chrome): Navegador.
+        timeout (float): Tempo limite, em segundos.
+        ociosidade (float): Tempo, em segundos, sem novos recursos.
+
+    Raises:
+        TempoEsgotado: Se a página não ficar ociosa dentro do tempo limite.
+    """
+    estado = {'recursos': None, 'desde': monotonic()}
+
+    def ociosa() -> bool:
+        if driver.execute_script('return document.readyState') != 'complete':
+            estado['recursos'] = None
+            return False
+        recursos = driver.execute_script(SCRIPT_RECURSOS)
+        agora = monotonic()
+        if recursos != estado['recursos']:
+            estado['recursos'], estado['desde'] = recursos, agora
+            return False
+        return agora - estado['desde'] >= ociosidade
+
+    aguardar(ociosa, timeout, intervalo=0.05, intervalo_maximo=0.1, descricao='rede ociosa')
+
+
+def aguardar_url_disponivel(url: str, timeout: float = 60, sessao: Optional[requests.Session] = None) -> None:
+    """
+    Aguarda até que a URL responda sem erro de servidor (usado antes de reiniciar um processo
+    após uma falha, no lugar de uma espera fixa).
+
+    Args:
+        url (str): URL a verificar.
+        timeout (float): Tempo limite, em segundos.
+        sessao (requests.Session, optional): Sessão HTTP a ser usada.
+
+    Raises:
+        TempoEsgotado: Se a URL não responder dentro do tempo limite.
+    """
+    sessao = sessao or requests.Session()
+    aguardar(lambda: sessao.get(url, timeout=10).status_code < 500, timeout,
+             intervalo=1, intervalo_maximo=10, descricao=f'{url} disponível')
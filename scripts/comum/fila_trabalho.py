@@ -0,0 +1,180 @@
+from queue import Queue, Empty
+from random import uniform
+from threading import Thread, Lock
+from time import sleep
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from comum.checkpoint import Checkpoint
+
+__python__ = 3.10
+
+
+class ErroPermanente(Exception):
+    """
+    Erro que não deve gerar novas tentativas (ex.: URL inexistente para o código).
+    """
+
+
+def espera_exponencial(tentativa: int, espera_inicial: float = 2.0, espera_maxima: float = 60.0) -> float:
+    """
+    Espera antes da próxima tentativa: dobra a cada tentativa, até ``espera_maxima``, com
+    variação aleatória entre metade e o valor total (evita tentativas sincronizadas).
+
+    Args:
+        tentativa (int): Número da tentativa que falhou (a partir de 1).
+        espera_inicial (float): Espera, em segundos, após a primeira falha.
+        espera_maxima (float): Espera máxima, em segundos.
+
+    Returns:
+        float: Espera, em segundos.
+    """
+    espera = min(espera_maxima, espera_inicial * 2 ** (tentativa - 1))
+    return uniform(espera / 2, espera)
+
+
+class PoolTrabalhadores:
+    """
+    Pool de trabalhadores alimentado por uma fila compartilhada.
+
+    Cada trabalhador é uma thread com o seu próprio recurso (por exemplo, um navegador
+    ou uma sessão HTTP), criado por ``criar_recurso``. Os itens são consumidos da fila
+    até ela esvaziar. Falhas são repetidas pelo próprio trabalhador com espera exponencial
+    (com variação aleatória), e o recurso é descartado (``descartar_recurso``) e recriado
+    após cada falha. Itens que levantam ``ErroPermanente`` não são repetidos nem contam
+    como falha: vão para ``permanentes``. Quando um checkpoint
+    é informado, itens já concluídos são ignorados e cada conclusão é registrada, o que
+    permite retomar o processo após uma interrupção.
+
+    Attributes:
+        processar (Callable): Função ``processar(recurso, item)`` que executa o trabalho de um item.
+        n_trabalhadores (int): Quantidade de trabalhadores.
+        criar_recurso (Callable): Fábrica do recurso de cada trabalhador.
+        fechar_recurso (Callable): Função que libera o recurso de um trabalhador.
+        descartar_recurso (Callable): Função que libera o recurso após uma falha.
+        tentativas (int): Número máximo de tentativas por item.
+        espera_inicial (float): Espera, em segundos, antes da segunda tentativa.
+        espera_maxima (float): Espera máxima, em segundos, entre tentativas.
+        checkpoint (Checkpoint): Estado persistente para retomada.
+
+    Methods:
+        ``executar(itens: Iterable[str]) -> Dict[str, List[str]]``:
+            Processa os itens e retorna os concluídos, os que falharam e os ignorados.
+    """
+
+    def __init__(self, processar: Callable[[Any, str], None], n_trabalhadores: int = 4,
+                 criar_recurso: Optional[Callable[[], Any]] = None,
+                 fechar_recurso: Optional[Callable[[Any], None]] = None,
+                 descartar_recurso: Optional[Callable[[Any], None]] = None,
+                 tentativas: int = 3, espera_inicial: float = 2.0, espera_maxima: float = 60.0,
+                 checkpoint: Optional[Checkpoint] = None):
+        """
+        Inicializa o pool de trabalhadores.
+
+        Args:
+            processar (Callable): Função ``processar(recurso, item)``; exceções indicam falha.
+            n_trabalhadores (int): Quantidade de trabalhadores.
+            criar_recurso (Callable, optional): Fábrica do recurso de cada trabalhador.
+            fechar_recurso (Callable, optional): Função que libera o recurso de um trabalhador.
+            descartar_recurso (Callable, optional): Função que libera o recurso após uma falha.
+                Padrão é ``fechar_recurso``.
+            tentativas (int): Número máximo de tentativas por item.
+            espera_inicial (float): Espera, em segundos, antes da segunda tentativa.
+            espera_maxima (float): Espera máxima, em segundos, entre tentativas.
+            checkpoint (Checkpoint, optional): Estado persistente para retomada.
+        """
+        self.processar = processar
+        self.n_trabalhadores = n_trabalhadores
+        self.criar_recurso = criar_recurso or (lambda: None)
+        self.fechar_recurso = fechar_recurso or (lambda recurso: None)
+        self.descartar_recurso = descartar_recurso or self.fechar_recurso
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.checkpoint = checkpoint
+        self._lock = Lock()
+
+    def _espera(self, tentativa: int) -> float:
+        return espera_exponencial(tentativa, self.espera_inicial, self.espera_maxima)
+
+    def _fechar(self, recurso: Any, falhou: bool = False) -> None:
+        try:
+            (self.descartar_recurso if falhou else self.fechar_recurso)(recurso)
+        except Exception as e:
+            print(f'Erro ao liberar o recurso do trabalhador: {e}')
+
+    def _trabalhador(self, numero: int, fila: Queue, resultado: Dict[str, List[str]]) -> None:
+        recurso = None
+        try:
+            while True:
+                try:
+                    item = fila.get_nowait()
+                except Empty:
+                    return
+
+                for tentativa in range(1, self.tentativas + 1):
+                    try:
+                        if recurso is None:
+                            recurso = self.criar_recurso()
+                        self.processar(recurso, item)
+                    except ErroPermanente as e:
+                        print(f'Trabalhador {numero}: {item} ignorado ({e})')
+                        destino = 'permanentes'
+                    except Exception as e:
+                        if self.checkpoint is not None:
+                            self.checkpoint.registrar_falha(item)
+                        if recurso is not None:
+                            self._fechar(recurso, falhou=True)
+                            recurso = None
+                        if tentativa < self.tentativas:
+                            espera = self._espera(tentativa)
+                            print(f'Trabalhador {numero}: erro em {item} (tentativa {tentativa}): {e}. '
+                                  f'Nova tentativa em {espera:.1f}s.')
+                            sleep(espera)
+                            continue
+                        print(f'Trabalhador {numero}: {item} falhou após {self.tentativas} tentativas: {e}')
+                        destino = 'falhas'
+                    else:
+                        if self.checkpoint is not None:
+                            self.checkpoint.marcar_concluido(item)
+                        destino = 'concluidos'
+                    break
+
+                with self._lock:
+                    resultado[destino].append(item)
+        finally:
+            if recurso is not None:
+                self._fechar(recurso)
+
+    def executar(self, itens: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Processa os itens e retorna os concluídos, os que falharam e os ignorados.
+
+        Args:
+            itens (Iterable[str]): Itens a serem processados.
+
+        Returns:
+            dict: ``{'concluidos': [...], 'falhas': [...], 'permanentes': [...], 'ignorados': [...]}``,
+            onde ``falhas`` são os itens que esgotaram as tentativas, ``permanentes`` os que
+            levantaram ``ErroPermanente`` (não adianta repetir) e ``ignorados`` os já
+            concluídos segundo o checkpoint.
+        """
+        resultado = {'concluidos': [], 'falhas': [], 'permanentes': [], 'ignorados': []}
+        fila = Queue()
+        for item in itens:
+            if self.checkpoint is not None and item in self.checkpoint.concluidos:
+                resultado['ignorados'].append(item)
+            else:
+                fila.put(item)
+
+        threads = [
+            Thread(target=self._trabalhador, args=(numero, fila, resultado), daemon=True)
+            for numero in range(1, min(self.n_trabalhadores, fila.qsize()) + 1)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.salvar()
+        return resultado
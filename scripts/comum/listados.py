@@ -0,0 +1,56 @@
+from base64 import b64encode, b64decode
+import json
+
+__python__ = 3.10
+
+
+def codificar_parametros(parametros: dict) -> str:
+    """
+    Codifica os parâmetros de uma chamada às APIs de listados da B3.
+
+    As APIs recebem os parâmetros como um JSON compacto codificado em base64 no
+    último segmento da URL, por exemplo ``GetPortfolioDay/eyJpbmRleCI6IklNT0IifQ==``.
+
+    Args:
+        parametros (dict): Parâmetros da chamada.
+
+    Returns:
+        str: JSON codificado em base64.
+    """
+    texto = json.dumps(parametros, separators=(',', ':'), ensure_ascii=False)
+    return b64encode(texto.encode('utf-8')).decode('ascii')
+
+
+def decodificar_parametros(url: str) -> dict:
+    """
+    Decodifica os parâmetros de uma chamada às APIs de listados da B3 (inverso de
+    ``codificar_parametros``).
+
+    Args:
+        url (str): URL da chamada (ou apenas o último segmento, em base64).
+
+    Returns:
+        dict: Parâmetros da chamada (vazio se o último segmento não for um JSON em base64).
+    """
+    segmento = url.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+    try:
+        parametros = json.loads(b64decode(segmento + '=' * (-len(segmento) % 4)).decode('utf-8'))
+    except ValueError:
+        return {}
+    return parametros if isinstance(parametros, dict) else {}
+
+
+def decodificar_conteudo_base64(texto: str) -> bytes:
+    """
+    Decodifica o corpo de respostas que retornam arquivos em base64.
+
+    Endpoints de download como ``GetDownloadPortfolioDay`` retornam o conteúdo do
+    arquivo em base64, às vezes entre aspas (string JSON).
+
+    Args:
+        texto (str): Corpo da resposta.
+
+    Returns:
+        bytes: Conteúdo original do arquivo.
+    """
+    return b64decode(texto.strip().strip('"'))
@@ -0,0 +1,342 @@
+from atexit import register
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from os import environ, makedirs
+from os.path import dirname, exists, expanduser, join
+from queue import Empty, Queue
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+import json
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+__python__ = 3.10
+
+# Argumentos do Chrome usados por todos os extratores
+ARGUMENTOS_PADRAO = [
+    '--start-maximized',  # Inicia o navegador em modo maximizado
+    '--window-size=1920,1080',  # Tamanho da janela no modo headless (sem tela para maximizar)
+    '--disable-infobars',  # Desabilita a barra de informações
+    '--disable-extensions',  # Desabilita as extensões do navegador
+    '--incognito',  # Inicia o navegador em modo de navegação anônima
+    '--disable-gpu',  # Desabilita a aceleração de GPU (útil em ambientes sem interface gráfica)
+    '--no-sandbox',  # Desabilita o sandboxing (necessário em alguns ambientes)
+    '--disable-dev-shm-usage',  # Evita falhas por falta de /dev/shm em contêineres
+    '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/90.0.4430.93 Safari/537.36',  # Define o user agent
+]
+
+# Arquivo onde o caminho do chromedriver resolvido é guardado entre execuções
+PATH_CACHE_DRIVER = join(expanduser('~'), '.cache', 'b3_scraping', 'chromedriver.json')
+
+_caminho_driver: Optional[str] = None
+_lock_driver = Lock()
+_pools: Dict[str, 'PoolNavegadores'] = {}
+_lock_pools = Lock()
+
+
+def opcoes_chrome(headless: bool = True, diretorio_download: Optional[str] = None,
+                  argumentos: List[str] = ARGUMENTOS_PADRAO, captura_rede: bool = False) -> Options:
+    """
+    Opções do Chrome compartilhadas pelos extratores.
+
+    Args:
+        headless (bool): Executa o navegador sem janela.
+        diretorio_download (str, optional): Diretório onde os downloads são gravados, sem confirmação.
+        argumentos (list): Argumentos de linha de comando do Chrome.
+        captura_rede (bool): Habilita o log de desempenho (eventos de rede do DevTools),
+            lido por ``comum.captura_rede.CapturaRede``.
+
+    Returns:
+        Options: Opções configuradas.
+    """
+    opcoes = Options()
+    for argumento in argumentos:
+        opcoes.add_argument(argumento)
+    if headless:
+        opcoes.add_argument('--headless=new')
+    if diretorio_download:
+        opcoes.add_experimental_option('prefs', {
+            'download.default_directory': diretorio_download,
+            'download.prompt_for_download': False,
+        })
+    if captura_rede:
+        opcoes.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return opcoes
+
+
+def caminho_driver(path_cache: str = PATH_CACHE_DRIVER) -> str:
+    """
+    Caminho do chromedriver, resolvido uma única vez.
+
+    A ordem é: variável de ambiente ``CHROMEDRIVER``, o valor já resolvido neste processo,
+    o caminho guardado em ``path_cache`` (se o arquivo ainda existir) e, por último,
+    ``ChromeDriverManager().install()``, que consulta a versão na rede e baixa o driver.
+
+    Args:
+        path_cache (str): Arquivo JSON onde o caminho resolvido é guardado.
+
+    Returns:
+        str: Caminho do executável do chromedriver.
+    """
+    global _caminho_driver
+    with _lock_driver:
+        if environ.get('CHROMEDRIVER'):
+            return environ['CHROMEDRIVER']
+        if _caminho_driver and exists(_caminho_driver):
+            return _caminho_driver
+        if exists(path_cache):
+            try:
+                with open(path_cache, 'r', encoding='utf-8') as file:
+                    caminho = json.load(file).get('caminho')
+                if caminho and exists(caminho):
+                    _caminho_driver = caminho
+                    return caminho
+            except (OSError, ValueError):
+                pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _caminho_driver = ChromeDriverManager().install()
+        try:
+            makedirs(dirname(path_cache), exist_ok=True)
+            with open(path_cache, 'w', encoding='utf-8') as file:
+                json.dump({'caminho': _caminho_driver}, file)
+        except OSError as e:
+            print(f'Não foi possível guardar o caminho do chromedriver: {e}')
+        return _caminho_driver
+
+
+def criar_navegador(opcoes: Optional[Options] = None) -> webdriver.Chrome:
+    """
+    Inicia um Chrome com o chromedriver em cache.
+
+    Args:
+        opcoes (Options, optional): Opções do navegador. Padrão é ``opcoes_chrome()``.
+
+    Returns:
+        webdriver.Chrome: Navegador iniciado.
+    """
+    return webdriver.Chrome(service=Service(caminho_driver()), options=opcoes or opcoes_chrome())
+
+
+class PoolNavegadores:
+    """
+    Pool de navegadores pré-configurados, compartilhado entre os trabalhos de extração.
+
+    Os navegadores são criados sob demanda (ou antecipadamente, com ``aquecer``) até o limite
+    ``tamanho`` e reaproveitados entre páginas: o custo de iniciar o Chrome é pago uma vez
+    por navegador, não uma vez por página. Um navegador devolvido com falha é encerrado e
+    substituído na próxima retirada; um navegador que não responde mais é descartado na retirada.
+
+    Attributes:
+        tamanho (int): Quantidade máxima de navegadores abertos.
+        opcoes (Options): Opções usadas para criar os navegadores.
+        estatisticas (dict): Navegadores criados, reciclados e empréstimos feitos.
+
+    Methods:
+        ``aquecer(quantidade: int = None) -> None``:
+            Inicia navegadores antecipadamente, em paralelo.
+
+        ``retirar(timeout: float = None) -> webdriver.Chrome``:
+            Retira um navegador do pool (criando um, se houver vaga).
+
+        ``devolver(driver: webdriver.Chrome, falhou: bool = False) -> None``:
+            Devolve o navegador; com ``falhou=True``, ele é encerrado e substituído.
+
+        ``emprestar()``:
+            Gerenciador de contexto que retira e devolve um navegador.
+
+        ``fechar() -> None``:
+            Encerra todos os navegadores.
+    """
+
+    def __init__(self, tamanho: int = 1, opcoes: Optional[Options] = None,
+                 criar: Optional[Callable[[Options], webdriver.Chrome]] = None):
+        """
+        Inicializa o pool (nenhum navegador é iniciado até a primeira retirada ou ``aquecer``).
+
+        Args:
+            tamanho (int): Quantidade máxima de navegadores abertos.
+            opcoes (Options, optional): Opções dos navegadores. Padrão é ``opcoes_chrome()``.
+            criar (Callable, optional): Fábrica de navegadores. Padrão é ``criar_navegador``.
+        """
+        self.tamanho = tamanho
+        self.opcoes = opcoes or opcoes_chrome()
+        self._criar = criar or criar_navegador
+        self._livres: Queue = Queue()
+        self._abertos = 0
+        self._lock = Lock()
+        self._fechado = False
+        self.estatisticas = {'criados': 0, 'reciclados': 0, 'emprestimos': 0}
+
+    def _novo(self) -> webdriver.Chrome:
+        try:
+            driver = self._criar(self.opcoes)
+        except Exception:
+            with self._lock:
+                self._abertos -= 1
+            raise
+        with self._lock:
+            self.estatisticas['criados'] += 1
+        return driver
+
+    def _reservar_vaga(self) -> bool:
+        with self._lock:
+            if self._fechado:
+                raise RuntimeError('O pool de navegadores já foi fechado.')
+            if self._abertos < self.tamanho:
+                self._abertos += 1
+                return True
+            return False
+
+    def _encerrar(self, driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f'Erro ao encerrar o navegador: {e}')
+
+    @staticmethod
+    def _responde(driver: webdriver.Chrome) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def aquecer(self, quantidade: Optional[int] = None) -> None:
+        """
+        Inicia navegadores antecipadamente, em paralelo, e os deixa livres no pool.
+
+        Args:
+            quantidade (int, optional): Quantidade a iniciar. Padrão é completar ``tamanho``.
+        """
+        vagas = 0
+        for _ in range(self.tamanho if quantidade is None else quantidade):
+            if not self._reservar_vaga():
+                break
+            vagas += 1
+        if not vagas:
+            return
+        if self._criar is criar_navegador:
+            caminho_driver()  # resolve o driver uma vez antes de iniciar os navegadores em paralelo
+        with ThreadPoolExecutor(max_workers=vagas) as executor:
+            futuros = [executor.submit(self._novo) for _ in range(vagas)]
+        for futuro in futuros:
+            try:
+                self._livres.put(futuro.result())
+            except Exception as e:
+                print(f'Erro ao iniciar o navegador: {e}')
+
+    def retirar(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """
+        Retira um navegador do pool.
+
+        Usa um navegador livre, se houver; senão, cria um novo enquanto houver vaga; senão,
+        aguarda uma devolução.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera por uma devolução, em segundos.
+
+        Returns:
+            webdriver.Chrome: Navegador pronto para uso.
+
+        Raises:
+            TimeoutError: Se nenhum navegador for devolvido dentro do tempo limite.
+        """
+        while True:
+            try:
+                driver = self._livres.get_nowait()
+            except Empty:
+                if self._reservar_vaga():
+                    driver = self._novo()
+                else:
+                    try:
+                        driver = self._livres.get(timeout=timeout)
+                    except Empty:
+                        raise TimeoutError('Nenhum navegador livre no pool.')
+            if self._responde(driver):
+                with self._lock:
+                    self.estatisticas['emprestimos'] += 1
+                return driver
+            self._descartar(driver)
+
+    def _descartar(self, driver: webdriver.Chrome) -> None:
+        self._encerrar(driver)
+        with self._lock:
+            self._abertos -= 1
+            self.estatisticas['reciclados'] += 1
+
+    def devolver(self, driver: webdriver.Chrome, falhou: bool = False) -> None:
+        """
+        Devolve um navegador ao pool.
+
+        Args:
+            driver (webdriver.Chrome): Navegador retirado com ``retirar``.
+            falhou (bool): Se True, o navegador é encerrado e uma nova vaga é liberada.
+        """
+        if falhou or self._fechado:
+            self._descartar(driver)
+        else:
+            self._livres.put(driver)
+
+    @contextmanager
+    def emprestar(self, timeout: Optional[float] = None):
+        """
+        Retira um navegador e o devolve ao final do bloco (descartando-o se houver exceção).
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera por um navegador livre.
+        """
+        driver = self.retirar(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.devolver(driver, falhou=True)
+            raise
+        self.devolver(driver)
+
+    def fechar(self) -> None:
+        """Encerra todos os navegadores livres; os emprestados são encerrados ao serem devolvidos."""
+        with self._lock:
+            self._fechado = True
+        while True:
+            try:
+                self._descartar(self._livres.get_nowait())
+            except Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+def obter_pool(nome: str = 'padrao', tamanho: int = 1, opcoes: Optional[Options] = None) -> PoolNavegadores:
+    """
+    Pool de navegadores compartilhado no processo, identificado por ``nome``.
+
+    A primeira chamada com um nome cria o pool; as seguintes retornam o mesmo pool. Os pools
+    são fechados automaticamente ao final do processo.
+
+    Args:
+        nome (str): Nome do pool (ex.: ``'empresas'``).
+        tamanho (int): Quantidade máxima de navegadores (usada apenas na criação).
+        opcoes (Options, optional): Opções dos navegadores (usadas apenas na criação).
+
+    Returns:
+        PoolNavegadores: O pool.
+    """
+    with _lock_pools:
+        if nome not in _pools or _pools[nome]._fechado:
+            _pools[nome] = PoolNavegadores(tamanho, opcoes)
+        return _pools[nome]
+
+
+@register
+def _fechar_pools() -> None:
+    for pool in list(_pools.values()):
+        pool.fechar()
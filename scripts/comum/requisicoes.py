@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from b3_dados.http import CacheHTTP, criar_sessao, get_com_cache
+
+__python__ = 3.10
+
+
+class LimitadorPorHost:
+    """
+    Garante um intervalo mínimo entre o início de requisições ao mesmo host.
+
+    Cada host tem seu próprio relógio: threads que acessam hosts diferentes não
+    esperam umas pelas outras.
+
+    Attributes:
+        intervalo (float): Intervalo mínimo, em segundos, entre requisições ao mesmo host.
+    """
+
+    def __init__(self, intervalo: float = 0.0):
+        self.intervalo = intervalo
+        self._lock = Lock()
+        self._proximo: Dict[str, float] = {}
+
+    def aguardar(self, host: str) -> None:
+        """
+        Bloqueia até que uma nova requisição ao host seja permitida.
+
+        Args:
+            host (str): Host da requisição (ex.: ``www.b3.com.br``).
+        """
+        if self.intervalo <= 0:
+            return
+        with self._lock:
+            agora = monotonic()
+            inicio = max(agora, self._proximo.get(host, agora))
+            self._proximo[host] = inicio + self.intervalo
+        if inicio > agora:
+            sleep(inicio - agora)
+
+
+class BuscadorConcorrente:
+    """
+    Camada de requisições concorrentes com paralelismo limitado.
+
+    Todas as requisições passam por uma única sessão HTTP (pool de conexões
+    compartilhado) e por um limitador de taxa por host. O método ``executar``
+    distribui tarefas entre um número fixo de threads, de modo que o tempo total
+    acompanha a página mais lenta e não a soma de todas as páginas.
+
+    Com um ``CacheHTTP``, as páginas são guardadas em disco e revalidadas com requisições
+    condicionais: páginas inalteradas custam uma resposta 304 (ou nenhuma requisição, dentro
+    da validade do cache). ``forcar=True`` ignora o cache e baixa tudo de novo.
+
+    Attributes:
+        max_simultaneas (int): Número máximo de requisições em paralelo.
+        timeout (float): Tempo limite padrão de cada requisição, em segundos.
+        sessao (requests.Session): Sessão HTTP compartilhada.
+        limitador (LimitadorPorHost): Limitador de taxa por host.
+        cache (CacheHTTP): Cache em disco das respostas (None desativa).
+        forcar (bool): Ignora o cache em todas as requisições.
+        estatisticas (dict): Requisições enviadas, respostas do cache, respostas 304 e bytes recebidos.
+
+    Methods:
+        ``get(url: str, forcar: bool = None, **kwargs) -> requests.Response``:
+            Faz uma requisição GET respeitando o limite de taxa do host e usando o cache.
+
+        ``executar(funcao: Callable, itens: Iterable) -> List[Tuple[Any, Any, Optional[Exception]]]``:
+            Aplica a função a cada item em paralelo.
+    """
+
+    def __init__(self, max_simultaneas: int = 8, intervalo_por_host: float = 0.0,
+                 timeout: float = 30, sessao: Optional[requests.Session] = None,
+                 cache: Optional[CacheHTTP] = None, forcar: bool = False):
+        """
+        Inicializa o buscador.
+
+        Args:
+            max_simultaneas (int): Número máximo de requisições em paralelo.
+            intervalo_por_host (float): Intervalo mínimo entre requisições ao mesmo host, em segundos.
+            timeout (float): Tempo limite padrão de cada requisição, em segundos.
+            sessao (requests.Session, optional): Sessão a ser usada. Se omitida, uma sessão
+                com pool do tamanho de ``max_simultaneas`` é criada.
+            cache (CacheHTTP, optional): Cache em disco das respostas.
+            forcar (bool): Ignora o cache em todas as requisições (as respostas ainda o atualizam).
+        """
+        self.max_simultaneas = max_simultaneas
+        self.timeout = timeout
+        self.sessao = sessao or criar_sessao(max_conexoes=max_simultaneas)
+        self.limitador = LimitadorPorHost(intervalo_por_host)
+        self.cache = cache
+        self.forcar = forcar
+        self.estatisticas = {'requisicoes': 0, 'do_cache': 0, 'nao_modificados': 0, 'bytes': 0}
+        self._lock_estatisticas = Lock()
+
+    def get(self, url: str, forcar: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Faz uma requisição GET respeitando o limite de taxa do host e usando o cache.
+
+        Args:
+            url (str): URL da requisição.
+            forcar (bool, optional): Ignora o cache nesta requisição. Padrão é ``self.forcar``.
+            **kwargs: Argumentos repassados para ``requests.Session.get``.
+
+        Returns:
+            requests.Response: Resposta da requisição, com os atributos ``origem`` (``'rede'``,
+            ``'304'`` ou ``'cache'``) e ``modificado`` (o conteúdo mudou desde a última gravação).
+        """
+        forcar = self.forcar if forcar is None else forcar
+        kwargs.setdefault('timeout', self.timeout)
+        response = get_com_cache(self.sessao, self.cache, url, forcar=forcar,
+                                 antes=lambda: self.limitador.aguardar(urlsplit(url).netloc), **kwargs)
+        with self._lock_estatisticas:
+            if response.origem == 'cache':
+                self.estatisticas['do_cache'] += 1
+            else:
+                self.estatisticas['requisicoes'] += 1
+            if response.origem == '304':
+                self.estatisticas['nao_modificados'] += 1
+            if response.origem == 'rede':
+                self.estatisticas['bytes'] += len(response.content)
+        return response
+
+    def executar(self, funcao: Callable[[Any], Any], itens: Iterable[Any]) -> List[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Aplica a função a cada item em paralelo, com no máximo ``max_simultaneas`` threads.
+
+        Erros de um item não interrompem os demais: cada resultado é retornado como
+        ``(item, resultado, erro)``, na mesma ordem dos itens.
+
+        Args:
+            funcao (Callable): Função chamada com cada item.
+            itens (Iterable): Itens a serem processados.
+
+        Returns:
+            list: Tuplas ``(item, resultado, erro)``.
+        """
+        itens = list(itens)
+        if not itens:
+            return []
+
+        def tarefa(item):
+            try:
+                return item, funcao(item), None
+            except Exception as e:
+                return item, None, e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_simultaneas, len(itens))) as executor:
+            return list(executor.map(tarefa, itens))